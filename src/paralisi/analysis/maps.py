@@ -3,12 +3,21 @@
 import numpy as np
 import torch
 from numpy.typing import NDArray
-from typing import Dict, Optional, Tuple
+from typing import Dict, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from scipy import ndimage
 from ..core.exceptions import ProcessingError
 from ..utils.decorators import validate_input
 
+LABEL_STATS_DTYPE = np.dtype([
+    ('label', np.int64),
+    ('n_pixels', np.int64),         # Pixels carrying the label
+    ('mean_selectivity', np.float64),
+    ('median_selectivity', np.float64),
+    ('std_selectivity', np.float64),
+    ('coverage', np.float64),       # Fraction of the label's pixels with valid values
+])
+
 @dataclass
 class MapAnalysisResult:
     """Container for map analysis results"""
@@ -17,6 +26,74 @@ class MapAnalysisResult:
     direction: Optional[NDArray] = None
     orientation: Optional[NDArray] = None
     color_selectivity: Optional[NDArray] = None
+    spatial_frequency: Optional[NDArray] = None
+
+class VectorSumEngine:
+    """Computes several response-weighted sums over stimuli in one pass.
+
+    Every feature is a weight per stimulus, complex for circular features
+    (``exp(ikθ)``) and real for weighted means. The real and imaginary
+    parts of all weights form one real matrix, so a single ``tensordot``
+    over the stimulus axis produces every sum without complex or
+    stimulus-sized temporaries. Sums are smoothed as complex values, before
+    magnitudes and angles are taken, so smoothing never crosses a phase wrap.
+
+    Parameters
+    ----------
+    weights : Mapping[str, NDArray]
+        Feature name -> weight per stimulus
+    smoothing_sigma : float, optional
+        Gaussian smoothing sigma in pixels, by default 0 (none)
+    """
+
+    def __init__(self, weights: Mapping[str, NDArray], smoothing_sigma: float = 0.0):
+        self.names = list(weights)
+        vectors = [np.asarray(w) for w in weights.values()]
+        self.complex = [np.iscomplexobj(w) for w in vectors]
+        rows = []
+        for vector, is_complex in zip(vectors, self.complex):
+            rows.append(vector.real)
+            if is_complex:
+                rows.append(vector.imag)
+        self.matrix = np.stack(rows).astype(np.float64)
+        self.smoothing_sigma = smoothing_sigma
+
+    def apply(self, responses: NDArray) -> Dict[str, NDArray]:
+        """Compute every weighted sum.
+
+        Parameters
+        ----------
+        responses : NDArray
+            Responses, shape (..., n_stimuli, H, W); leading axes stack maps
+            (animals, trial subsets) computed in the same call
+
+        Returns
+        -------
+        Dict[str, NDArray]
+            Feature name -> sum, shape (..., H, W), complex for circular features.
+            float32 responses give float32/complex64 sums.
+        """
+        responses = np.asarray(responses)
+        if responses.shape[-3] != self.matrix.shape[1]:
+            raise ValueError(
+                f"Expected {self.matrix.shape[1]} stimuli, got {responses.shape[-3]}"
+            )
+        dtype = np.float32 if responses.dtype == np.float32 else np.float64
+        sums = np.tensordot(self.matrix.astype(dtype), responses.astype(dtype, copy=False), axes=([1], [-3]))
+
+        if self.smoothing_sigma:
+            sigma = (0,) * (sums.ndim - 2) + (self.smoothing_sigma,) * 2
+            sums = ndimage.gaussian_filter(sums, sigma)
+
+        results, row = {}, 0
+        for name, is_complex in zip(self.names, self.complex):
+            if is_complex:
+                results[name] = sums[row] + 1j * sums[row + 1]
+                row += 2
+            else:
+                results[name] = sums[row]
+                row += 1
+        return results
 
 class FeatureMapAnalyzer:
     """Analyzes various types of feature maps (orientation, direction, color, etc.)
@@ -33,6 +110,102 @@ class FeatureMapAnalyzer:
         self.smoothing_sigma = smoothing_sigma
         self.min_magnitude = min_magnitude
 
+    def compute_feature_maps(
+        self,
+        responses: NDArray,
+        directions: Optional[NDArray] = None,
+        orientations: Optional[NDArray] = None,
+        spatial_frequencies: Optional[NDArray] = None,
+        wavelengths: Optional[NDArray] = None
+    ) -> Dict[str, MapAnalysisResult]:
+        """Compute all feature maps of a stimulus set in one pass over the responses.
+
+        Each stimulus is described by any of its direction, orientation,
+        spatial frequency and wavelength. Direction and orientation maps
+        are complex vector sums, orientation on the doubled angle; pass the
+        directions as ``orientations`` too for both maps of a drifting
+        grating set. Spatial
+        frequency and colour preferences are response-weighted means of
+        log2 frequency and of wavelength, which expect non-negative
+        responses; colour selectivity is one minus the response-weighted
+        wavelength spread relative to the spread of the stimulus set.
+
+        Parameters
+        ----------
+        responses : NDArray
+            Response matrix (..., stimuli × height × width); leading axes
+            stack maps of several animals or trial subsets
+        directions, orientations : Optional[NDArray]
+            Stimulus directions / orientations in degrees
+        spatial_frequencies : Optional[NDArray]
+            Stimulus spatial frequencies (any positive unit)
+        wavelengths : Optional[NDArray]
+            Stimulus wavelengths in nm
+
+        Returns
+        -------
+        Dict[str, MapAnalysisResult]
+            Maps under 'direction', 'orientation', 'spatial_frequency' and
+            'color', for the features given
+        """
+        try:
+            weights = {}
+            if directions is not None:
+                weights['direction'] = np.exp(1j * np.deg2rad(directions))
+            if orientations is not None:
+                weights['orientation'] = np.exp(2j * np.deg2rad(orientations))
+            if spatial_frequencies is not None or wavelengths is not None:
+                weights['total'] = np.ones(responses.shape[-3])
+            if spatial_frequencies is not None:
+                weights['log_sf'] = np.log2(spatial_frequencies)
+            if wavelengths is not None:
+                weights['wavelength'] = np.asarray(wavelengths, dtype=float)
+                weights['wavelength_sq'] = weights['wavelength'] ** 2
+            if not weights:
+                raise ValueError("No stimulus features given")
+
+            sums = VectorSumEngine(weights, self.smoothing_sigma).apply(responses)
+            maps = {}
+
+            if directions is not None:
+                magnitude = np.abs(sums['direction'])
+                direction = np.angle(sums['direction'])
+                direction[magnitude < self.min_magnitude] = np.nan
+                maps['direction'] = MapAnalysisResult(magnitude=magnitude, phase=direction, direction=direction)
+
+            if orientations is not None:
+                magnitude = np.abs(sums['orientation'])
+                orientation = np.angle(sums['orientation']) / 2
+                orientation[magnitude < self.min_magnitude] = np.nan
+                maps['orientation'] = MapAnalysisResult(
+                    magnitude=magnitude, phase=orientation, orientation=orientation
+                )
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                if spatial_frequencies is not None:
+                    total = sums['total']
+                    preferred = np.exp2(sums['log_sf'] / total)
+                    preferred[total < self.min_magnitude] = np.nan
+                    maps['spatial_frequency'] = MapAnalysisResult(
+                        magnitude=total, phase=preferred, spatial_frequency=preferred
+                    )
+
+                if wavelengths is not None:
+                    total = sums['total']
+                    preferred = sums['wavelength'] / total
+                    spread = np.sqrt(np.maximum(sums['wavelength_sq'] / total - preferred ** 2, 0))
+                    stimulus_spread = np.std(weights['wavelength'])
+                    color_sel = 1 - spread / stimulus_spread if stimulus_spread > 0 else np.zeros_like(spread)
+                    preferred[~(color_sel >= self.min_magnitude)] = np.nan
+                    maps['color'] = MapAnalysisResult(
+                        magnitude=color_sel, phase=preferred, color_selectivity=color_sel
+                    )
+
+            return maps
+
+        except Exception as e:
+            raise ProcessingError(f"Feature map computation failed: {str(e)}") from e
+
     @validate_input
     def process_orientation_map(
         self,
@@ -54,25 +227,8 @@ class FeatureMapAnalyzer:
             Processed orientation map results
         """
         try:
-            # Convert orientations to radians
-            theta = np.deg2rad(orientations)
-
-            # Complex sum across orientations
-            sum_real = np.sum(responses * np.cos(2 * theta[:, None, None]), axis=0)
-            sum_imag = np.sum(responses * np.sin(2 * theta[:, None, None]), axis=0)
-
-            # Calculate magnitude and phase
-            magnitude = np.sqrt(sum_real**2 + sum_imag**2)
-            phase = np.angle(sum_real + 1j * sum_imag) / 2
-
-            # Apply smoothing
-            magnitude = ndimage.gaussian_filter(magnitude, self.smoothing_sigma)
-            phase = ndimage.gaussian_filter(phase, self.smoothing_sigma)
-
-            # Mask low magnitude regions
-            phase[magnitude < self.min_magnitude] = np.nan
-
-            return MapAnalysisResult(magnitude=magnitude, phase=phase)
+            result = self.compute_feature_maps(responses, orientations=orientations)['orientation']
+            return MapAnalysisResult(magnitude=result.magnitude, phase=result.phase)
 
         except Exception as e:
             raise ProcessingError(f"Orientation map processing failed: {str(e)}") from e
@@ -98,29 +254,7 @@ class FeatureMapAnalyzer:
             Processed direction map results
         """
         try:
-            # Convert directions to radians
-            theta = np.deg2rad(directions)
-
-            # Complex sum across directions
-            sum_real = np.sum(responses * np.cos(theta[:, None, None]), axis=0)
-            sum_imag = np.sum(responses * np.sin(theta[:, None, None]), axis=0)
-
-            # Calculate magnitude and direction
-            magnitude = np.sqrt(sum_real**2 + sum_imag**2)
-            direction = np.angle(sum_real + 1j * sum_imag)
-
-            # Apply smoothing
-            magnitude = ndimage.gaussian_filter(magnitude, self.smoothing_sigma)
-            direction = ndimage.gaussian_filter(direction, self.smoothing_sigma)
-
-            # Mask low magnitude regions
-            direction[magnitude < self.min_magnitude] = np.nan
-
-            return MapAnalysisResult(
-                magnitude=magnitude,
-                phase=direction,
-                direction=direction
-            )
+            return self.compute_feature_maps(responses, directions=directions)['direction']
 
         except Exception as e:
             raise ProcessingError(f"Direction map processing failed: {str(e)}") from e
@@ -227,6 +361,132 @@ class MapStatistics:
 
         return hist, bin_centers
 
+    @staticmethod
+    def _label_positions(labels: NDArray, index: Optional[NDArray]) -> Tuple[NDArray, NDArray]:
+        """Reported labels and each pixel's row among them (-1 if not reported)."""
+        if index is None:
+            index = np.unique(labels)
+            index = index[index != 0]
+        index = np.asarray(index)
+        order = np.argsort(index)
+        sorted_index = index[order]
+        position = np.searchsorted(sorted_index, labels)
+        position = np.minimum(position, max(len(index) - 1, 0))
+        found = (sorted_index[position] == labels) if len(index) else np.zeros(labels.shape, dtype=bool)
+        return index, np.where(found, order[position], -1)
+
+    def compute_label_selectivity_stats(
+        self,
+        magnitude: NDArray,
+        labels: NDArray,
+        index: Optional[NDArray] = None
+    ) -> NDArray:
+        """Compute selectivity statistics of every labelled region in one pass.
+
+        Equivalent to ``compute_selectivity_stats`` with ``roi = labels == l``
+        for each label, using bincount sums and a single sort for medians.
+
+        Parameters
+        ----------
+        magnitude : NDArray
+            Selectivity map; NaN marks invalid pixels
+        labels : NDArray
+            Integer label image, same shape as ``magnitude``
+        index : Optional[NDArray]
+            Labels to report, by default every non-zero label present
+
+        Returns
+        -------
+        NDArray
+            One row per label (LABEL_STATS_DTYPE), NaN statistics and zero
+            coverage for labels without valid pixels
+        """
+        index, position = self._label_positions(labels, index)
+        n_labels = len(index)
+        table = np.zeros(n_labels, dtype=LABEL_STATS_DTYPE)
+        table['label'] = index
+        if n_labels == 0:
+            return table
+
+        position = position.ravel()
+        values = magnitude.ravel()
+        in_label = position >= 0
+        valid = in_label & ~np.isnan(values)
+        group, values = position[valid], values[valid].astype(np.float64)
+
+        n_pixels = np.bincount(position[in_label], minlength=n_labels)
+        n_valid = np.bincount(group, minlength=n_labels)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.bincount(group, values, minlength=n_labels) / n_valid
+            deviation = values - mean[group]
+            std = np.sqrt(np.bincount(group, deviation * deviation, minlength=n_labels) / n_valid)
+
+        # Sorting by (label, value) lays out each label's values in order, one run per label
+        median = np.full(n_labels, np.nan)
+        if len(values):
+            ordered = values[np.lexsort((values, group))]
+            starts = np.cumsum(n_valid) - n_valid
+            has_values = n_valid > 0
+            lower = ordered[starts[has_values] + (n_valid[has_values] - 1) // 2]
+            upper = ordered[starts[has_values] + n_valid[has_values] // 2]
+            median[has_values] = (lower + upper) / 2
+
+        table['n_pixels'] = n_pixels
+        table['mean_selectivity'] = mean
+        table['median_selectivity'] = median
+        table['std_selectivity'] = std
+        table['coverage'] = np.where(n_pixels > 0, n_valid / np.maximum(n_pixels, 1), 0.0)
+        return table
+
+    def compute_label_preference_distributions(
+        self,
+        phase: NDArray,
+        magnitude: NDArray,
+        labels: NDArray,
+        n_bins: int = 36,
+        min_magnitude: Optional[float] = None,
+        index: Optional[NDArray] = None
+    ) -> Tuple[NDArray, NDArray, NDArray]:
+        """Compute preferred-orientation histograms of every labelled region in one pass.
+
+        Equivalent to ``compute_preference_distribution`` restricted to each
+        label, with the magnitude threshold (by default the 25th percentile)
+        taken over the whole map.
+
+        Parameters
+        ----------
+        phase : NDArray
+            Preferred orientation map in radians
+        magnitude : NDArray
+            Selectivity map
+        labels : NDArray
+            Integer label image, same shape as ``phase``
+        n_bins : int
+            Number of histogram bins over [0, 180) degrees
+        min_magnitude : Optional[float]
+            Minimum magnitude of counted pixels
+        index : Optional[NDArray]
+            Labels to report, by default every non-zero label present
+
+        Returns
+        -------
+        Tuple[NDArray, NDArray, NDArray]
+            Reported labels, histograms (labels × bins) and bin centers
+        """
+        if min_magnitude is None:
+            min_magnitude = np.nanpercentile(magnitude, 25)
+
+        index, position = self._label_positions(labels, index)
+        bin_width = 180 / n_bins
+        bin_centers = (np.arange(n_bins) + 0.5) * bin_width
+
+        valid = (position >= 0) & (magnitude > min_magnitude) & ~np.isnan(phase)
+        phase_deg = np.rad2deg(phase[valid]) % 180
+        bins = np.minimum((phase_deg / bin_width).astype(np.int64), n_bins - 1)
+        counts = np.bincount(position[valid] * n_bins + bins, minlength=len(index) * n_bins)
+
+        return index, counts.reshape(len(index), n_bins), bin_centers
+
 # Example usage:
 if __name__ == "__main__":
     # Create analyzer instance
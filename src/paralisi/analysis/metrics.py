@@ -1,9 +1,10 @@
 # src/PyISI/analysis/metrics.py
 
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from numpy.typing import NDArray
-from scipy import stats
+from typing import Dict, Optional
 from ..core.exceptions import AnalysisError
 
 @dataclass
@@ -70,6 +71,100 @@ class MetricsCalculator:
         except Exception as e:
             raise AnalysisError(f"Metrics calculation failed: {str(e)}") from e
 
+    def compute_response_maps(
+        self,
+        stack: NDArray,
+        stimulus_onset: int,
+        baseline: Optional[NDArray] = None,
+        threshold_sd: float = 2.0,
+        chunk_size: int = 16384,
+        workers: Optional[int] = None
+    ) -> Dict[str, NDArray]:
+        """Compute response metrics for every pixel of a frame stack.
+
+        Per-pixel counterparts of the scalar metrics, computed in one pass
+        over chunks of pixels. Frames from ``stimulus_onset`` on are the
+        response; the baseline is the frames before it unless given
+        separately. Latency is the time from onset to the first frame whose
+        deviation from the baseline mean exceeds ``threshold_sd`` baseline
+        standard deviations, NaN if none does.
+
+        Parameters
+        ----------
+        stack : NDArray
+            Frames, shape (T, H, W) or (T, ...) with any spatial axes
+        stimulus_onset : int
+            Index of the first response frame
+        baseline : Optional[NDArray], optional
+            Baseline frames with the same spatial shape, by default
+            ``stack[:stimulus_onset]``
+        threshold_sd : float, optional
+            Latency threshold in baseline standard deviations, by default 2
+        chunk_size : int, optional
+            Pixels processed together, by default 16384
+        workers : Optional[int], optional
+            Number of threads processing chunks, by default one
+
+        Returns
+        -------
+        Dict[str, NDArray]
+            Maps 'baseline_mean', 'baseline_variance', 'snr', 'amplitude',
+            'latency' (seconds) and 'variance' (of the response), each of
+            the stack's spatial shape; float32 stacks give float32 maps
+
+        Raises
+        ------
+        AnalysisError
+            If the response or baseline period is empty
+        """
+        try:
+            stack = np.asarray(stack)
+            if baseline is None:
+                baseline = stack[:stimulus_onset]
+            response = stack[stimulus_onset:]
+            if len(response) == 0 or len(baseline) == 0:
+                raise ValueError("Response and baseline periods must not be empty")
+
+            spatial = stack.shape[1:]
+            response = response.reshape(len(response), -1)
+            baseline = np.asarray(baseline).reshape(len(baseline), -1)
+            dtype = np.float32 if stack.dtype == np.float32 else np.float64
+            names = ('baseline_mean', 'baseline_variance', 'snr', 'amplitude', 'latency', 'variance')
+            maps = {name: np.empty(response.shape[1], dtype=dtype) for name in names}
+
+            def process(start: int) -> None:
+                window = slice(start, start + chunk_size)
+                frames = response[:, window].astype(dtype, copy=False)
+                base = baseline[:, window].astype(dtype, copy=False)
+
+                base_mean = base.mean(axis=0)
+                base_var = base.var(axis=0)
+                deviation = np.abs(frames - base_mean)
+
+                crossed = deviation > threshold_sd * np.sqrt(base_var)
+                first = np.argmax(crossed, axis=0)
+                latency = np.where(crossed.any(axis=0), first / self.sampling_rate, np.nan)
+
+                maps['baseline_mean'][window] = base_mean
+                maps['baseline_variance'][window] = base_var
+                maps['snr'][window] = np.sqrt(np.mean(deviation * deviation, axis=0) / (base_var + 1e-10))
+                maps['amplitude'][window] = deviation.max(axis=0)
+                maps['latency'][window] = latency
+                maps['variance'][window] = frames.var(axis=0)
+
+            starts = range(0, response.shape[1], chunk_size)
+            if workers is not None and workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    list(pool.map(process, starts))
+            else:
+                for start in starts:
+                    process(start)
+
+            return {name: values.reshape(spatial) for name, values in maps.items()}
+
+        except Exception as e:
+            raise AnalysisError(f"Response map calculation failed: {str(e)}") from e
+
     def _calculate_snr(
         self,
         signal: NDArray,
@@ -85,20 +180,112 @@ class MetricsCalculator:
         signal: NDArray,
         window_size: int = 10
     ) -> float:
-        """Calculate response reliability across trials"""
+        """Calculate response reliability across trials
+
+        Mean Pearson correlation over all pairs of trials (first axis).
+        """
         if signal.ndim < 2:
             return 1.0
 
-        # Compute trial-to-trial correlation
-        n_trials = signal.shape[0]
-        correlations = []
+        correlations = self.trial_correlation_matrix(signal)
+        upper = np.triu_indices(len(correlations), k=1)
+        return float(np.mean(correlations[upper]))
 
-        for i in range(n_trials):
-            for j in range(i+1, n_trials):
-                corr = stats.pearsonr(signal[i], signal[j])[0]
-                correlations.append(corr)
+    @staticmethod
+    def trial_correlation_matrix(trials: NDArray) -> NDArray:
+        """Pearson correlations between all pairs of trials.
+
+        Trials are z-scored once and correlated in a single matrix product.
+
+        Parameters
+        ----------
+        trials : NDArray
+            Trials along the first axis; remaining axes are flattened
+
+        Returns
+        -------
+        NDArray
+            Correlation matrix, shape (n_trials, n_trials); NaN for constant trials
+        """
+        flat = trials.reshape(len(trials), -1)
+        dtype = np.float32 if flat.dtype == np.float32 else np.float64
+        flat = flat.astype(dtype, copy=False)
+        centered = flat - flat.mean(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = centered / np.linalg.norm(centered, axis=1, keepdims=True)
+        return np.clip(z @ z.T, -1, 1)
+
+    def compute_reliability_map(
+        self,
+        trials: NDArray,
+        method: str = 'split_half',
+        spearman_brown: bool = True,
+        chunk_size: int = 16384
+    ) -> NDArray:
+        """Per-pixel reliability of trial time courses.
+
+        Parameters
+        ----------
+        trials : NDArray
+            Trial stack, shape (n_trials, T, ...) with any spatial axes
+        method : str, optional
+            'split_half' correlates the time courses averaged over even and
+            odd trials; 'leave_one_out' averages the correlation of every
+            trial with the mean of the others. By default 'split_half'.
+        spearman_brown : bool, optional
+            Whether to correct split-half correlations to full-session
+            reliability, 2r / (1 + r), by default True
+        chunk_size : int, optional
+            Pixels processed together, bounding temporary memory to about
+            ``n_trials * T * chunk_size`` values, by default 16384
+
+        Returns
+        -------
+        NDArray
+            Reliability per pixel, shape ``trials.shape[2:]``; NaN where a
+            time course is constant
+
+        Raises
+        ------
+        AnalysisError
+            If fewer than two trials are given or the method is unknown
+        """
+        try:
+            if method not in ('split_half', 'leave_one_out'):
+                raise ValueError(f"Unknown reliability method: {method}")
+            if trials.ndim < 2 or len(trials) < 2:
+                raise ValueError("Reliability needs at least two trials with a time axis")
+
+            n_trials, n_times = trials.shape[:2]
+            spatial = trials.shape[2:]
+            flat = trials.reshape(n_trials, n_times, -1)
+            dtype = np.float32 if flat.dtype == np.float32 else np.float64
+            reliability = np.empty(flat.shape[2], dtype=dtype)
+
+            for start in range(0, flat.shape[2], chunk_size):
+                chunk = flat[:, :, start:start + chunk_size].astype(dtype, copy=False)
+                if method == 'split_half':
+                    r = self._pearson_along_time(chunk[0::2].mean(axis=0), chunk[1::2].mean(axis=0))
+                    if spearman_brown:
+                        r = 2 * r / (1 + r)
+                else:
+                    others = (chunk.sum(axis=0) - chunk) / (n_trials - 1)
+                    r = self._pearson_along_time(chunk, others).mean(axis=0)
+                reliability[start:start + chunk_size] = r
+
+            return reliability.reshape(spatial)
+
+        except Exception as e:
+            raise AnalysisError(f"Reliability map calculation failed: {str(e)}") from e
 
-        return float(np.mean(correlations))
+    @staticmethod
+    def _pearson_along_time(a: NDArray, b: NDArray) -> NDArray:
+        """Pearson correlation over the time axis (second to last) of paired arrays."""
+        a = a - a.mean(axis=-2, keepdims=True)
+        b = b - b.mean(axis=-2, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = (a * b).sum(axis=-2) / np.sqrt((a * a).sum(axis=-2) * (b * b).sum(axis=-2))
+        return np.clip(r, -1, 1)
 
     def _calculate_amplitude(
         self,
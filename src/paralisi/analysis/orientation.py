@@ -3,11 +3,19 @@
 from dataclasses import dataclass
 import numpy as np
 from numpy.typing import NDArray
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+from scipy import fft as sp_fft
 from scipy import ndimage
 from ..core.exceptions import ProcessingError
 from ..utils.decorators import validate_input
 
+@dataclass
+class PinwheelDetection:
+    """Container for pinwheel centers detected in one or more maps"""
+    centers: NDArray    # Sub-pixel (x, y) coordinates, shape (N, 2)
+    chirality: NDArray  # +1 if orientation rotates counter-clockwise around the center, -1 if clockwise
+    map_index: NDArray  # Flat index of the map each pinwheel belongs to, for stacked maps
+
 @dataclass
 class OrientationAnalysisResult:
     """Container for detailed orientation analysis results"""
@@ -16,8 +24,10 @@ class OrientationAnalysisResult:
     selectivity: NDArray
     uniformity: NDArray  # Local orientation uniformity
     gradient: NDArray    # Orientation gradient magnitude
-    pinwheel_centers: Optional[NDArray] = None  # Coordinates of pinwheel centers
+    pinwheel_centers: Optional[NDArray] = None  # Sub-pixel (x, y) coordinates of pinwheel centers
+    pinwheel_chirality: Optional[NDArray] = None  # +1 counter-clockwise, -1 clockwise per pinwheel
     domain_size: Optional[float] = None         # Average orientation domain size
+    periodicity: Optional[float] = None         # Orientation map period (column spacing)
 
 class OrientationAnalyzer:
     """Advanced analysis of orientation maps including pinwheel detection,
@@ -32,7 +42,9 @@ class OrientationAnalyzer:
         smoothing_sigma: float = 1.0,
         min_magnitude: float = 0.1,
         pinwheel_threshold: float = 0.5,
-        gradient_sigma: float = 2.0
+        gradient_sigma: float = 2.0,
+        uniformity_window: str = "box",
+        uniformity_size: float = 5
     ):
         """
         Parameters
@@ -42,14 +54,23 @@ class OrientationAnalyzer:
         min_magnitude : float
             Minimum magnitude threshold for valid orientation values
         pinwheel_threshold : float
-            Threshold for pinwheel center detection
+            Minimum absolute winding, in turns of orientation, of a pinwheel
+            center (pinwheels wind by half a turn)
         gradient_sigma : float
             Sigma for gradient calculation smoothing
+        uniformity_window : str
+            Neighbourhood weighting for local uniformity, 'box' or 'gaussian'
+        uniformity_size : float
+            Box width, or Gaussian sigma, of the uniformity neighbourhood in pixels
         """
+        if uniformity_window not in ("box", "gaussian"):
+            raise ValueError(f"Unknown uniformity window: {uniformity_window}")
         self.smoothing_sigma = smoothing_sigma
         self.min_magnitude = min_magnitude
         self.pinwheel_threshold = pinwheel_threshold
         self.gradient_sigma = gradient_sigma
+        self.uniformity_window = uniformity_window
+        self.uniformity_size = uniformity_size
 
     @validate_input
     def analyze_orientation_map(
@@ -88,10 +109,10 @@ class OrientationAnalyzer:
             uniformity = self._compute_local_uniformity(orientation, valid_mask)
 
             # Detect pinwheel centers
-            pinwheel_centers = self._detect_pinwheels(orientation, magnitude, valid_mask)
+            pinwheels = self.detect_pinwheels(orientation, valid_mask)
 
-            # Calculate average domain size
-            domain_size = self._estimate_domain_size(orientation, valid_mask)
+            # Calculate average domain size and map period
+            domain_sizes, periods = self.estimate_domain_sizes(orientation, valid_mask)
 
             return OrientationAnalysisResult(
                 magnitude=magnitude,
@@ -99,8 +120,10 @@ class OrientationAnalyzer:
                 selectivity=magnitude,
                 uniformity=uniformity,
                 gradient=gradient,
-                pinwheel_centers=pinwheel_centers,
-                domain_size=domain_size
+                pinwheel_centers=pinwheels.centers,
+                pinwheel_chirality=pinwheels.chirality,
+                domain_size=float(domain_sizes),
+                periodicity=float(periods)
             )
 
         except Exception as e:
@@ -130,78 +153,293 @@ class OrientationAnalyzer:
         self,
         orientation: NDArray,
         mask: NDArray,
-        kernel_size: int = 5
+        kernel_size: Optional[float] = None,
+        window: Optional[str] = None
     ) -> NDArray:
-        """Compute local orientation uniformity."""
-        uniformity = np.zeros_like(orientation)
-
-        for i in range(kernel_size//2, orientation.shape[0] - kernel_size//2):
-            for j in range(kernel_size//2, orientation.shape[1] - kernel_size//2):
-                if mask[i, j]:
-                    # Extract local patch
-                    patch = orientation[i-kernel_size//2:i+kernel_size//2+1,
-                                     j-kernel_size//2:j+kernel_size//2+1]
-                    patch_mask = mask[i-kernel_size//2:i+kernel_size//2+1,
-                                    j-kernel_size//2:j+kernel_size//2+1]
-
-                    if np.any(patch_mask):
-                        # Compute circular variance
-                        angles = patch[patch_mask]
-                        mean_vector = np.mean(np.exp(2j * angles))
-                        uniformity[i, j] = np.abs(mean_vector)
+        """Compute local orientation uniformity.
+
+        Uniformity is the length of the mean doubled-angle vector
+        ``exp(2iθ)`` over the valid pixels of each pixel's neighbourhood.
+        The masked field and the mask are filtered separately and divided,
+        so invalid pixels neither contribute nor dilute the mean. Pixels
+        whose neighbourhood does not fit inside the map are 0, and pixels
+        outside the mask NaN. Maps may be stacked along leading axes.
+
+        Parameters
+        ----------
+        orientation : NDArray
+            Preferred orientation (radians), shape (..., H, W)
+        mask : NDArray
+            Valid pixels, broadcast against ``orientation``
+        kernel_size : Optional[float]
+            Box width (an odd window of ``2 * (size // 2) + 1`` pixels) or
+            Gaussian sigma, by default ``uniformity_size``
+        window : Optional[str]
+            'box' or 'gaussian', by default ``uniformity_window``
+
+        Returns
+        -------
+        NDArray
+            Uniformity in [0, 1]
+        """
+        size = self.uniformity_size if kernel_size is None else kernel_size
+        window = window or self.uniformity_window
+        spatial = (0,) * (orientation.ndim - 2)
+
+        mask = np.broadcast_to(mask, orientation.shape)
+        field = np.where(mask, np.exp(2j * np.where(mask, orientation, 0)), 0)
+        weights = mask.astype(float)
+        if window == "box":
+            radius = int(size) // 2
+            box = (1,) * len(spatial) + (2 * radius + 1,) * 2
+            vector_sum = ndimage.uniform_filter(field, box, mode='constant')
+            weight_sum = ndimage.uniform_filter(weights, box, mode='constant')
+        else:
+            radius = int(4 * size + 0.5)
+            sigma = spatial + (size, size)
+            vector_sum = ndimage.gaussian_filter(field, sigma, mode='constant')
+            weight_sum = ndimage.gaussian_filter(weights, sigma, mode='constant')
+
+        uniformity = np.zeros(orientation.shape)
+        height, width = orientation.shape[-2:]
+        interior = np.zeros((height, width), dtype=bool)
+        interior[radius:height - radius, radius:width - radius] = True
+        valid = mask & interior & (weight_sum > 0)
+        uniformity[valid] = np.minimum(np.abs(vector_sum[valid] / weight_sum[valid]), 1.0)
 
         uniformity[~mask] = np.nan
         return uniformity
 
-    def _detect_pinwheels(
+    def detect_pinwheels(
         self,
         orientation: NDArray,
-        magnitude: NDArray,
         mask: NDArray
+    ) -> PinwheelDetection:
+        """Detect pinwheel centers as winding-number singularities.
+
+        The doubled-angle phase ``2θ`` is followed around every 2×2
+        plaquette of pixels, summing wrapped phase steps, so the winding is
+        exact and insensitive to the orientation wrap at π. Plaquettes with
+        four valid corners whose winding reaches ``pinwheel_threshold`` are
+        labeled, adjacent plaquettes of the same sign merged into one
+        pinwheel, and each center placed at the zero of a linear fit of
+        ``exp(2iθ)`` within its plaquettes. Maps may be stacked along
+        leading axes; each pinwheel records which map it belongs to.
+
+        Parameters
+        ----------
+        orientation : NDArray
+            Preferred orientation (radians), shape (..., H, W)
+        mask : NDArray
+            Valid pixels, broadcast against ``orientation``
+
+        Returns
+        -------
+        PinwheelDetection
+            Centers, chirality and map index of every pinwheel
+        """
+        mask = np.broadcast_to(mask, orientation.shape)
+        phase = 2 * np.where(mask, orientation, 0)
+        corners = [(slice(None, -1), slice(None, -1)), (slice(1, None), slice(None, -1)),
+                   (slice(1, None), slice(1, None)), (slice(None, -1), slice(1, None))]
+        # Corners in counter-clockwise order as displayed (rows down, columns right)
+        p00, p10, p11, p01 = (phase[(..., *c)] for c in corners)
+
+        def wrap(step):
+            return (step + np.pi) % (2 * np.pi) - np.pi
+
+        winding = (wrap(p10 - p00) + wrap(p11 - p10) + wrap(p01 - p11) + wrap(p00 - p01)) / (4 * np.pi)
+        valid = np.logical_and.reduce([mask[(..., *c)] for c in corners])
+        charge = np.where(valid & (np.abs(winding) >= self.pinwheel_threshold - 1e-6), np.sign(winding), 0)
+
+        # Zero of z ≈ a + b·u + c·v fitted to the corners, with u along x and v along y
+        z00, z10, z11, z01 = np.exp(1j * p00), np.exp(1j * p10), np.exp(1j * p11), np.exp(1j * p01)
+        b = (z01 - z00 + z11 - z10) / 2
+        c = (z10 - z00 + z11 - z01) / 2
+        a = (z00 + z01 + z10 + z11) / 4 - (b + c) / 2
+        det = b.real * c.imag - c.real * b.imag
+        safe = np.where(np.abs(det) > 1e-12, det, 1)
+        u = np.where(np.abs(det) > 1e-12, (c.real * a.imag - a.real * c.imag) / safe, 0.5)
+        v = np.where(np.abs(det) > 1e-12, (b.imag * a.real - b.real * a.imag) / safe, 0.5)
+
+        # Label each sign separately, connecting plaquettes only within a map
+        structure = np.zeros((3,) * charge.ndim, dtype=bool)
+        structure[(1,) * (charge.ndim - 2)] = True
+        positive, n_positive = ndimage.label(charge > 0, structure)
+        negative, n_negative = ndimage.label(charge < 0, structure)
+        labels = np.where(negative > 0, negative + n_positive, positive).ravel()
+        n_labels = n_positive + n_negative + 1
+
+        rows, cols = np.indices(charge.shape[-2:])
+        map_index = np.broadcast_to(
+            np.arange(int(np.prod(charge.shape[:-2]))).reshape(charge.shape[:-2] + (1, 1)), charge.shape
+        )
+        counts = np.maximum(np.bincount(labels, minlength=n_labels), 1)
+
+        def label_mean(values):
+            values = np.broadcast_to(values, charge.shape).ravel()
+            return (np.bincount(labels, values, minlength=n_labels) / counts)[1:]
+
+        x = label_mean(cols + np.clip(u, 0, 1))
+        y = label_mean(rows + np.clip(v, 0, 1))
+        return PinwheelDetection(
+            centers=np.column_stack([x, y]),
+            chirality=np.rint(label_mean(charge)).astype(int),
+            map_index=np.rint(label_mean(map_index)).astype(int)
+        )
+
+    def compute_autocorrelation(
+        self,
+        orientation: NDArray,
+        mask: NDArray,
+        pad: bool = True
     ) -> NDArray:
-        """Detect pinwheel centers using phase singularity detection."""
-        # Calculate phase gradients
-        dy, dx = np.gradient(orientation)
+        """Autocorrelation of the doubled-angle orientation field.
 
-        # Compute curl
-        curl = dx[1:-1, :-1] - dx[1:-1, 1:] - (dy[:-1, 1:-1] - dy[1:, 1:-1])
+        The field ``exp(2iθ)`` is taken over the mask, its masked mean
+        removed, and correlated with itself through the FFT in
+        O(P log P). Each lag is normalized by the number of valid pixel
+        pairs it overlaps and by the zero-lag value, so the result is a
+        correlation coefficient in [-1, 1] centred at ``shape // 2``. Lags
+        with less than a quarter of the map's valid pixels overlapping are 0.
 
-        # Threshold curl to detect singularities
-        pinwheels = np.zeros_like(orientation, dtype=bool)
-        pinwheels[1:-1, 1:-1] = np.abs(curl) > self.pinwheel_threshold
+        Parameters
+        ----------
+        orientation : NDArray
+            Preferred orientation (radians), shape (..., H, W)
+        mask : NDArray
+            Valid pixels, same shape as ``orientation``
+        pad : bool
+            Zero-pad to avoid wrap-around, by default True. Without padding
+            the map is treated as periodic.
 
-        # Apply magnitude threshold and mask
-        pinwheels &= mask & (magnitude > self.min_magnitude)
+        Returns
+        -------
+        NDArray
+            Real autocorrelation, same shape as ``orientation``
+        """
+        mask = np.broadcast_to(mask, orientation.shape)
+        height, width = orientation.shape[-2:]
+        field = np.where(mask, np.exp(2j * np.where(mask, orientation, 0)), 0)
+        n_valid = np.maximum(mask.sum(axis=(-2, -1), keepdims=True), 1)
+        field = np.where(mask, field - field.sum(axis=(-2, -1), keepdims=True) / n_valid, 0)
+
+        if pad:
+            fft_shape = (sp_fft.next_fast_len(2 * height - 1), sp_fft.next_fast_len(2 * width - 1))
+        else:
+            fft_shape = (height, width)
+        power = np.abs(sp_fft.fft2(field, s=fft_shape)) ** 2
+        ac = sp_fft.ifft2(power).real
+        pairs = sp_fft.irfft2(np.abs(sp_fft.rfft2(mask.astype(float), s=fft_shape)) ** 2, s=fft_shape)
+
+        # Lags -H//2..(H-1)//2 centred at shape // 2
+        rows = np.arange(height) - height // 2
+        cols = np.arange(width) - width // 2
+        ac = ac[..., rows[:, None] % fft_shape[0], cols[None, :] % fft_shape[1]]
+        pairs = pairs[..., rows[:, None] % fft_shape[0], cols[None, :] % fft_shape[1]]
+
+        valid = pairs > 0.25 * n_valid
+        ac = np.where(valid, ac / np.maximum(pairs, 1), 0)
+        zero_lag = ac[..., height // 2, width // 2][..., None, None]
+        return np.where(zero_lag > 0, ac / np.where(zero_lag > 0, zero_lag, 1), 0)
+
+    @staticmethod
+    def radial_profile(
+        image: NDArray,
+        weights: Optional[NDArray] = None,
+        max_radius: Optional[int] = None
+    ) -> NDArray:
+        """Average an image over rings of integer radius about ``shape // 2``.
 
-        # Convert to coordinates
-        y_coords, x_coords = np.where(pinwheels)
-        return np.column_stack([x_coords, y_coords])
+        All rings of all stacked images are averaged in one ``bincount``.
 
-    def _estimate_domain_size(
+        Parameters
+        ----------
+        image : NDArray
+            Image(s), shape (..., H, W)
+        weights : Optional[NDArray]
+            Per-pixel weights, by default uniform; broadcast against ``image``
+        max_radius : Optional[int]
+            Largest radius kept, by default ``min(H, W) // 2``
+
+        Returns
+        -------
+        NDArray
+            Radial profile(s), shape (..., max_radius + 1); empty rings are NaN
+        """
+        height, width = image.shape[-2:]
+        if max_radius is None:
+            max_radius = min(height, width) // 2
+        y, x = np.indices((height, width))
+        radius = np.rint(np.hypot(y - height // 2, x - width // 2)).astype(np.intp)
+        n_bins = max_radius + 2  # Last bin collects everything further out
+
+        lead = image.shape[:-2]
+        n_images = int(np.prod(lead))
+        bins = np.minimum(radius, max_radius + 1) + n_bins * np.arange(n_images)[:, None, None]
+        weights = np.broadcast_to(1.0 if weights is None else weights, image.shape).reshape(bins.shape)
+        values = image.reshape(bins.shape)
+
+        sums = np.bincount(bins.ravel(), (values * weights).ravel(), minlength=n_bins * n_images)
+        counts = np.bincount(bins.ravel(), weights.ravel(), minlength=n_bins * n_images)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            profile = sums / counts
+        return profile.reshape(lead + (n_bins,))[..., :-1]
+
+    def estimate_domain_sizes(
         self,
         orientation: NDArray,
-        mask: NDArray
-    ) -> float:
-        """Estimate average orientation domain size using autocorrelation."""
-        # Calculate autocorrelation
-        orientation_masked = orientation.copy()
-        orientation_masked[~mask] = 0
+        mask: NDArray,
+        pad: bool = True
+    ) -> Tuple[NDArray, NDArray]:
+        """Estimate orientation domain size and map period from the autocorrelation.
 
-        ac = ndimage.correlate(orientation_masked, orientation_masked)
+        The domain size is the radius of the first minimum of the radially
+        averaged autocorrelation, where orientations are most dissimilar.
+        The period is the radius of the next maximum, where the map repeats.
 
-        # Find first minimum in radial average
-        center = np.array(ac.shape) // 2
-        y, x = np.indices(ac.shape)
-        r = np.sqrt((x - center[1])**2 + (y - center[0])**2)
+        Parameters
+        ----------
+        orientation : NDArray
+            Preferred orientation (radians), a map (H, W) or stack (..., H, W)
+        mask : NDArray
+            Valid pixels, broadcast against ``orientation``
+        pad : bool
+            Zero-pad the autocorrelation, by default True
+
+        Returns
+        -------
+        Tuple[NDArray, NDArray]
+            Domain sizes and periods in pixels, shape ``orientation.shape[:-2]``;
+            both are NaN where the profile has no valid rings, and periods
+            are NaN where the profile has no maximum after its minimum
+        """
+        ac = self.compute_autocorrelation(orientation, mask, pad)
+        # Rings without valid lags are NaN and count as neither rising nor falling
+        profile = self.radial_profile(ac, weights=(ac != 0))
+
+        n_radii = profile.shape[-1]
+        radii = np.arange(n_radii - 1)
+        step = np.diff(profile, axis=-1)
 
-        r_unique = np.unique(r.round().astype(int))
-        ac_radial = [ac[r == rad].mean() for rad in r_unique]
+        rising = step > 0
+        domain = np.where(rising.any(axis=-1), np.argmax(rising, axis=-1), n_radii - 1)
+        falling = (step < 0) & (radii > domain[..., None])
+        period = np.where(falling.any(axis=-1), np.argmax(falling, axis=-1), np.nan)
 
-        # Find first minimum after peak
-        peak_idx = np.argmax(ac_radial)
-        min_idx = peak_idx + np.argmin(ac_radial[peak_idx:])
+        empty = np.isnan(profile).all(axis=-1)
+        domain = np.where(empty, np.nan, domain)
+        period = np.where(empty, np.nan, period)
+        return domain, period
 
-        return r_unique[min_idx]
+    def _estimate_domain_size(
+        self,
+        orientation: NDArray,
+        mask: NDArray
+    ) -> float:
+        """Estimate average orientation domain size using autocorrelation."""
+        domain_size, _ = self.estimate_domain_sizes(orientation, mask)
+        return float(domain_size)
 
     def get_analysis_summary(
         self,
@@ -213,5 +451,6 @@ class OrientationAnalyzer:
             'median_uniformity': np.nanmedian(result.uniformity),
             'mean_gradient': np.nanmean(result.gradient),
             'pinwheel_density': len(result.pinwheel_centers) / np.sum(~np.isnan(result.selectivity)),
-            'domain_size': result.domain_size
+            'domain_size': result.domain_size,
+            'periodicity': result.periodicity
         }
@@ -1,7 +1,7 @@
 # src/paralisi/core/configurations/__init__.py
 #
 from .acquisition_config import AcquisitionConfig
-from .experiment_config import ExperimentConfig
 from .processing_config import ProcessingConfig
+from .experiment_config import ExperimentConfig
 
 __all__ = ["AcquisitionConfig", "ExperimentConfig", "ProcessingConfig"]
@@ -1,7 +1,7 @@
 # src/paralisi/core/configurations/filter_config.py
 from typing import Optional, Tuple
 from dataclasses import dataclass
-from ..types import KernelType
+from ..types import KernelType, TransferFunctionType
 
 @dataclass
 class FilterConfiguration:
@@ -9,3 +9,16 @@ class FilterConfiguration:
     high_pass_params: Optional[Tuple[float, KernelType]] = None  # (width, type)
     low_pass_params: Optional[Tuple[float, KernelType]] = None   # (width, type)
     normalize: bool = True
+
+@dataclass(frozen=True)
+class FrequencyBand:
+    """Band of spatial frequencies kept by a frequency-domain band-pass filter.
+
+    Widths are in pixels, as for ``FilterConfiguration``: structure coarser
+    than ``high_pass_width`` and finer than ``low_pass_width`` is removed.
+    Either edge may be omitted for a pure low- or high-pass band.
+    """
+    high_pass_width: Optional[float] = None
+    low_pass_width: Optional[float] = None
+    shape: TransferFunctionType = TransferFunctionType.GAUSSIAN
+    order: int = 2  # Butterworth order
@@ -1,9 +1,9 @@
 # src/paralisi/core/data/__init__.py
 
-from .masks import MaskData
+from .masks import CompactMask, MaskData
 from .processed_trial import ProcessedTrial
 from .data import RawData, ProcessedData
 from .trial_data import TrialData
 from .trial_metadata import TrialMetadata
 
-__all__ = ["MaskData", "ProcessedTrial", "RawData", "ProcessedData", "TrialData", "TrialMetadata"]
+__all__ = ["CompactMask", "MaskData", "ProcessedTrial", "RawData", "ProcessedData", "TrialData", "TrialMetadata"]
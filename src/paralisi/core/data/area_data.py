@@ -4,15 +4,37 @@
 
 from dataclasses import dataclass
 from typing import List, Tuple
+import numpy as np
 from numpy.typing import NDArray
+from .masks import CompactMask
 
 @dataclass
 class AreaData:
-    """Information about a detected visual area."""
+    """Information about a detected visual area.
+
+    The area mask is stored as a ``CompactMask``; use ``boundary.to_dense()``
+    or ``np.asarray(boundary)`` for the full-frame view, and ``from_dense``
+    to build an area from a full-frame mask.
+    """
     id: int
     name: str
-    boundary: NDArray  # Boolean mask of area boundary
+    boundary: CompactMask  # Mask of the area, stored as a bounding-box crop
     center: Tuple[float, float]  # Center of mass coordinates
     sign: float  # Visual field sign (1 or -1)
     size: float  # Area size in mm²
     neighbors: List[int]  # IDs of neighboring areas
+
+    @classmethod
+    def from_dense(
+        cls,
+        id: int,
+        name: str,
+        boundary: NDArray,
+        center: Tuple[float, float],
+        sign: float,
+        size: float,
+        neighbors: List[int]
+    ) -> "AreaData":
+        """Build an area from a full-frame boolean mask, cropped to its bounding box."""
+        return cls(id, name, CompactMask.from_dense(np.asarray(boundary, dtype=bool)),
+                   center, sign, size, neighbors)
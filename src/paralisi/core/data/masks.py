@@ -1,6 +1,157 @@
 # src/paralisi/core/data/masks.py
 
+from typing import Dict, Tuple
 from numpy.typing import NDArray
 import numpy as np
 
 MaskData = NDArray[np.bool_]
+
+COMPACT_MASK_ENCODING = "compact_mask"
+
+class CompactMask:
+    """Boolean mask stored as a bounding-box crop plus its offset in the frame.
+
+    Visual areas cover a small fraction of the imaged field, so storing only
+    the bounding box keeps masks small in memory and on disk. The full-frame
+    mask is only expanded on request and never retained, and area, union
+    and intersection operate directly on the crops.
+
+    Parameters
+    ----------
+    crop : NDArray
+        Boolean mask of the bounding box
+    offset : Tuple[int, int]
+        (row, column) position of the crop's top-left corner in the frame
+    shape : Tuple[int, int]
+        Shape of the full frame
+    """
+
+    __slots__ = ("crop", "offset", "shape")
+
+    def __init__(self, crop: NDArray, offset: Tuple[int, int], shape: Tuple[int, int]):
+        self.crop = np.asarray(crop, dtype=bool)
+        self.offset = (int(offset[0]), int(offset[1]))
+        self.shape = (int(shape[0]), int(shape[1]))
+
+        if (self.offset[0] < 0 or self.offset[1] < 0 or
+                self.offset[0] + self.crop.shape[0] > self.shape[0] or
+                self.offset[1] + self.crop.shape[1] > self.shape[1]):
+            raise ValueError("Mask crop does not fit inside the frame")
+
+    @classmethod
+    def from_dense(cls, mask: NDArray) -> "CompactMask":
+        """Crop a full-frame boolean mask to its bounding box."""
+        mask = np.asarray(mask, dtype=bool)
+        return cls._trimmed(mask, (0, 0), mask.shape)
+
+    @classmethod
+    def empty(cls, shape: Tuple[int, int]) -> "CompactMask":
+        """Mask without pixels, stored as a 0×0 crop at the frame origin."""
+        return cls(np.zeros((0, 0), dtype=bool), (0, 0), shape)
+
+    @classmethod
+    def _trimmed(cls, window: NDArray, offset: Tuple[int, int], shape: Tuple[int, int]) -> "CompactMask":
+        """Crop a mask window placed at ``offset`` down to its true bounding box."""
+        rows = np.flatnonzero(window.any(axis=1))
+        if rows.size == 0:
+            return cls.empty(shape)
+        cols = np.flatnonzero(window.any(axis=0))
+        bbox = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        return cls(window[bbox], (offset[0] + rows[0], offset[1] + cols[0]), shape)
+
+    @classmethod
+    def from_label(
+        cls,
+        labels: NDArray,
+        label_id: int,
+        bbox: Tuple[slice, slice]
+    ) -> "CompactMask":
+        """Build the mask of one label from its ``find_objects`` bounding box."""
+        return cls(labels[bbox] == label_id, (bbox[0].start, bbox[1].start), labels.shape)
+
+    @property
+    def bbox(self) -> Tuple[slice, slice]:
+        """Bounding box of the crop as frame slices."""
+        r0, c0 = self.offset
+        return (slice(r0, r0 + self.crop.shape[0]), slice(c0, c0 + self.crop.shape[1]))
+
+    @property
+    def area(self) -> int:
+        """Number of pixels in the mask."""
+        return int(np.count_nonzero(self.crop))
+
+    def to_dense(self) -> MaskData:
+        """Full-frame boolean mask, as a new array on every call."""
+        dense = np.zeros(self.shape, dtype=bool)
+        dense[self.bbox] = self.crop
+        return dense
+
+    def __array__(self, dtype=None, copy=None) -> NDArray:
+        dense = self.to_dense()
+        return dense.astype(dtype, copy=False) if dtype is not None else dense
+
+    def _combine(self, other: "CompactMask", union: bool) -> "CompactMask":
+        if self.shape != other.shape:
+            raise ValueError("Masks must share the same frame shape")
+        # An empty operand has a meaningless 0×0 box at the origin, which
+        # would otherwise stretch a union out to the frame corner
+        if self.area == 0 or other.area == 0:
+            if not union:
+                return CompactMask.empty(self.shape)
+            return other if self.area == 0 else self
+
+        (a0, a1), (b0, b1) = self.bbox, other.bbox
+        if union:
+            rows = slice(min(a0.start, b0.start), max(a0.stop, b0.stop))
+            cols = slice(min(a1.start, b1.start), max(a1.stop, b1.stop))
+        else:
+            rows = slice(max(a0.start, b0.start), min(a0.stop, b0.stop))
+            cols = slice(max(a1.start, b1.start), min(a1.stop, b1.stop))
+            if rows.start >= rows.stop or cols.start >= cols.stop:
+                return CompactMask.empty(self.shape)
+
+        crop_a = self._window(rows, cols)
+        crop_b = other._window(rows, cols)
+        crop = (crop_a | crop_b) if union else (crop_a & crop_b)
+        return CompactMask._trimmed(crop, (rows.start, cols.start), self.shape)
+
+    def _window(self, rows: slice, cols: slice) -> MaskData:
+        """Return this mask within a frame window, padding outside the crop."""
+        window = np.zeros((rows.stop - rows.start, cols.stop - cols.start), dtype=bool)
+        own_rows, own_cols = self.bbox
+        r0, r1 = max(rows.start, own_rows.start), min(rows.stop, own_rows.stop)
+        c0, c1 = max(cols.start, own_cols.start), min(cols.stop, own_cols.stop)
+        if r0 < r1 and c0 < c1:
+            window[r0 - rows.start:r1 - rows.start, c0 - cols.start:c1 - cols.start] = \
+                self.crop[r0 - own_rows.start:r1 - own_rows.start,
+                          c0 - own_cols.start:c1 - own_cols.start]
+        return window
+
+    def union(self, other: "CompactMask") -> "CompactMask":
+        """Pixels in either mask."""
+        return self._combine(other, union=True)
+
+    def intersection(self, other: "CompactMask") -> "CompactMask":
+        """Pixels in both masks."""
+        return self._combine(other, union=False)
+
+    __or__ = union
+    __and__ = intersection
+
+    def to_arrays(self) -> Dict[str, NDArray]:
+        """Encode the mask as bit-packed crop plus geometry for serialization."""
+        return {
+            "packed": np.packbits(self.crop, axis=None),
+            "geometry": np.array([*self.offset, *self.shape, *self.crop.shape], dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, packed: NDArray, geometry: NDArray) -> "CompactMask":
+        """Decode a mask written by ``to_arrays``."""
+        r0, c0, height, width, crop_h, crop_w = (int(v) for v in geometry)
+        crop = np.unpackbits(np.asarray(packed, dtype=np.uint8), count=crop_h * crop_w)
+        return cls(crop.reshape(crop_h, crop_w).astype(bool), (r0, c0), (height, width))
+
+    def __repr__(self) -> str:
+        return (f"CompactMask(shape={self.shape}, offset={self.offset}, "
+                f"crop_shape={self.crop.shape}, area={self.area})")
@@ -2,14 +2,16 @@
 
 
 from .data_exceptions import ConfigurationError, DataLoadingError, MetadataError
-from .processing_exceptions import ProcessingError, ValidationError
+from .processing_exceptions import AnalysisError, ProcessingError, RegistrationError, ValidationError
 from .storage_exceptions import StorageError
 
 __all__ = [
+    "AnalysisError",
     "ConfigurationError",
     "DataLoadingError",
     "MetadataError",
     "ProcessingError",
+    "RegistrationError",
     "ValidationError",
     "StorageError"
 ]
@@ -14,3 +14,13 @@ class SegmentationError(Exception):
     """Exception raised for errors in the data segmentation."""
     def __init__(self, message: str):
         super().__init__(message)
+
+class RegistrationError(Exception):
+    """Exception raised for errors in image registration."""
+    def __init__(self, message: str):
+        super().__init__(message)
+
+class AnalysisError(Exception):
+    """Exception raised for errors in the analysis of processed data."""
+    def __init__(self, message: str):
+        super().__init__(message)
@@ -1,11 +1,13 @@
 # src/paralisi/core/types/__init__.py
 
 from .data_quality_metric import DataQualityMetric
-from .kernels import KernelType
+from .kernels import ConvolutionMethod, KernelType, TransferFunctionType
 from .registration_methods import RegistrationMethod
 
 __all__ = [
+    "ConvolutionMethod",
     "DataQualityMetric",
     "KernelType",
-    "RegistrationMethod"
+    "RegistrationMethod",
+    "TransferFunctionType"
 ]
@@ -5,3 +5,17 @@ class KernelType(Enum):
     GAUSSIAN = "gaussian"
     HANN = "hann"
     DISK = "disk"
+
+class ConvolutionMethod(Enum):
+    """Backends for spatial convolution."""
+    AUTO = "auto"
+    DIRECT = "direct"
+    FFT = "fft"
+    OVERLAP_ADD = "overlap_add"
+    SEPARABLE = "separable"
+
+class TransferFunctionType(Enum):
+    """Frequency-domain transfer function shapes for band-pass filtering."""
+    GAUSSIAN = "gaussian"
+    HANN = "hann"
+    BUTTERWORTH = "butterworth"
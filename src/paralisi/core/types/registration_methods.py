@@ -7,3 +7,4 @@ class RegistrationMethod(Enum):
     RIGID = "rigid"
     AFFINE = "affine"
     ELASTIC = "elastic"
+    PHASE_CORRELATION = "phase_correlation"
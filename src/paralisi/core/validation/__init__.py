@@ -1,6 +1,7 @@
 # src/paralisi/core/validation/__init__.py
 
 from .data_integrity_validator import DataIntegrityValidator
+from .fused_validator import FusedValidator, StackStatistics
 from .motion_artifacts_validator import MotionArtifactsValidator
 from .photobleaching_validator import PhotobleachingValidator
 from .snr_validator import SNRValidator
@@ -9,9 +10,11 @@ from .validator import Validator
 
 __all__ = [
     "DataIntegrityValidator",
+    "FusedValidator",
     "MotionArtifactsValidator",
     "PhotobleachingValidator",
     "SNRValidator",
+    "StackStatistics",
     "SyncSignalValidator",
     "Validator"
 ]
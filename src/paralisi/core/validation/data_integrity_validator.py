@@ -2,7 +2,7 @@
 
 import numpy as np
 from numpy.typing import NDArray
-from typing import Dict
+from typing import Dict, Tuple
 from ..interfaces import Validator
 from ..exceptions import ValidationError
 
@@ -10,13 +10,18 @@ class DataIntegrityValidator(Validator):
     """Validates data integrity and consistency"""
 
     def validate(self, data: NDArray, metadata: Dict) -> float:
-        expected_frames = metadata.get('frames_expected', 0)
-        if expected_frames > 0 and data.shape[0] != expected_frames:
-            raise ValidationError(f"Frame count mismatch: {data.shape[0]} vs {expected_frames}")
+        self.validate_layout(data.shape, data.dtype, metadata)
 
         if np.any(np.isnan(data)):
             raise ValidationError("Dataset contains NaN values")
-
-        if not np.issubdtype(data.dtype, np.floating):
-            raise ValidationError(f"Invalid data type: {data.dtype}")
         return 0.0  # Return a dummy metric for consistency
+
+    @staticmethod
+    def validate_layout(shape: Tuple[int, ...], dtype: np.dtype, metadata: Dict) -> None:
+        """Run the checks that need no pixel data: frame count and dtype"""
+        expected_frames = metadata.get('frames_expected', 0)
+        if expected_frames > 0 and shape[0] != expected_frames:
+            raise ValidationError(f"Frame count mismatch: {shape[0]} vs {expected_frames}")
+
+        if not np.issubdtype(dtype, np.floating):
+            raise ValidationError(f"Invalid data type: {dtype}")
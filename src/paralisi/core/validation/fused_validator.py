@@ -0,0 +1,170 @@
+# src/paralisi/core/validation/fused_validator.py
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+import numpy as np
+from numpy.typing import NDArray
+from ..exceptions import ValidationError
+from .data_integrity_validator import DataIntegrityValidator
+from .motion_artifacts_validator import MotionArtifactsValidator
+from .photobleaching_validator import PhotobleachingValidator
+from .snr_validator import SNRValidator
+from .sync_signal_validator import SyncSignalValidator
+
+@dataclass
+class StackStatistics:
+    """Statistics of a frame stack gathered in one pass"""
+    n_frames: int
+    nan_count: int
+    minimum: float
+    maximum: float
+    mean_abs_diff: float  # Mean absolute frame-to-frame change
+    frame_means: NDArray  # Mean intensity per frame
+    temporal_mean: NDArray  # Per-pixel mean over frames
+    temporal_std: NDArray  # Per-pixel standard deviation over frames
+
+class FusedValidator:
+    """Runs the stack validators in a single chunked pass over the data.
+
+    The integrity, motion-artifact, SNR and photobleaching validators each
+    scan the whole stack. This engine reads it once, in chunks of frames,
+    and accumulates everything they need: NaN count, minimum and maximum,
+    absolute frame differences (carrying the last frame across chunks),
+    per-frame means, and per-pixel temporal mean and variance (merged
+    chunk by chunk for numerical stability). Temporaries are chunk-sized,
+    so memory-mapped stacks larger than memory are read sequentially once.
+
+    Frame count and dtype are checked before any data is read, and with
+    ``early_exit`` the pass stops at the first chunk containing NaN.
+
+    Parameters
+    ----------
+    chunk_frames : int, optional
+        Frames read per chunk, by default 64
+    early_exit : bool, optional
+        Whether to raise on the first NaN rather than count them all,
+        by default True
+    """
+
+    def __init__(self, chunk_frames: int = 64, early_exit: bool = True):
+        self.chunk_frames = chunk_frames
+        self.early_exit = early_exit
+
+    def compute_statistics(
+        self,
+        data: Union[NDArray, Path, str],
+        metadata: Optional[Dict] = None
+    ) -> StackStatistics:
+        """Gather validation statistics of a stack in one pass.
+
+        Parameters
+        ----------
+        data : Union[NDArray, Path, str]
+            Stack (T, H, W), any array-like that can be sliced by frame
+            (``np.memmap``, HDF5 dataset), or a ``.npy`` file opened
+            memory-mapped
+        metadata : Optional[Dict]
+            Experiment metadata; 'frames_expected' is checked
+
+        Returns
+        -------
+        StackStatistics
+            Accumulated statistics
+
+        Raises
+        ------
+        ValidationError
+            If the layout is invalid, or NaN values are found with ``early_exit``
+        """
+        if isinstance(data, (str, Path)):
+            data = np.load(data, mmap_mode='r')
+        DataIntegrityValidator.validate_layout(data.shape, data.dtype, metadata or {})
+
+        n_frames = data.shape[0]
+        frame_shape = data.shape[1:]
+        frame_means = np.empty(n_frames)
+        mean = np.zeros(frame_shape)
+        m2 = np.zeros(frame_shape)
+        nan_count, abs_diff_sum = 0, 0.0
+        minimum, maximum = np.inf, -np.inf
+        previous = None
+
+        for start in range(0, n_frames, self.chunk_frames):
+            chunk = np.asarray(data[start:start + self.chunk_frames], dtype=np.float64)
+            n_chunk = len(chunk)
+
+            chunk_nans = int(np.count_nonzero(np.isnan(chunk)))
+            if chunk_nans and self.early_exit:
+                raise ValidationError("Dataset contains NaN values")
+            nan_count += chunk_nans
+
+            reduce_min, reduce_max = (np.nanmin, np.nanmax) if chunk_nans else (np.min, np.max)
+            minimum = min(minimum, float(reduce_min(chunk)))
+            maximum = max(maximum, float(reduce_max(chunk)))
+            frame_means[start:start + n_chunk] = chunk.reshape(n_chunk, -1).mean(axis=1)
+
+            if previous is not None:
+                abs_diff_sum += float(np.abs(chunk[0] - previous).sum())
+            abs_diff_sum += float(np.abs(np.diff(chunk, axis=0)).sum())
+            previous = chunk[-1].copy()
+
+            # Chan et al. pairwise merge of running and chunk moments
+            chunk_mean = chunk.mean(axis=0)
+            chunk_m2 = ((chunk - chunk_mean) ** 2).sum(axis=0)
+            delta = chunk_mean - mean
+            total = start + n_chunk
+            mean += delta * (n_chunk / total)
+            m2 += chunk_m2 + delta ** 2 * (start * n_chunk / total)
+
+        n_diffs = max(n_frames - 1, 0) * int(np.prod(frame_shape))
+        return StackStatistics(
+            n_frames=n_frames,
+            nan_count=nan_count,
+            minimum=minimum,
+            maximum=maximum,
+            mean_abs_diff=abs_diff_sum / n_diffs if n_diffs else float('nan'),
+            frame_means=frame_means,
+            temporal_mean=mean,
+            temporal_std=np.sqrt(m2 / max(n_frames, 1))
+        )
+
+    def validate(
+        self,
+        data: Union[NDArray, Path, str],
+        metadata: Optional[Dict] = None,
+        sync_signal: Optional[NDArray] = None
+    ) -> Dict[str, float]:
+        """Run all validators from one pass over the stack.
+
+        Parameters
+        ----------
+        data : Union[NDArray, Path, str]
+            Stack (T, H, W), sliceable array-like or ``.npy`` path
+        metadata : Optional[Dict]
+            Experiment metadata
+        sync_signal : Optional[NDArray]
+            Synchronization signal, validated too if given
+
+        Returns
+        -------
+        Dict[str, float]
+            'motion_artifacts', 'snr' and 'photobleaching' metrics, as the
+            individual validators compute them, plus 'sync_signal' if given
+
+        Raises
+        ------
+        ValidationError
+            If data integrity checks fail
+        """
+        stats = self.compute_statistics(data, metadata)
+        metrics = {
+            'motion_artifacts': MotionArtifactsValidator.motion_metric(
+                stats.mean_abs_diff, stats.maximum - stats.minimum
+            ),
+            'snr': SNRValidator.snr(stats.temporal_mean, stats.temporal_std),
+            'photobleaching': PhotobleachingValidator.total_decay(stats.frame_means),
+        }
+        if sync_signal is not None:
+            metrics['sync_signal'] = SyncSignalValidator().validate(sync_signal, {})
+        return metrics
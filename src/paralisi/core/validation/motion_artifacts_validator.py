@@ -10,8 +10,11 @@ class MotionArtifactsValidator(Validator):
 
     def validate(self, data: NDArray, metadata: Dict) -> float:
         frame_diff = np.diff(data, axis=0)
-        motion_metric = np.mean(np.abs(frame_diff))
-        intensity_range = np.max(data) - np.min(data)
+        return self.motion_metric(np.mean(np.abs(frame_diff)), np.max(data) - np.min(data))
+
+    @staticmethod
+    def motion_metric(mean_abs_diff: float, intensity_range: float) -> float:
+        """Mean absolute frame-to-frame change relative to the intensity range"""
         if intensity_range > 0:
-            motion_metric /= intensity_range
-        return float(motion_metric)
+            mean_abs_diff /= intensity_range
+        return float(mean_abs_diff)
@@ -10,7 +10,11 @@ class PhotobleachingValidator(Validator):
     """Checks for photobleaching effects"""
 
     def validate(self, data: NDArray, metadata: Dict) -> float:
-        mean_intensity = np.mean(data, axis=(1, 2))
+        return self.total_decay(np.mean(data, axis=(1, 2)))
+
+    @staticmethod
+    def total_decay(mean_intensity: NDArray) -> float:
+        """Fitted intensity change over the recording relative to the first frame"""
         time_points = np.arange(len(mean_intensity))
         slope, intercept, r_value, p_value, std_err = linregress(time_points, mean_intensity)
         initial_intensity = float(mean_intensity[0])
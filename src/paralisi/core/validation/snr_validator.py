@@ -9,8 +9,11 @@ class SNRValidator(Validator):
     """Calculates signal-to-noise ratio"""
 
     def validate(self, data: NDArray, metadata: Dict) -> float:
-        temporal_mean = np.mean(data, axis=0)
-        temporal_std = np.std(data, axis=0)
+        return self.snr(np.mean(data, axis=0), np.std(data, axis=0))
+
+    @staticmethod
+    def snr(temporal_mean: NDArray, temporal_std: NDArray) -> float:
+        """Mean over pixels of temporal mean over temporal standard deviation"""
         with np.errstate(divide='ignore', invalid='ignore'):
             snr = np.nanmean(temporal_mean / temporal_std)
         return float(snr)
@@ -1,10 +1,14 @@
 # src/paralisi/core/validation/validator.py
 
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Optional, Union
 from numpy.typing import NDArray
 from ..interfaces.validator import Validator as ValidatorProtocol
 from ..exceptions import ValidationError
-from . import DataIntegrityValidator, MotionArtifactsValidator, PhotobleachingValidator, SNRValidator, SyncSignalValidator
+from . import (
+    DataIntegrityValidator, FusedValidator, MotionArtifactsValidator, PhotobleachingValidator, SNRValidator,
+    SyncSignalValidator
+)
 
 class Validator:
     """Encapsulates all validation methods."""
@@ -15,6 +19,7 @@ class Validator:
         self.motion_artifacts_validator = MotionArtifactsValidator()
         self.snr_validator = SNRValidator()
         self.photobleaching_validator = PhotobleachingValidator()
+        self.fused_validator = FusedValidator()
 
     def validate_data_integrity(self, data: NDArray, metadata: Dict) -> None:
         self.data_integrity_validator.validate(data, metadata)
@@ -30,3 +35,12 @@ class Validator:
 
     def check_photobleaching(self, data: NDArray) -> float:
         return self.photobleaching_validator.validate(data, {})
+
+    def validate_all(
+        self,
+        data: Union[NDArray, Path],
+        metadata: Dict,
+        sync_signal: Optional[NDArray] = None
+    ) -> Dict[str, float]:
+        """Check integrity and compute all stack metrics in one pass over the data."""
+        return self.fused_validator.validate(data, metadata, sync_signal)
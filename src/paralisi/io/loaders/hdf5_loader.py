@@ -4,21 +4,26 @@
 
 import h5py
 from pathlib import Path
+from typing import Union
 import numpy as np
+from ...core.data.masks import COMPACT_MASK_ENCODING, CompactMask
 
 class HDF5Loader:
     """Class for loading HDF5 files."""
 
     @staticmethod
-    def load(file_path: Path, dataset_name: str) -> np.ndarray:
+    def load(file_path: Path, dataset_name: str) -> Union[np.ndarray, CompactMask]:
         """Load data from an HDF5 file.
 
+        Groups written by HDF5Saver for compact masks are returned as
+        ``CompactMask`` objects.
+
         Args:
             file_path (Path): Path to the HDF5 file.
             dataset_name (str): Name of the dataset to load from the file.
 
         Returns:
-            np.ndarray: Loaded data.
+            Union[np.ndarray, CompactMask]: Loaded data.
 
         Raises:
             FileNotFoundError: If the file does not exist.
@@ -32,8 +37,12 @@ class HDF5Loader:
             with h5py.File(file_path, 'r') as f:
                 if dataset_name not in f:
                     raise KeyError(f"Dataset '{dataset_name}' not found in file: {file_path}")
-                # Explicitly cast to numpy array to handle different HDF5 types
-                data = np.array(f[dataset_name])
+                node = f[dataset_name]
+                if isinstance(node, h5py.Group) and node.attrs.get('encoding') == COMPACT_MASK_ENCODING:
+                    data = CompactMask.from_arrays(node['packed'][()], node['geometry'][()])
+                else:
+                    # Explicitly cast to numpy array to handle different HDF5 types
+                    data = np.array(node)
         except Exception as e:
             raise ValueError(f"Failed to load dataset '{dataset_name}' from file '{file_path}': {str(e)}") from e
 
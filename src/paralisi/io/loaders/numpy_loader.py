@@ -1,7 +1,10 @@
 # src/paralisi/io/loaders/numpy_loader.py
 
+import json
 import numpy as np
 from pathlib import Path
+from typing import Any, Dict
+from ...core.data.masks import CompactMask
 
 class NumpyLoader:
     """Class for loading NumPy files."""
@@ -19,3 +22,34 @@ class NumpyLoader:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         return np.load(file_path)
+
+    @staticmethod
+    def load_archive(file_path: Path) -> Dict[str, Any]:
+        """Load all entries of an archive written by NPZSaver.
+
+        Compact masks are rebuilt as ``CompactMask`` objects and the metadata
+        entry is decoded from JSON.
+
+        Args:
+            file_path (Path): Path to the NPZ archive.
+
+        Returns:
+            Dict[str, Any]: Arrays, compact masks and metadata by key.
+        """
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        with np.load(file_path) as archive:
+            compact_keys = archive['compact_masks'].tolist() if 'compact_masks' in archive else []
+            encoded = {f"{key}.{name}" for key in compact_keys for name in ('packed', 'geometry')}
+
+            data: Dict[str, Any] = {
+                key: archive[key] for key in archive.files
+                if key not in encoded and key not in ('compact_masks', 'metadata')
+            }
+            for key in compact_keys:
+                data[key] = CompactMask.from_arrays(archive[f"{key}.packed"], archive[f"{key}.geometry"])
+            if 'metadata' in archive:
+                data['metadata'] = json.loads(archive['metadata'].item().decode())
+
+        return data
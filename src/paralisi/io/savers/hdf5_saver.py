@@ -5,18 +5,30 @@
 import h5py
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Union
 import numpy as np
+from ...core.data.masks import COMPACT_MASK_ENCODING, CompactMask
 
 class HDF5Saver:
-    """Saves data in HDF5 format."""
+    """Saves data in HDF5 format.
 
-    def save(self, filename: str, data: Dict[str, np.ndarray], metadata: Dict[str, Any], output_path: Path) -> Path:
+    ``CompactMask`` values are written as a group holding the bit-packed crop
+    and its geometry, tagged with an ``encoding`` attribute so loaders can
+    rebuild the mask without expanding it to the full frame.
+    """
+
+    def save(self, filename: str, data: Dict[str, Union[np.ndarray, CompactMask]], metadata: Dict[str, Any], output_path: Path) -> Path:
         file_path = output_path / f"{filename}.h5"
         with h5py.File(file_path, 'w') as f:
             data_group = f.create_group('data')
             for key, array in data.items():
-                data_group.create_dataset(key, data=array)
+                if isinstance(array, CompactMask):
+                    mask_group = data_group.create_group(key)
+                    mask_group.attrs['encoding'] = COMPACT_MASK_ENCODING
+                    for name, encoded in array.to_arrays().items():
+                        mask_group.create_dataset(name, data=encoded)
+                else:
+                    data_group.create_dataset(key, data=array)
 
             meta_group = f.create_group('metadata')
             for key, value in metadata.items():
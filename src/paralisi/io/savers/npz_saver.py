@@ -2,14 +2,31 @@
 
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Union
 import numpy as np
+from ...core.data.masks import CompactMask
 
 class NPZSaver:
-    """Saves data in NPZ format."""
+    """Saves data in NPZ format.
 
-    def save(self, filename: str, data: Dict[str, np.ndarray], metadata: Dict[str, Any], output_path: Path) -> Path:
+    ``CompactMask`` values are stored as ``<key>.packed`` and ``<key>.geometry``
+    entries and listed under ``compact_masks`` in the archive.
+    """
+
+    def save(self, filename: str, data: Dict[str, Union[np.ndarray, CompactMask]], metadata: Dict[str, Any], output_path: Path) -> Path:
         file_path = output_path / f"{filename}.npz"
-        save_dict = {**data, 'metadata': np.array(json.dumps(metadata).encode())}
+        save_dict = {}
+        compact_keys = []
+        for key, array in data.items():
+            if isinstance(array, CompactMask):
+                for name, encoded in array.to_arrays().items():
+                    save_dict[f"{key}.{name}"] = encoded
+                compact_keys.append(key)
+            else:
+                save_dict[key] = array
+
+        save_dict['metadata'] = np.array(json.dumps(metadata).encode())
+        if compact_keys:
+            save_dict['compact_masks'] = np.array(compact_keys)
         np.savez_compressed(file_path, **save_dict)
         return file_path
@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Dict, Any, Union, Optional
 from datetime import datetime
 from ...core.exceptions.io_exceptions import IOError
-from ...core.interfaces.data_writer import IDataWriter
+from ...core.interfaces.data_writer import DataWriter as IDataWriter
 from ...io.savers.hdf5_saver import HDF5Saver
 from ...io.savers.npz_saver import NPZSaver
 
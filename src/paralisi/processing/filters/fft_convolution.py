@@ -0,0 +1,265 @@
+# src/paralisi/processing/filters/fft_convolution.py
+
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Optional, Tuple
+import numpy as np
+from numpy.typing import NDArray
+from scipy import fft as sp_fft
+from scipy import signal
+from ...core.types.kernels import ConvolutionMethod
+from .separable import SeparableTerms, separable_convolve_same, separable_terms
+
+# Relative per-element costs used to choose a convolution backend, measured
+# against scipy.signal.convolve2d, scipy.ndimage.convolve1d and scipy.fft on
+# float64 frames
+_DIRECT_COST = 1.0           # One multiply-add of direct convolution
+_FFT_COST = 0.45             # One element of a forward/inverse transform, per log2 of its size
+_OVERLAP_ADD_OVERHEAD = 1.5  # Blocking and summing block outputs back into place
+_SEPARABLE_TAP_COST = 0.35   # One tap of a 1D convolution pass
+_SEPARABLE_PASS_COST = 3.0   # Per-pixel overhead of one 1D convolution pass
+
+class KernelSpectrumCache:
+    """Memoizes kernel spectra by kernel content, transform shape and dtype.
+
+    Callers that already identify the kernel (for example by its filter
+    configuration) can pass their own ``key`` instead of having the kernel
+    contents hashed on every lookup. Spectra are stored read-only and the
+    cache is safe to share between threads.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Number of spectra kept before the least recently used one is evicted,
+        by default 32
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._spectra: "OrderedDict[Hashable, NDArray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def kernel_key(kernel: NDArray) -> str:
+        """Digest identifying a kernel by its contents."""
+        kernel = np.ascontiguousarray(kernel)
+        digest = hashlib.blake2b(kernel.view(np.uint8), digest_size=16)
+        digest.update(f"{kernel.shape}{kernel.dtype}".encode())
+        return digest.hexdigest()
+
+    def get(
+        self,
+        kernel: NDArray,
+        fft_shape: Tuple[int, int],
+        dtype: np.dtype,
+        real: bool = True,
+        key: Optional[Hashable] = None
+    ) -> NDArray:
+        """Return the spectrum of ``kernel`` zero-padded to ``fft_shape``.
+
+        ``key`` identifies the kernel; by default a digest of its contents.
+        """
+        kernel_id = key if key is not None else self.kernel_key(kernel)
+        key = (kernel_id, tuple(fft_shape), np.dtype(dtype).str, real)
+        with self._lock:
+            spectrum = self._spectra.get(key)
+            if spectrum is not None:
+                self._spectra.move_to_end(key)
+                return spectrum
+
+        transform = sp_fft.rfft2 if real else sp_fft.fft2
+        spectrum = transform(kernel.astype(dtype, copy=False), s=fft_shape)
+        spectrum.flags.writeable = False
+        with self._lock:
+            spectrum = self._spectra.setdefault(key, spectrum)
+            self._spectra.move_to_end(key)
+            while len(self._spectra) > self.max_entries:
+                self._spectra.popitem(last=False)
+        return spectrum
+
+    def clear(self) -> None:
+        """Drop all cached spectra."""
+        with self._lock:
+            self._spectra.clear()
+
+def _same_slices(shape: Tuple[int, int], kernel_shape: Tuple[int, int]) -> Tuple[slice, slice]:
+    """Window of a 'full' convolution that ``convolve2d(mode='same')`` returns."""
+    return tuple(
+        slice((k - 1) // 2, (k - 1) // 2 + n) for n, k in zip(shape, kernel_shape)
+    )
+
+def _overlap_add_block(kernel_size: int) -> int:
+    """Transform length per block for overlap-add along one axis."""
+    return sp_fft.next_fast_len(max(4 * kernel_size, 64), real=True)
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    """Number of threads for a ``workers`` setting, negative counting back from all cores."""
+    if workers is None:
+        return 1
+    if workers < 0:
+        workers += (os.cpu_count() or 1) + 1
+    return max(1, workers)
+
+def _map_frames(
+    fn: Callable[[NDArray], NDArray],
+    data: NDArray,
+    workers: Optional[int]
+) -> NDArray:
+    """Apply a per-array filter to chunks of a frame stack on worker threads."""
+    workers = _resolve_workers(workers)
+    if workers == 1 or data.ndim < 3:
+        return fn(data)
+    frames = data.reshape(-1, *data.shape[-2:])
+    chunks = np.array_split(frames, min(workers, len(frames)))
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        results = list(pool.map(fn, chunks))
+    return np.concatenate(results).reshape(data.shape)
+
+def select_convolution_method(
+    image_shape: Tuple[int, int],
+    kernel_shape: Tuple[int, int],
+    separable_rank: Optional[int] = None
+) -> ConvolutionMethod:
+    """Pick the cheapest backend for convolving an image with a kernel.
+
+    Costs are estimated per frame: multiply-adds for direct convolution,
+    1D passes per rank-1 term for separable kernels (``separable_rank``),
+    and N log N transform sizes for one whole-frame FFT or for overlap-add
+    over blocks about four kernel widths wide.
+    """
+    (height, width), (kh, kw) = image_shape[-2:], kernel_shape
+    direct = _DIRECT_COST * height * width * kh * kw
+
+    fft_size = (sp_fft.next_fast_len(height + kh - 1, real=True) *
+                sp_fft.next_fast_len(width + kw - 1, real=True))
+    fft = _FFT_COST * 2 * fft_size * math.log2(fft_size)
+
+    block_h, block_w = _overlap_add_block(kh), _overlap_add_block(kw)
+    n_blocks = math.ceil(height / (block_h - kh + 1)) * math.ceil(width / (block_w - kw + 1))
+    block_size = block_h * block_w
+    overlap_add = _OVERLAP_ADD_OVERHEAD * _FFT_COST * 2 * n_blocks * block_size * math.log2(block_size)
+
+    costs = {
+        ConvolutionMethod.DIRECT: direct,
+        ConvolutionMethod.FFT: fft,
+        ConvolutionMethod.OVERLAP_ADD: overlap_add,
+    }
+    if separable_rank:
+        per_pixel = _SEPARABLE_TAP_COST * (kh + kw) + 2 * _SEPARABLE_PASS_COST
+        costs[ConvolutionMethod.SEPARABLE] = separable_rank * height * width * per_pixel
+    return min(costs, key=costs.get)
+
+def fft_convolve_same(
+    data: NDArray,
+    kernel: NDArray,
+    spectra: KernelSpectrumCache,
+    workers: Optional[int] = None,
+    kernel_key: Optional[Hashable] = None
+) -> NDArray:
+    """Convolve the last two axes of ``data`` with ``kernel`` in one FFT.
+
+    Matches ``scipy.signal.convolve2d(..., mode='same')`` with zero-filled
+    boundaries: the data are zero-padded to the full linear convolution size,
+    so no circular wrap-around occurs. A stack is transformed as one batch,
+    split over ``workers`` threads by ``scipy.fft``.
+    """
+    height, width = data.shape[-2:]
+    kh, kw = kernel.shape
+    real = not (np.iscomplexobj(data) or np.iscomplexobj(kernel))
+    dtype = np.result_type(data.dtype, kernel.dtype, np.float32)
+    fft_shape = (sp_fft.next_fast_len(height + kh - 1, real=real),
+                 sp_fft.next_fast_len(width + kw - 1, real=real))
+
+    spectrum = spectra.get(kernel, fft_shape, dtype, real, kernel_key)
+    data = data.astype(dtype, copy=False)
+    if real:
+        full = sp_fft.irfft2(sp_fft.rfft2(data, s=fft_shape, workers=workers) * spectrum,
+                             s=fft_shape, workers=workers)
+    else:
+        full = sp_fft.ifft2(sp_fft.fft2(data, s=fft_shape, workers=workers) * spectrum, workers=workers)
+    return full[(..., *_same_slices((height, width), (kh, kw)))]
+
+def overlap_add_convolve_same(
+    data: NDArray,
+    kernel: NDArray,
+    spectra: KernelSpectrumCache,
+    workers: Optional[int] = None,
+    kernel_key: Optional[Hashable] = None
+) -> NDArray:
+    """Convolve the last two axes of ``data`` with ``kernel`` by overlap-add.
+
+    The frame is cut into blocks whose transforms are a few kernel widths
+    long. All blocks are transformed in one batched FFT with a shared cached
+    kernel spectrum, and their full convolutions are summed back into place.
+    Output matches ``fft_convolve_same``.
+    """
+    height, width = data.shape[-2:]
+    kh, kw = kernel.shape
+    lead = data.shape[:-2]
+    real = not (np.iscomplexobj(data) or np.iscomplexobj(kernel))
+    dtype = np.result_type(data.dtype, kernel.dtype, np.float32)
+
+    fft_h, fft_w = _overlap_add_block(kh), _overlap_add_block(kw)
+    block_h, block_w = fft_h - kh + 1, fft_w - kw + 1
+    n_rows, n_cols = math.ceil(height / block_h), math.ceil(width / block_w)
+
+    padded = np.zeros(lead + (n_rows * block_h, n_cols * block_w), dtype=dtype)
+    padded[..., :height, :width] = data
+    blocks = padded.reshape(lead + (n_rows, block_h, n_cols, block_w)).swapaxes(-3, -2)
+
+    spectrum = spectra.get(kernel, (fft_h, fft_w), dtype, real, kernel_key)
+    if real:
+        block_outputs = sp_fft.irfft2(sp_fft.rfft2(blocks, s=(fft_h, fft_w), workers=workers) * spectrum,
+                                      s=(fft_h, fft_w), workers=workers)
+    else:
+        block_outputs = sp_fft.ifft2(sp_fft.fft2(blocks, s=(fft_h, fft_w), workers=workers) * spectrum,
+                                     workers=workers)
+
+    full = np.zeros(lead + ((n_rows - 1) * block_h + fft_h, (n_cols - 1) * block_w + fft_w),
+                    dtype=block_outputs.dtype)
+    for i in range(n_rows):
+        for j in range(n_cols):
+            full[..., i * block_h:i * block_h + fft_h, j * block_w:j * block_w + fft_w] += \
+                block_outputs[..., i, j, :, :]
+    return full[(..., *_same_slices((height, width), (kh, kw)))]
+
+def convolve_same(
+    data: NDArray,
+    kernel: NDArray,
+    method: ConvolutionMethod,
+    spectra: KernelSpectrumCache,
+    terms: Optional[SeparableTerms] = None,
+    workers: Optional[int] = None,
+    kernel_key: Optional[Hashable] = None
+) -> NDArray:
+    """Convolve the last two axes of ``data`` with ``kernel``, 'same' output size.
+
+    ``terms`` are the kernel's rank-1 factors if it has a low-rank
+    decomposition; they make the separable backend available to AUTO.
+    ``workers`` threads share the work: the FFT backends pass them to
+    ``scipy.fft``, the others split a stack into chunks of frames.
+    ``kernel_key`` identifies the kernel in the spectrum cache.
+    """
+    if method == ConvolutionMethod.AUTO:
+        method = select_convolution_method(data.shape, kernel.shape, len(terms) if terms else None)
+
+    if method == ConvolutionMethod.SEPARABLE:
+        terms = terms if terms is not None else separable_terms(kernel)
+        if terms is None:
+            raise ValueError("Kernel has no low-rank decomposition")
+        return _map_frames(lambda chunk: separable_convolve_same(chunk, terms), data, workers)
+
+    if method == ConvolutionMethod.FFT:
+        return fft_convolve_same(data, kernel, spectra, workers, kernel_key)
+    if method == ConvolutionMethod.OVERLAP_ADD:
+        return overlap_add_convolve_same(data, kernel, spectra, workers, kernel_key)
+    if data.ndim == 2:
+        return signal.convolve2d(data, kernel, mode='same')
+    return _map_frames(
+        lambda chunk: np.stack([signal.convolve2d(frame, kernel, mode='same') for frame in chunk]),
+        data.reshape(-1, *data.shape[-2:]), workers
+    ).reshape(data.shape)
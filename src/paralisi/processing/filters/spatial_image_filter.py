@@ -1,13 +1,17 @@
 # src/paralisi/processing/filters/spatial_image_filter.py
 
+import threading
+from collections import OrderedDict
 import numpy as np
-from typing import Optional, Tuple
+from typing import Dict, Hashable, Optional, Tuple
 from scipy import signal
 from numpy.typing import NDArray
 from ...core.exceptions import ProcessingError
 from ...core.configurations.filter_config import FilterConfiguration
-from ...core.types.kernels import KernelType
+from ...core.types.kernels import ConvolutionMethod, KernelType
 from ...core.interfaces.image_filter import ImageFilter
+from .fft_convolution import KernelSpectrumCache, convolve_same
+from .separable import SeparableTerms, separable_terms
 
 class SpatialImageFilter(ImageFilter):
     """Creates and applies spatial filters for image processing.
@@ -17,17 +21,45 @@ class SpatialImageFilter(ImageFilter):
     - Multiple kernel types (Gaussian, Hann window, disk)
     - Automatic kernel size computation
     - Optional normalization
+    - Direct, FFT, overlap-add and separable convolution, chosen by kernel
+      and image size
+    - Filtering of single frames or whole (..., H, W) stacks
+
+    Kernels are decomposed into rank-1 terms when they have low rank:
+    Gaussian and Hann kernels are separable, and high-pass combinations are
+    rank 2. Separable kernels are then applied as 1D passes, O(K) instead
+    of O(K²) per pixel.
+
+    Kernels are memoized by filter configuration, and their transfer
+    functions by configuration, frame shape and dtype, so repeated
+    ``create_kernel`` and ``filter_stack`` calls reuse earlier work. Both
+    caches are thread-safe and bounded, and ``filter_stack`` leaves the
+    filter's current kernel untouched, so one filter can serve several
+    threads. Kernels are applied in the precision of the data, so float32
+    stacks are filtered and returned as float32.
     """
 
-    def __init__(self, kernel_size: Optional[Tuple[int, int]] = None):
+    def __init__(
+        self,
+        kernel_size: Optional[Tuple[int, int]] = None,
+        method: ConvolutionMethod = ConvolutionMethod.AUTO
+    ):
         """
         Parameters
         ----------
         kernel_size : Optional[Tuple[int, int]]
             Fixed kernel size, if not computed from filter width.
+        method : ConvolutionMethod
+            Convolution backend; AUTO picks the cheapest for each call.
         """
         self.kernel_size = kernel_size
+        self.method = method
         self.kernel = None
+        self._spectra = KernelSpectrumCache()
+        self._kernels: "OrderedDict[Hashable, NDArray]" = OrderedDict()
+        self._terms: Dict[Hashable, Optional[SeparableTerms]] = {}
+        self._configured: Tuple[Optional[Hashable], Optional[NDArray]] = (None, None)
+        self._lock = threading.Lock()
 
     def create_kernel(
         self,
@@ -43,20 +75,74 @@ class SpatialImageFilter(ImageFilter):
         Returns
         -------
         NDArray
-            2D filter kernel.
+            2D filter kernel, shared with the cache and therefore read-only.
 
         Raises
         ------
         ProcessingError
             If filter creation fails.
         """
+        key, kernel = self._kernel_for(config)
+        self.kernel = kernel
+        self._configured = (key, kernel)
+        return kernel
+
+    def _kernel_for(self, config: FilterConfiguration) -> Tuple[Hashable, NDArray]:
+        """Memoized kernel of a configuration, with its cache key."""
+        size = tuple(self.kernel_size) if self.kernel_size is not None else None
+        key = ('config', config.high_pass_params, config.low_pass_params, config.normalize, size)
+        kernel = self._cached_kernel(key)
+        if kernel is None:
+            kernel = self._store_kernel(key, self._build_kernel(config))
+        return key, kernel
+
+    def _cached_kernel(self, key: Hashable) -> Optional[NDArray]:
+        """Kernel stored under ``key``, marked as recently used, or None."""
+        with self._lock:
+            kernel = self._kernels.get(key)
+            if kernel is not None:
+                self._kernels.move_to_end(key)
+            return kernel
+
+    def _store_kernel(self, key: Hashable, kernel: NDArray) -> NDArray:
+        """Store a kernel read-only under ``key``, evicting the least recently used."""
+        kernel.flags.writeable = False
+        with self._lock:
+            kernel = self._kernels.setdefault(key, kernel)
+            self._kernels.move_to_end(key)
+            while len(self._kernels) > self._spectra.max_entries:
+                self._kernels.popitem(last=False)
+        return kernel
+
+    def _kernel_in_precision(
+        self,
+        kernel: NDArray,
+        key: Hashable,
+        dtype: np.dtype
+    ) -> Tuple[Hashable, NDArray]:
+        """Kernel cast to the real precision of floating ``dtype`` data, with its cache key."""
+        if not np.issubdtype(dtype, np.inexact):
+            return key, kernel
+        real = np.finfo(dtype).dtype
+        if kernel.dtype == real or np.iscomplexobj(kernel) or real.itemsize >= kernel.dtype.itemsize:
+            return key, kernel
+        key = (key, real.str)
+        cast = self._cached_kernel(key)
+        if cast is None:
+            cast = self._store_kernel(key, kernel.astype(real))
+        return key, cast
+
+    def _build_kernel(self, config: FilterConfiguration) -> NDArray:
+        """Build the kernel of a configuration."""
         try:
             kernel = None
 
             if config.high_pass_params:
                 width, kernel_type = config.high_pass_params
                 base_kernel = self._create_base_kernel(width, kernel_type)
-                kernel = np.eye(base_kernel.shape[0], base_kernel.shape[1]) - base_kernel
+                # Delta minus low-pass, with the delta at the kernel centre
+                kernel = -base_kernel
+                kernel[base_kernel.shape[0] // 2, base_kernel.shape[1] // 2] += 1.0
 
             if config.low_pass_params:
                 width, kernel_type = config.low_pass_params
@@ -73,7 +159,6 @@ class SpatialImageFilter(ImageFilter):
             if config.normalize:
                 kernel = kernel / np.abs(kernel).sum()
 
-            self.kernel = kernel
             return kernel
 
         except Exception as e:
@@ -181,10 +266,15 @@ class SpatialImageFilter(ImageFilter):
     def apply(self, data: NDArray) -> NDArray:
         """Apply the filter to the provided data.
 
+        Output matches ``scipy.signal.convolve2d(data, kernel, mode='same')``
+        (zero-filled boundaries) for every backend. Kernel spectra used by
+        the FFT backends are cached per kernel and image shape.
+
         Parameters
         ----------
         data : NDArray
-            The data to be filtered.
+            The data to be filtered, a frame or a stack of frames along the
+            last two axes.
 
         Returns
         -------
@@ -194,4 +284,95 @@ class SpatialImageFilter(ImageFilter):
         if self.kernel is None:
             raise ProcessingError("Filter kernel has not been created.")
 
-        return signal.convolve2d(data, self.kernel, mode='same')
+        return self._convolve(np.asarray(data), self.kernel, self._current_key())
+
+    def filter_stack(
+        self,
+        stack: NDArray,
+        config: Optional[FilterConfiguration] = None,
+        workers: Optional[int] = None
+    ) -> NDArray:
+        """Filter every frame of a stack in one batched operation.
+
+        Condition means or the frames of a trial are filtered together: the
+        FFT backends transform the whole stack at once with a transfer
+        function cached per configuration, frame shape and dtype, and the
+        direct and separable backends work on the whole stack per pass.
+
+        Parameters
+        ----------
+        stack : NDArray
+            Frames to filter, shape (N, H, W)
+        config : Optional[FilterConfiguration], optional
+            Filter to apply, by default the current kernel. The current
+            kernel is not replaced.
+        workers : Optional[int], optional
+            Number of threads, negative values counting back from the
+            number of cores (-1 uses all), by default one
+
+        Returns
+        -------
+        NDArray
+            Filtered stack, shape (N, H, W)
+
+        Raises
+        ------
+        ProcessingError
+            If the stack is not 3D or filtering fails.
+        """
+        stack = np.asarray(stack)
+        if stack.ndim != 3:
+            raise ProcessingError(f"Expected an (N, H, W) stack, got shape {stack.shape}")
+
+        if config is not None:
+            key, kernel = self._kernel_for(config)
+        elif self.kernel is not None:
+            key, kernel = self._current_key(), self.kernel
+        else:
+            raise ProcessingError("Filter kernel has not been created.")
+
+        return self._convolve(stack, kernel, key, workers)
+
+    def _convolve(
+        self,
+        data: NDArray,
+        kernel: NDArray,
+        key: Hashable,
+        workers: Optional[int] = None
+    ) -> NDArray:
+        """Convolve data with a kernel identified by ``key`` in the caches."""
+        try:
+            # Rank is decided in the kernel's own precision, then the factors are cast
+            terms = self._separable_terms(kernel, key)
+            key, kernel = self._kernel_in_precision(kernel, key, data.dtype)
+            if terms is not None:
+                terms = [(column.astype(kernel.dtype, copy=False), row.astype(kernel.dtype, copy=False))
+                         for column, row in terms]
+            return convolve_same(data, kernel, self.method, self._spectra, terms, workers, key)
+        except Exception as e:
+            raise ProcessingError(f"Failed to apply filter: {str(e)}") from e
+
+    def _current_key(self) -> Hashable:
+        """Cache key of the current kernel: its configuration, or a digest if set directly."""
+        key, kernel = self._configured
+        if kernel is not None and kernel is self.kernel:
+            return key
+        return KernelSpectrumCache.kernel_key(self.kernel)
+
+    def _separable_terms(
+        self,
+        kernel: Optional[NDArray] = None,
+        key: Optional[Hashable] = None
+    ) -> Optional[SeparableTerms]:
+        """Rank-1 decomposition of a kernel, by default the current one, memoized by key."""
+        if kernel is None:
+            kernel, key = self.kernel, self._current_key()
+        with self._lock:
+            if key in self._terms:
+                return self._terms[key]
+        terms = separable_terms(kernel)
+        with self._lock:
+            self._terms[key] = terms
+            if len(self._terms) > self._spectra.max_entries:
+                self._terms.pop(next(iter(self._terms)))
+        return terms
@@ -0,0 +1,235 @@
+# src/paralisi/processing/motion_correction.py
+
+import hashlib
+import threading
+from collections.abc import Sequence as SequenceABC
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Sequence
+import h5py
+import numpy as np
+from numpy.typing import NDArray
+from ..core.exceptions import ProcessingError
+from .registration import ImageRegistration, RegistrationMethod
+
+TrialTransforms = Dict[str, NDArray]
+
+class TransformStore:
+    """Per-trial transform parameters, kept in memory and optionally in HDF5.
+
+    Follows the ``CacheStrategy`` protocol. With a ``path``, every stored
+    transform is also written to ``<namespace>/<key>/<parameter>`` in the
+    file, and transforms written by earlier sessions are read back on first
+    access, so re-analyses reuse them instead of re-estimating.
+
+    Parameters
+    ----------
+    path : Optional[Path], optional
+        HDF5 file persisting the transforms, by default in memory only
+    namespace : str, optional
+        Group separating transforms estimated under different settings
+    """
+
+    def __init__(self, path: Optional[Path] = None, namespace: str = "default"):
+        self.path = Path(path) if path is not None else None
+        self.namespace = namespace
+        self._transforms: Dict[str, TrialTransforms] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[TrialTransforms]:
+        """Return the transforms stored for a trial, if any."""
+        with self._lock:
+            transforms = self._transforms.get(key)
+            if transforms is None and self.path is not None and self.path.exists():
+                with h5py.File(self.path, 'r') as f:
+                    group = f.get(f"{self.namespace}/{key}")
+                    if group is not None:
+                        transforms = {name: np.array(group[name]) for name in group}
+                        self._transforms[key] = transforms
+            return transforms
+
+    def put(self, key: str, value: TrialTransforms) -> None:
+        """Store the transforms of a trial."""
+        with self._lock:
+            self._transforms[key] = value
+            if self.path is not None:
+                with h5py.File(self.path, 'a') as f:
+                    name = f"{self.namespace}/{key}"
+                    if name in f:
+                        del f[name]
+                    group = f.create_group(name)
+                    for param, array in value.items():
+                        group.create_dataset(param, data=array)
+
+    def clear(self) -> None:
+        """Drop transforms held in memory; persisted transforms are kept."""
+        with self._lock:
+            self._transforms.clear()
+
+class MotionCorrector:
+    """Registers trial frames to a session reference before averaging.
+
+    Transforms are estimated once per trial, either one per frame or one per
+    trial from the trial's mean frame, and kept in a ``TransformStore`` keyed
+    by trial id. The store is namespaced by registration method, mode and a
+    digest of the reference, so stored transforms are only reused for the
+    reference they were estimated against.
+
+    ``correct_trials`` returns a lazy sequence: each trial is corrected in
+    batched resampling when it is accessed, so ``ConditionProcessor`` can
+    average a session without a corrected copy of it being held in memory.
+
+    Parameters
+    ----------
+    reference : NDArray
+        Session reference image, shape (H, W)
+    registration : Optional[ImageRegistration], optional
+        Registration engine, by default phase correlation (translation only)
+    per_frame : bool, optional
+        Whether to estimate one transform per frame rather than per trial,
+        by default True
+    chunk_size : int, optional
+        Number of frames registered or resampled together, by default 256
+    transform_path : Optional[Path], optional
+        HDF5 file persisting transforms across sessions
+    estimate_missing : bool, optional
+        Whether to estimate transforms of trials not in the store, by
+        default True; if False only stored transforms are applied and
+        other trials raise
+    """
+
+    def __init__(
+        self,
+        reference: NDArray,
+        registration: Optional[ImageRegistration] = None,
+        per_frame: bool = True,
+        chunk_size: int = 256,
+        transform_path: Optional[Path] = None,
+        estimate_missing: bool = True
+    ):
+        self.reference = np.asarray(reference)
+        self.registration = registration or ImageRegistration(RegistrationMethod.PHASE_CORRELATION)
+        self.per_frame = per_frame
+        self.chunk_size = chunk_size
+        self.estimate_missing = estimate_missing
+
+        digest = hashlib.blake2b(np.ascontiguousarray(self.reference).view(np.uint8), digest_size=8)
+        mode = 'frame' if per_frame else 'trial'
+        namespace = f"{self.registration.method.value}_{mode}_{digest.hexdigest()}"
+        self.store = TransformStore(transform_path, namespace)
+
+    def transforms(self, trial_id: Hashable, frames: NDArray) -> TrialTransforms:
+        """Return the transforms of a trial, estimating them if not stored.
+
+        Parameters
+        ----------
+        trial_id : Hashable
+            Trial identifier used as the store key
+        frames : NDArray
+            Trial frames, shape (N, H, W)
+
+        Returns
+        -------
+        TrialTransforms
+            Transform parameters, with a leading frame axis if ``per_frame``
+
+        Raises
+        ------
+        ProcessingError
+            If the trial has no stored transforms and ``estimate_missing`` is False
+        """
+        transforms = self.store.get(str(trial_id))
+        if transforms is None:
+            if not self.estimate_missing:
+                raise ProcessingError(f"No stored transforms for trial {trial_id}")
+            transforms = self._estimate(frames)
+            self.store.put(str(trial_id), transforms)
+        return transforms
+
+    def correct(self, trial_id: Hashable, frames: NDArray) -> NDArray:
+        """Register all frames of a trial to the reference.
+
+        Parameters
+        ----------
+        trial_id : Hashable
+            Trial identifier used as the store key
+        frames : NDArray
+            Trial frames, shape (N, H, W)
+
+        Returns
+        -------
+        NDArray
+            Motion-corrected frames
+        """
+        try:
+            key = str(trial_id)
+            if self.per_frame and self.estimate_missing and self.store.get(key) is None:
+                # Estimation already resamples the frames; keep that result
+                result = self.registration.register_stack(frames, self.reference, chunk_size=self.chunk_size)
+                self.store.put(key, result.transform_params)
+                return result.transformed_stack
+
+            return self.registration.transform_stack(
+                frames, self.transforms(trial_id, frames), chunk_size=self.chunk_size
+            )
+
+        except Exception as e:
+            raise ProcessingError(f"Motion correction of trial {trial_id} failed: {str(e)}") from e
+
+    def correct_trials(
+        self,
+        trials: Sequence[NDArray],
+        trial_ids: Optional[Sequence[Hashable]] = None
+    ) -> "CorrectedTrials":
+        """Wrap trials in a sequence that motion-corrects each trial on access.
+
+        Parameters
+        ----------
+        trials : Sequence[NDArray]
+            Trial frame stacks
+        trial_ids : Optional[Sequence[Hashable]], optional
+            Store keys of the trials, by default their positions
+
+        Returns
+        -------
+        CorrectedTrials
+            Lazily corrected trials, usable wherever a list of trials is
+        """
+        if trial_ids is None:
+            trial_ids = range(len(trials))
+        if len(trial_ids) != len(trials):
+            raise ProcessingError("Number of trial ids must match number of trials")
+        return CorrectedTrials(self, trials, trial_ids)
+
+    def _estimate(self, frames: NDArray) -> TrialTransforms:
+        """Estimate transforms for one trial."""
+        if self.per_frame:
+            result = self.registration.register_stack(frames, self.reference, chunk_size=self.chunk_size)
+        else:
+            mean_frame = np.mean(frames, axis=0).astype(self.reference.dtype)
+            result = self.registration.register_images(mean_frame, self.reference)
+        return result.transform_params
+
+class CorrectedTrials(SequenceABC):
+    """Sequence of trials that are motion-corrected when accessed.
+
+    Slicing returns another lazy sequence, so odd/even trial splits stay
+    lazy too.
+    """
+
+    def __init__(
+        self,
+        corrector: MotionCorrector,
+        trials: Sequence[NDArray],
+        trial_ids: Sequence[Hashable]
+    ):
+        self.corrector = corrector
+        self.trials = trials
+        self.trial_ids = trial_ids
+
+    def __len__(self) -> int:
+        return len(self.trials)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CorrectedTrials(self.corrector, self.trials[index], self.trial_ids[index])
+        return self.corrector.correct(self.trial_ids[index], self.trials[index])
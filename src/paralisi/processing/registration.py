@@ -2,19 +2,22 @@
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, Callable
+from typing import Optional, Dict, Callable, List, Sequence, Tuple
+import math
 import numpy as np
 import torch
 import torch.nn.functional as F
 from numpy.typing import NDArray
 from ..core.exceptions import RegistrationError
 from ..utils.decorators import validate_input, requires_cuda
+from .registration_optimizer import OptimizerType, RegistrationOptimizer
 
 class RegistrationMethod(Enum):
     """Supported registration methods"""
     RIGID = "rigid"
     AFFINE = "affine"
     ELASTIC = "elastic"
+    PHASE_CORRELATION = "phase_correlation"
 
 @dataclass
 class RegistrationResult:
@@ -25,12 +28,40 @@ class RegistrationResult:
     iteration_count: int
     success: bool
 
+@dataclass
+class StackRegistrationResult:
+    """Container for per-frame results of stack registration"""
+    transformed_stack: NDArray  # (N, H, W) registered frames
+    transform_params: Dict[str, NDArray]  # Parameters with a leading frame axis
+    convergence_metric: NDArray  # Final loss per frame
+    iteration_count: NDArray  # Optimizer iterations per frame
+    converged: NDArray  # Whether the relative loss change fell below the convergence threshold
+    success: NDArray  # Whether the final loss is acceptable
+
 class ImageRegistration:
     """Handles image registration and alignment.
 
     This class implements various registration methods for aligning images,
     with support for different transformation types and optimization strategies.
 
+    ``RegistrationMethod.PHASE_CORRELATION`` estimates a pure translation from
+    a single FFT pair with upsampled-DFT sub-pixel refinement. The same
+    estimate can seed the iterative rigid and affine optimizers through
+    ``phase_correlation_init``.
+
+    Translations in ``transform_params`` are in the normalized coordinates of
+    ``torch.nn.functional.affine_grid`` (the image spans [-1, 1]), as are
+    elastic displacements. Parameters therefore mean the same thing at every
+    resolution, which lets pyramid registration (``pyramid_levels > 1``)
+    solve on 2× downsampled images first and pass the result on to finer
+    levels unchanged (displacement fields are bilinearly upsampled).
+
+    Iterative methods are driven by ``RegistrationOptimizer`` (Adam or
+    L-BFGS) with a relative-change stopping rule checked every
+    ``check_interval`` iterations. With a mask, the loss is evaluated only
+    inside the mask's bounding box, so both sampling and loss cost scale
+    with the masked region rather than the frame.
+
     Parameters
     ----------
     method : RegistrationMethod
@@ -39,24 +70,74 @@ class ImageRegistration:
         Whether to use GPU acceleration, by default True
     precision : str, optional
         Numerical precision ('float32' or 'float64'), by default 'float32'
+    upsample_factor : int, optional
+        Sub-pixel precision of phase correlation as 1/upsample_factor pixels,
+        by default 20
+    phase_correlation_init : bool, optional
+        Whether to initialize iterative rigid/affine registration with the
+        phase-correlation translation, by default False
+    pyramid_levels : int, optional
+        Number of resolution levels for coarse-to-fine registration, by
+        default 1 (full resolution only)
+    pyramid_iterations : Optional[Sequence[int]], optional
+        Iteration budget per level, coarsest first. By default the coarsest
+        level gets ``max_iterations`` and each finer level half the previous
+    optimizer : OptimizerType, optional
+        Optimization algorithm for iterative methods, by default Adam
+    profile_hook : Optional[Callable[[int, float], None]], optional
+        Receives (iteration, seconds) after every optimizer step
     """
 
     def __init__(
         self,
         method: RegistrationMethod = RegistrationMethod.RIGID,
         cuda_enabled: bool = True,
-        precision: str = 'float32'
+        precision: str = 'float32',
+        upsample_factor: int = 20,
+        phase_correlation_init: bool = False,
+        pyramid_levels: int = 1,
+        pyramid_iterations: Optional[Sequence[int]] = None,
+        optimizer: OptimizerType = OptimizerType.ADAM,
+        profile_hook: Optional[Callable[[int, float], None]] = None
     ):
         self.method = method
         self.device = torch.device('cuda' if cuda_enabled and torch.cuda.is_available() else 'cpu')
         self.dtype = getattr(torch, precision)
+        self.upsample_factor = upsample_factor
+        self.phase_correlation_init = phase_correlation_init
+        self.pyramid_levels = pyramid_levels
+        self.pyramid_iterations = pyramid_iterations
+        self.optimizer = optimizer
+        self.profile_hook = profile_hook
         self._setup_optimizer()
+        if pyramid_iterations is not None and len(pyramid_iterations) != pyramid_levels:
+            raise ValueError("pyramid_iterations must give one budget per pyramid level")
 
     def _setup_optimizer(self) -> None:
         """Initialize optimization parameters"""
         self.max_iterations = 1000
-        self.convergence_threshold = 1e-6
-        self.learning_rate = 0.1
+        self.convergence_threshold = 1e-5  # Relative loss change per check
+        self.check_interval = 10
+        self.learning_rate = 1.0 if self.optimizer == OptimizerType.LBFGS else 0.1
+
+    def _create_optimizer(
+        self,
+        max_iterations: Optional[int] = None,
+        step_scale: float = 1.0
+    ) -> RegistrationOptimizer:
+        """Create an optimizer engine with this instance's settings"""
+        learning_rate = self.learning_rate
+        if self.optimizer == OptimizerType.ADAM:
+            # The L-BFGS line search picks its own step length
+            learning_rate *= step_scale
+        return RegistrationOptimizer(
+            optimizer_type=self.optimizer,
+            learning_rate=learning_rate,
+            max_iterations=self.max_iterations if max_iterations is None else max_iterations,
+            relative_tolerance=self.convergence_threshold,
+            check_interval=self.check_interval,
+            profile_hook=self.profile_hook
+        )
 
     @validate_input
     def register_images(
@@ -97,8 +178,20 @@ class ImageRegistration:
             else:
                 mask_tensor = None
 
-            # Initialize transform parameters
-            params = self._initialize_transform(initial_transform)
+            if self.method == RegistrationMethod.PHASE_CORRELATION:
+                return self._register_phase_correlation(source_tensor, target_tensor, mask_tensor)
+
+            # Initialize transform parameters, seeded by phase correlation if requested
+            if initial_transform is None and self.phase_correlation_init:
+                shift = self._phase_correlation(source_tensor, target_tensor, mask_tensor)
+                params = self._translation_params(shift, source_tensor.shape)
+            else:
+                params = self._initialize_transform(initial_transform, source_tensor.shape)
+
+            if self.pyramid_levels > 1:
+                return self._optimize_pyramid(
+                    source_tensor, target_tensor, params, mask_tensor, progress_callback
+                )
 
             # Optimize transformation
             result = self._optimize_transform(
@@ -114,11 +207,300 @@ class ImageRegistration:
         except Exception as e:
             raise RegistrationError(f"Registration failed: {str(e)}") from e
 
+    def register_stack(
+        self,
+        stack: NDArray,
+        reference: NDArray,
+        mask: Optional[NDArray] = None,
+        chunk_size: int = 256,
+        max_iterations: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> StackRegistrationResult:
+        """Register every frame of a stack to a reference image.
+
+        Frames are processed in chunks of ``chunk_size``; within a chunk all
+        frames are warped, compared and optimized as one batched tensor, so
+        CPU runs use torch's intra-op threads on large operations rather than
+        one small image at a time. Each frame is first aligned by batched
+        phase correlation, leaving the optimizer to refine rotation (or the
+        full affine matrix) and sub-pixel residuals. Frames stop updating
+        individually once their loss change falls below the convergence
+        threshold.
+
+        Parameters
+        ----------
+        stack : NDArray
+            Frames to register, shape (N, H, W)
+        reference : NDArray
+            Reference image, shape (H, W)
+        mask : Optional[NDArray], optional
+            Mask for weighted registration
+        chunk_size : int, optional
+            Number of frames registered together, by default 256
+        max_iterations : Optional[int], optional
+            Optimizer iteration budget per chunk, by default ``self.max_iterations``
+        progress_callback : Optional[Callable[[int, int], None]], optional
+            Called with (frames done, total frames) after each chunk
+
+        Returns
+        -------
+        StackRegistrationResult
+            Registered stack and per-frame parameters, losses and flags
+        """
+        try:
+            stack = np.asarray(stack)
+            if stack.ndim != 3:
+                raise ValueError("Stack must have shape (N, H, W)")
+            if self.method == RegistrationMethod.ELASTIC:
+                raise ValueError("Stack registration supports rigid, affine and phase correlation methods")
+
+            target = torch.from_numpy(reference).to(device=self.device, dtype=self.dtype)
+            mask_tensor = None
+            if mask is not None:
+                mask_tensor = torch.from_numpy(mask).to(device=self.device, dtype=self.dtype)
+            max_iterations = self.max_iterations if max_iterations is None else max_iterations
+
+            outputs = []
+            n_frames = stack.shape[0]
+            for start in range(0, n_frames, chunk_size):
+                chunk = torch.from_numpy(np.ascontiguousarray(stack[start:start + chunk_size]))
+                chunk = chunk.to(device=self.device, dtype=self.dtype)
+
+                shift = self._phase_correlation(chunk, target, mask_tensor)
+                params = self._translation_params(shift, chunk.shape)
+                if self.method == RegistrationMethod.PHASE_CORRELATION:
+                    with torch.no_grad():
+                        transformed = self._warp(chunk, self._affine_matrices(params))
+                        losses = self._compute_loss(transformed, target, mask_tensor)
+                    iterations = torch.ones(chunk.shape[0], dtype=torch.long)
+                    converged = torch.ones(chunk.shape[0], dtype=torch.bool)
+                else:
+                    params, transformed, losses, iterations, converged = self._optimize_stack(
+                        chunk, target, params, mask_tensor, max_iterations
+                    )
+
+                outputs.append((
+                    transformed.cpu().numpy(),
+                    {k: v.detach().cpu().numpy() for k, v in params.items()},
+                    losses.cpu().numpy(),
+                    iterations.cpu().numpy(),
+                    converged.cpu().numpy(),
+                ))
+                if progress_callback:
+                    progress_callback(min(start + chunk_size, n_frames), n_frames)
+
+            frames, params, losses, iterations, converged = zip(*outputs)
+            losses = np.concatenate(losses)
+            return StackRegistrationResult(
+                transformed_stack=np.concatenate(frames),
+                transform_params={k: np.concatenate([p[k] for p in params]) for k in params[0]},
+                convergence_metric=losses,
+                iteration_count=np.concatenate(iterations),
+                converged=np.concatenate(converged),
+                success=losses < 1.0
+            )
+
+        except Exception as e:
+            raise RegistrationError(f"Stack registration failed: {str(e)}") from e
+
+    def transform_stack(
+        self,
+        stack: NDArray,
+        transform_params: Dict[str, NDArray],
+        chunk_size: int = 256
+    ) -> NDArray:
+        """Apply rigid or affine transforms to every frame of a stack.
+
+        Parameters
+        ----------
+        stack : NDArray
+            Frames to resample, shape (N, H, W)
+        transform_params : Dict[str, NDArray]
+            Parameters as returned by ``register_stack`` (one set per frame)
+            or ``register_images`` (one set applied to all frames)
+        chunk_size : int, optional
+            Number of frames resampled together, by default 256
+
+        Returns
+        -------
+        NDArray
+            Transformed stack
+        """
+        try:
+            if 'displacement' in transform_params:
+                raise ValueError("Stack transforms support rigid and affine parameters")
+
+            params = {k: torch.as_tensor(v, device=self.device, dtype=self.dtype)
+                      for k, v in transform_params.items()}
+            matrices = self._affine_matrices(params)
+            per_frame = matrices.dim() == 3
+
+            frames = []
+            for start in range(0, stack.shape[0], chunk_size):
+                chunk = torch.from_numpy(np.ascontiguousarray(stack[start:start + chunk_size]))
+                chunk = chunk.to(device=self.device, dtype=self.dtype)
+                chunk_matrices = (matrices[start:start + chunk.shape[0]] if per_frame
+                                  else matrices.expand(chunk.shape[0], 2, 3))
+                with torch.no_grad():
+                    frames.append(self._warp(chunk, chunk_matrices).cpu().numpy())
+            return np.concatenate(frames)
+
+        except Exception as e:
+            raise RegistrationError(f"Stack transform failed: {str(e)}") from e
+
+    def estimate_translation(
+        self,
+        source: NDArray,
+        target: NDArray,
+        mask: Optional[NDArray] = None
+    ) -> NDArray:
+        """Estimate the sub-pixel (row, column) shift that aligns source to target.
+
+        Parameters
+        ----------
+        source : NDArray
+            Source image to be shifted
+        target : NDArray
+            Target image to align with
+        mask : Optional[NDArray], optional
+            Mask applied to both images before correlation
+
+        Returns
+        -------
+        NDArray
+            Shift in pixels, (row, column)
+        """
+        try:
+            source_tensor = torch.from_numpy(source).to(device=self.device, dtype=self.dtype)
+            target_tensor = torch.from_numpy(target).to(device=self.device, dtype=self.dtype)
+            mask_tensor = None
+            if mask is not None:
+                mask_tensor = torch.from_numpy(mask).to(device=self.device, dtype=self.dtype)
+            return self._phase_correlation(source_tensor, target_tensor, mask_tensor).cpu().numpy()
+        except Exception as e:
+            raise RegistrationError(f"Translation estimation failed: {str(e)}") from e
+
+    def _register_phase_correlation(
+        self,
+        source: torch.Tensor,
+        target: torch.Tensor,
+        mask: Optional[torch.Tensor]
+    ) -> RegistrationResult:
+        """Register by translation only, using phase correlation."""
+        shift = self._phase_correlation(source, target, mask)
+        params = self._translation_params(shift, source.shape)
+        with torch.no_grad():
+            transformed = self._apply_rigid_transform(source, params)
+            loss = self._compute_loss(transformed, target, mask).item()
+
+        return RegistrationResult(
+            transformed_image=transformed.cpu().numpy(),
+            transform_params={k: v.cpu().numpy() for k, v in params.items()},
+            convergence_metric=loss,
+            iteration_count=1,
+            success=loss < 1.0
+        )
+
+    def _phase_correlation(
+        self,
+        source: torch.Tensor,
+        target: torch.Tensor,
+        mask: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        """Sub-pixel phase correlation (Guizar-Sicairos et al., 2008).
+
+        The integer peak of the normalized cross-power spectrum is refined by
+        evaluating an upsampled DFT in a 1.5-pixel neighbourhood of the peak,
+        which costs two small matrix products instead of a larger FFT. With a
+        mask, the masked, mean-subtracted images are cross-correlated without
+        spectral whitening.
+
+        ``source`` may be a single image or an (N, H, W) stack. Returns the
+        (row, column) shift in pixels that moves source onto target, with a
+        leading frame axis for stacks.
+        """
+        batched = source.dim() == 3
+        if not batched:
+            source = source[None]
+        if mask is not None:
+            weight = mask.sum()
+            source = (source - (source * mask).sum(dim=(-2, -1), keepdim=True) / weight) * mask
+            target = (target - (target * mask).sum() / weight) * mask
+
+        cross_power = torch.fft.fft2(target) * torch.conj(torch.fft.fft2(source))
+        if mask is None:
+            # Whitening sharpens the peak, but with a mask it would amplify the
+            # mask outline, which always correlates best at zero shift
+            cross_power = cross_power / cross_power.abs().clamp_min(torch.finfo(self.dtype).eps)
+        correlation = torch.fft.ifft2(cross_power).real
+
+        shape = torch.tensor(correlation.shape[-2:], device=self.device, dtype=self.dtype)
+        peak = self._unravel_peak(correlation)
+        shift = peak.to(self.dtype)
+        shift = torch.where(shift > torch.div(shape, 2, rounding_mode='floor'), shift - shape, shift)
+
+        if self.upsample_factor > 1:
+            factor = float(self.upsample_factor)
+            shift = torch.round(shift * factor) / factor
+            region_size = math.ceil(factor * 1.5)
+            dft_shift = float(region_size // 2)
+            offsets = dft_shift - shift * factor
+
+            upsampled = self._upsampled_dft(torch.conj(cross_power), region_size, factor, offsets).conj()
+            sub_peak = self._unravel_peak(upsampled.abs())
+            shift = shift + (sub_peak.to(self.dtype) - dft_shift) / factor
+
+        return shift if batched else shift[0]
+
+    @staticmethod
+    def _unravel_peak(values: torch.Tensor) -> torch.Tensor:
+        """(row, column) of the maximum of each (H, W) frame of an (N, H, W) tensor."""
+        width = values.shape[-1]
+        index = torch.argmax(values.flatten(1), dim=1)
+        return torch.stack((torch.div(index, width, rounding_mode='floor'), index % width), dim=1)
+
+    @staticmethod
+    def _upsampled_dft(
+        data: torch.Tensor,
+        region_size: int,
+        upsample_factor: float,
+        offsets: torch.Tensor
+    ) -> torch.Tensor:
+        """Evaluate the inverse DFT of each (H, W) frame of ``data`` on an
+        upsampled (region_size, region_size) grid around its (N, 2) ``offsets``."""
+        kernels = []
+        for axis, n_items in enumerate(data.shape[-2:]):
+            freqs = torch.fft.fftfreq(n_items, d=upsample_factor, device=data.device, dtype=offsets.dtype)
+            positions = torch.arange(region_size, device=data.device, dtype=offsets.dtype)
+            positions = positions[None, :] - offsets[:, axis, None]
+            kernels.append(torch.exp(-2j * math.pi * positions[..., None] * freqs))
+        row_kernel, col_kernel = kernels
+        # (N, R, H) @ (N, H, W) @ (N, W, R)
+        return row_kernel @ data @ col_kernel.transpose(1, 2)
+
+    def _translation_params(
+        self,
+        shift: torch.Tensor,
+        shape: Tuple[int, ...]
+    ) -> Dict[str, torch.Tensor]:
+        """Convert pixel (row, column) shifts to transform parameters for this method."""
+        height, width = shape[-2], shape[-1]
+        # affine_grid samples the source at output + t, so shifting by d needs t = -d
+        translation = torch.stack([-2.0 * shift[..., 1] / width, -2.0 * shift[..., 0] / height], dim=-1)
+
+        if self.method == RegistrationMethod.AFFINE:
+            matrix = torch.eye(3, device=self.device, dtype=self.dtype).repeat(*shift.shape[:-1], 1, 1)
+            matrix[..., :2, 2] = translation
+            return {'matrix': matrix}
+        return {'rotation': torch.zeros(shift.shape[:-1], device=self.device, dtype=self.dtype),
+                'translation': translation}
+
     def _initialize_transform(
         self,
-        initial_transform: Optional[Dict[str, NDArray]]
+        initial_transform: Optional[Dict[str, NDArray]],
+        shape: Tuple[int, ...]
     ) -> Dict[str, torch.Tensor]:
-        """Initialize transformation parameters"""
+        """Initialize transformation parameters for images of the given shape"""
         if initial_transform is None:
             if self.method == RegistrationMethod.RIGID:
                 return {
@@ -131,10 +513,10 @@ class ImageRegistration:
                 }
             else:  # Elastic
                 return {
-                    'displacement': torch.zeros((2, *source.shape), device=self.device, dtype=self.dtype)
+                    'displacement': torch.zeros((2, *shape), device=self.device, dtype=self.dtype)
                 }
         else:
-            return {k: torch.tensor(v, device=self.device, dtype=self.dtype)
+            return {k: torch.as_tensor(v, device=self.device, dtype=self.dtype).clone()
                     for k, v in initial_transform.items()}
 
     def _optimize_transform(
@@ -143,68 +525,140 @@ class ImageRegistration:
         target: torch.Tensor,
         params: Dict[str, torch.Tensor],
         mask: Optional[torch.Tensor],
-        progress_callback: Optional[Callable[[int, float], None]]
+        progress_callback: Optional[Callable[[int, float], None]],
+        max_iterations: Optional[int] = None,
+        step_scale: float = 1.0
     ) -> RegistrationResult:
         """Optimize transformation parameters"""
-        # Make parameters require gradients
-        params = {k: v.requires_grad_() for k, v in params.items()}
+        region, target, mask = self._loss_region(target, mask)
 
-        # Setup optimizer
-        optimizer = torch.optim.Adam(params.values(), lr=self.learning_rate)
+        def loss_fn(current: Dict[str, torch.Tensor]) -> torch.Tensor:
+            return self._compute_loss(self._apply_transform(source, current, region), target, mask)
 
-        prev_loss = float('inf')
-        best_params = None
-        best_loss = float('inf')
+        result = self._create_optimizer(max_iterations, step_scale).minimize(loss_fn, params, progress_callback)
 
-        for iteration in range(self.max_iterations):
-            optimizer.zero_grad()
+        # Apply best transform to get final result
+        with torch.no_grad():
+            final_transformed = self._apply_transform(source, result.params)
+        best_loss = result.loss.item()
 
-            # Apply current transform
-            transformed = self._apply_transform(source, params)
+        return RegistrationResult(
+            transformed_image=final_transformed.cpu().numpy(),
+            transform_params={k: v.cpu().numpy() for k, v in result.params.items()},
+            convergence_metric=best_loss,
+            iteration_count=int(result.iterations),
+            success=best_loss < 1.0  # Threshold can be adjusted
+        )
 
-            # Calculate loss
-            loss = self._compute_loss(transformed, target, mask)
+    def _optimize_pyramid(
+        self,
+        source: torch.Tensor,
+        target: torch.Tensor,
+        params: Dict[str, torch.Tensor],
+        mask: Optional[torch.Tensor],
+        progress_callback: Optional[Callable[[int, float], None]]
+    ) -> RegistrationResult:
+        """Optimize coarse-to-fine, passing parameters from each level to the next"""
+        sources = self._build_pyramid(source)
+        targets = self._build_pyramid(target)
+        masks = self._build_pyramid(mask) if mask is not None else [None] * self.pyramid_levels
+        budgets = self.pyramid_iterations or [
+            max(1, self.max_iterations >> level) for level in range(self.pyramid_levels)
+        ]
+
+        total_iterations = 0
+        for level, budget in zip(reversed(range(self.pyramid_levels)), budgets):
+            level_source = sources[level]
+            if 'displacement' in params:
+                params['displacement'] = F.interpolate(
+                    params['displacement'][None], size=level_source.shape,
+                    mode='bilinear', align_corners=False
+                )[0]
+
+            callback = None
+            if progress_callback:
+                offset = total_iterations
+                callback = lambda i, loss: progress_callback(offset + i, loss)
 
-            if loss.item() < best_loss:
-                best_loss = loss.item()
-                best_params = {k: v.detach().clone() for k, v in params.items()}
+            # Halve the step at each finer level so it stays constant in pixels
+            result = self._optimize_transform(
+                level_source, targets[level], params, masks[level], callback,
+                max_iterations=budget, step_scale=2.0 ** (level - self.pyramid_levels + 1)
+            )
+            total_iterations += result.iteration_count
+            params = {k: torch.from_numpy(v).to(device=self.device, dtype=self.dtype)
+                      for k, v in result.transform_params.items()}
 
-            # Check convergence
-            if abs(prev_loss - loss.item()) < self.convergence_threshold:
-                break
+        result.iteration_count = total_iterations
+        return result
 
-            # Backpropagate
-            loss.backward()
-            optimizer.step()
+    def _build_pyramid(self, image: torch.Tensor) -> List[torch.Tensor]:
+        """Return the Gaussian pyramid of an image, finest first.
 
-            prev_loss = loss.item()
+        Each level is blurred with the separable 5-tap binomial kernel
+        (Burt & Adelson) and subsampled by 2, so coarse levels keep only the
+        large-scale structure that determines the overall alignment.
+        """
+        taps = torch.tensor([1.0, 4.0, 6.0, 4.0, 1.0], device=image.device, dtype=image.dtype) / 16
+        levels = [image]
+        for _ in range(self.pyramid_levels - 1):
+            level = levels[-1][None, None]
+            level = F.conv2d(F.pad(level, (2, 2, 0, 0), mode='reflect'), taps.view(1, 1, 1, 5))
+            level = F.conv2d(F.pad(level, (0, 0, 2, 2), mode='reflect'), taps.view(1, 1, 5, 1))
+            levels.append(level[0, 0, ::2, ::2])
+        return levels
+
+    def _optimize_stack(
+        self,
+        sources: torch.Tensor,
+        target: torch.Tensor,
+        params: Dict[str, torch.Tensor],
+        mask: Optional[torch.Tensor],
+        max_iterations: int
+    ) -> Tuple[Dict[str, torch.Tensor], torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Optimize batched transformation parameters, one set per frame.
 
-            if progress_callback:
-                progress_callback(iteration, loss.item())
+        The per-frame losses are independent, so one optimizer drives all
+        frames through their sum and each frame stops on its own.
+        """
+        region, target, mask = self._loss_region(target, mask)
 
-        # Apply best transform to get final result
-        final_transformed = self._apply_transform(source, best_params)
+        def loss_fn(current: Dict[str, torch.Tensor]) -> torch.Tensor:
+            return self._compute_loss(self._warp(sources, self._affine_matrices(current), region), target, mask)
 
-        return RegistrationResult(
-            transformed_image=final_transformed.cpu().numpy(),
-            transform_params={k: v.cpu().detach().numpy() for k, v in best_params.items()},
-            convergence_metric=best_loss,
-            iteration_count=iteration + 1,
-            success=best_loss < 1.0  # Threshold can be adjusted
-        )
+        result = self._create_optimizer(max_iterations).minimize(loss_fn, params)
+        with torch.no_grad():
+            transformed = self._warp(sources, self._affine_matrices(result.params))
+        return result.params, transformed, result.loss, result.iterations, result.converged
+
+    @staticmethod
+    def _loss_region(
+        target: torch.Tensor,
+        mask: Optional[torch.Tensor]
+    ) -> Tuple[Optional[Tuple[slice, slice]], torch.Tensor, Optional[torch.Tensor]]:
+        """Crop target and mask to the mask's bounding box, if there is a mask"""
+        if mask is None:
+            return None, target, None
+        rows = torch.nonzero(mask.ne(0).any(dim=1)).flatten()
+        cols = torch.nonzero(mask.ne(0).any(dim=0)).flatten()
+        if rows.numel() == 0:
+            raise ValueError("Registration mask is empty")
+        region = (slice(int(rows[0]), int(rows[-1]) + 1), slice(int(cols[0]), int(cols[-1]) + 1))
+        return region, target[region], mask[region]
 
     def _apply_transform(
         self,
         image: torch.Tensor,
-        params: Dict[str, torch.Tensor]
+        params: Dict[str, torch.Tensor],
+        region: Optional[Tuple[slice, slice]] = None
     ) -> torch.Tensor:
-        """Apply transformation to image"""
+        """Apply transformation to image, sampling only ``region`` if given"""
         if self.method == RegistrationMethod.RIGID:
-            return self._apply_rigid_transform(image, params)
+            return self._apply_rigid_transform(image, params, region)
         elif self.method == RegistrationMethod.AFFINE:
-            return self._apply_affine_transform(image, params)
+            return self._apply_affine_transform(image, params, region)
         else:
-            return self._apply_elastic_transform(image, params)
+            return self._apply_elastic_transform(image, params, region)
 
     def _compute_loss(
         self,
@@ -212,39 +666,97 @@ class ImageRegistration:
         target: torch.Tensor,
         mask: Optional[torch.Tensor]
     ) -> torch.Tensor:
-        """Compute registration loss"""
+        """Compute registration loss, per frame for (N, H, W) stacks"""
         diff = transformed - target
         if mask is not None:
             diff = diff * mask
-        return torch.mean(diff ** 2)
+        return torch.mean(diff ** 2, dim=(-2, -1))
 
     def _apply_rigid_transform(
         self,
         image: torch.Tensor,
-        params: Dict[str, torch.Tensor]
+        params: Dict[str, torch.Tensor],
+        region: Optional[Tuple[slice, slice]] = None
     ) -> torch.Tensor:
         """Apply rigid transformation"""
+        return self._warp(image[None], self._affine_matrices(params)[None], region)[0]
+
+    def _apply_affine_transform(
+        self,
+        image: torch.Tensor,
+        params: Dict[str, torch.Tensor],
+        region: Optional[Tuple[slice, slice]] = None
+    ) -> torch.Tensor:
+        """Apply affine transformation"""
+        return self._warp(image[None], self._affine_matrices(params)[None], region)[0]
+
+    def _apply_elastic_transform(
+        self,
+        image: torch.Tensor,
+        params: Dict[str, torch.Tensor],
+        region: Optional[Tuple[slice, slice]] = None
+    ) -> torch.Tensor:
+        """Apply elastic transformation given a dense (2, H, W) (x, y) displacement field"""
+        displacement = params['displacement']
+        if region is not None:
+            displacement = displacement[(slice(None), *region)]
+        grid = self._base_grid(image.shape, region, image.device, image.dtype)[..., :2]
+        grid = grid + displacement.permute(1, 2, 0)
+        return F.grid_sample(image[None, None], grid[None], padding_mode='border', align_corners=False)[0, 0]
+
+    @staticmethod
+    def _affine_matrices(params: Dict[str, torch.Tensor]) -> torch.Tensor:
+        """Build affine_grid matrices, (..., 2, 3), from rigid or affine parameters."""
+        if 'matrix' in params:
+            return params['matrix'][..., :2, :]
+
         # Create affine matrix from rotation and translation
         theta = params['rotation']
-        tx, ty = params['translation']
-
+        translation = params['translation']
         cos_t = torch.cos(theta)
         sin_t = torch.sin(theta)
 
-        matrix = torch.tensor([
-            [cos_t, -sin_t, tx],
-            [sin_t, cos_t, ty]
-        ], device=self.device, dtype=self.dtype)
-
-        # Add batch dimension
-        image = image.unsqueeze(0)
-        matrix = matrix.unsqueeze(0)
+        # Stack rather than torch.tensor so gradients reach the parameters
+        return torch.stack([
+            torch.stack([cos_t, -sin_t, translation[..., 0]], dim=-1),
+            torch.stack([sin_t, cos_t, translation[..., 1]], dim=-1)
+        ], dim=-2)
+
+    @staticmethod
+    def _base_grid(
+        shape: Tuple[int, ...],
+        region: Optional[Tuple[slice, slice]],
+        device: torch.device,
+        dtype: torch.dtype
+    ) -> torch.Tensor:
+        """Homogeneous (x, y, 1) normalized pixel-centre coordinates of a frame region.
 
-        # Apply transform
-        grid = F.affine_grid(matrix, image.size(), align_corners=False)
-        transformed = F.grid_sample(image, grid, align_corners=False)
+        Matches ``F.affine_grid`` with ``align_corners=False`` on the full
+        frame, restricted to ``region``.
+        """
+        height, width = shape[-2], shape[-1]
+        rows, cols = region if region is not None else (slice(0, height), slice(0, width))
+        ys = (2 * torch.arange(rows.start, rows.stop, device=device, dtype=dtype) + 1) / height - 1
+        xs = (2 * torch.arange(cols.start, cols.stop, device=device, dtype=dtype) + 1) / width - 1
+        grid_y, grid_x = torch.meshgrid(ys, xs, indexing='ij')
+        return torch.stack([grid_x, grid_y, torch.ones_like(grid_x)], dim=-1)
+
+    @classmethod
+    def _warp(
+        cls,
+        images: torch.Tensor,
+        matrices: torch.Tensor,
+        region: Optional[Tuple[slice, slice]] = None
+    ) -> torch.Tensor:
+        """Resample (N, H, W) images with per-frame (N, 2, 3) affine matrices.
 
-        return transformed.squeeze(0)
+        With ``region``, only output pixels inside that frame window are
+        sampled. Samples outside the frame repeat the edge pixels, so
+        corrected frames keep valid (non-zero) baselines at the borders.
+        """
+        base = cls._base_grid(images.shape, region, images.device, images.dtype)
+        grid = torch.einsum('hwk,njk->nhwj', base, matrices)
+        return F.grid_sample(images[:, None], grid, padding_mode='border', align_corners=False)[:, 0]
 
 # Example usage:
 if __name__ == "__main__":
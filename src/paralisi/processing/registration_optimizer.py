@@ -0,0 +1,271 @@
+# src/paralisi/processing/registration_optimizer.py
+
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Optional
+import torch
+
+LossFunction = Callable[[Dict[str, torch.Tensor]], torch.Tensor]
+
+class OptimizerType(Enum):
+    """Supported optimization algorithms"""
+    ADAM = "adam"
+    LBFGS = "lbfgs"
+
+@dataclass
+class OptimizationResult:
+    """Container for optimization results, kept on the parameters' device"""
+    params: Dict[str, torch.Tensor]  # Parameters with the lowest loss seen
+    loss: torch.Tensor  # Lowest loss, per item for batched objectives
+    iterations: torch.Tensor  # Iterations spent, per item for batched objectives
+    converged: torch.Tensor  # Whether the stopping criterion was met, per item
+
+def _expand(flags: torch.Tensor, like: torch.Tensor) -> torch.Tensor:
+    """Append singleton axes so per-item flags broadcast against a parameter."""
+    return flags.reshape(flags.shape + (1,) * (like.dim() - flags.dim()))
+
+class RegistrationOptimizer:
+    """Gradient-based minimizer for registration losses.
+
+    The loss function maps a parameter dict to either a scalar or a vector
+    of independent per-item losses (for example one per frame of a stack),
+    which are minimized jointly through their sum. Best parameters and
+    losses are tracked with tensor operations, so the host only
+    synchronizes with the device once every ``check_interval`` iterations,
+    when the stopping criterion is evaluated.
+
+    Optimization stops when the best loss improves by less than
+    ``relative_tolerance`` of its value over ``check_interval`` iterations.
+    With Adam, items of a batched objective stop individually and are held
+    fixed while the others continue. L-BFGS (with strong Wolfe line search)
+    treats the summed objective as a whole.
+
+    Parameters
+    ----------
+    optimizer_type : OptimizerType, optional
+        Optimization algorithm, by default Adam
+    learning_rate : Optional[float], optional
+        Step size, by default 0.1 for Adam and 1.0 for L-BFGS
+    max_iterations : int, optional
+        Iteration budget, by default 1000
+    relative_tolerance : float, optional
+        Relative improvement per check below which optimization stops,
+        by default 1e-5
+    check_interval : int, optional
+        Iterations between stopping checks, by default 10
+    profile_hook : Optional[Callable[[int, float], None]], optional
+        Called after every optimizer step with the iteration count reached
+        and the step's wall time in seconds. Adam steps are single
+        iterations; L-BFGS steps run up to ``check_interval`` iterations.
+    """
+
+    def __init__(
+        self,
+        optimizer_type: OptimizerType = OptimizerType.ADAM,
+        learning_rate: Optional[float] = None,
+        max_iterations: int = 1000,
+        relative_tolerance: float = 1e-5,
+        check_interval: int = 10,
+        profile_hook: Optional[Callable[[int, float], None]] = None
+    ):
+        self.optimizer_type = optimizer_type
+        if learning_rate is None:
+            learning_rate = 1.0 if optimizer_type == OptimizerType.LBFGS else 0.1
+        self.learning_rate = learning_rate
+        self.max_iterations = max_iterations
+        self.relative_tolerance = relative_tolerance
+        self.check_interval = max(1, check_interval)
+        self.profile_hook = profile_hook
+
+    def minimize(
+        self,
+        loss_fn: LossFunction,
+        params: Dict[str, torch.Tensor],
+        progress_callback: Optional[Callable[[int, float], None]] = None
+    ) -> OptimizationResult:
+        """Minimize ``loss_fn`` starting from ``params``.
+
+        Parameters
+        ----------
+        loss_fn : LossFunction
+            Maps parameters to a scalar or per-item loss tensor
+        params : Dict[str, torch.Tensor]
+            Initial parameters; batched objectives need a leading item axis
+        progress_callback : Optional[Callable[[int, float], None]], optional
+            Called at every stopping check with the iteration and total loss
+
+        Returns
+        -------
+        OptimizationResult
+            Best parameters and per-item loss, iteration count and convergence
+        """
+        params = {k: v.detach().clone().requires_grad_() for k, v in params.items()}
+        if self.optimizer_type == OptimizerType.LBFGS:
+            return self._minimize_lbfgs(loss_fn, params, progress_callback)
+        return self._minimize_adam(loss_fn, params, progress_callback)
+
+    def _minimize_adam(
+        self,
+        loss_fn: LossFunction,
+        params: Dict[str, torch.Tensor],
+        progress_callback: Optional[Callable[[int, float], None]]
+    ) -> OptimizationResult:
+        """Adam with per-item stopping and on-device best tracking."""
+        optimizer = torch.optim.Adam(params.values(), lr=self.learning_rate)
+        tracker = _BestTracker(params)
+        iterations = None
+
+        for iteration in range(self.max_iterations):
+            start = self._start_timer(params)
+            optimizer.zero_grad(set_to_none=True)
+            losses = loss_fn(params)
+            tracker.update(losses, params)
+            if iterations is None:
+                iterations = torch.zeros_like(losses, dtype=torch.long)
+            iterations += tracker.active
+
+            if (iteration + 1) % self.check_interval == 0:
+                tracker.check(self.relative_tolerance)
+                if progress_callback:
+                    progress_callback(iteration, float(tracker.best_loss.sum()))
+                if not bool(tracker.active.any()):
+                    self._report(iteration + 1, start, params)
+                    break
+
+            losses.sum().backward()
+            if losses.dim():
+                self._hold_stopped(optimizer, params, tracker.active)
+            optimizer.step()
+            self._report(iteration + 1, start, params)
+
+        return OptimizationResult(
+            params=tracker.best_params,
+            loss=tracker.best_loss,
+            iterations=iterations,
+            converged=~tracker.active
+        )
+
+    @staticmethod
+    def _hold_stopped(
+        optimizer: torch.optim.Adam,
+        params: Dict[str, torch.Tensor],
+        active: torch.Tensor
+    ) -> None:
+        """Keep stopped items in place during the next Adam step.
+
+        With zero gradient and zero first moment, Adam's update for an item
+        is exactly zero, so no copy of the parameters is needed to restore it.
+        """
+        with torch.no_grad():
+            for v in params.values():
+                stopped = _expand(~active, v)
+                if v.grad is not None:
+                    v.grad.masked_fill_(stopped, 0)
+                state = optimizer.state.get(v)
+                if state and 'exp_avg' in state:
+                    state['exp_avg'].masked_fill_(stopped, 0)
+
+    def _minimize_lbfgs(
+        self,
+        loss_fn: LossFunction,
+        params: Dict[str, torch.Tensor],
+        progress_callback: Optional[Callable[[int, float], None]]
+    ) -> OptimizationResult:
+        """L-BFGS with strong Wolfe line search on the summed objective."""
+        optimizer = torch.optim.LBFGS(
+            params.values(),
+            lr=self.learning_rate,
+            max_iter=self.check_interval,
+            line_search_fn='strong_wolfe'
+        )
+        tracker = _BestTracker(params)
+        state = optimizer.state[next(iter(params.values()))]
+
+        def closure() -> torch.Tensor:
+            optimizer.zero_grad(set_to_none=True)
+            losses = loss_fn(params)
+            # Line search evaluations are valid candidates too
+            tracker.update(losses, params)
+            loss = losses.sum()
+            loss.backward()
+            return loss
+
+        iteration = 0
+        while iteration < self.max_iterations:
+            start = self._start_timer(params)
+            optimizer.step(closure)
+            reached = state.get('n_iter', iteration)
+            stalled = reached == iteration
+            iteration = reached
+            self._report(iteration, start, params)
+
+            tracker.check(self.relative_tolerance, joint=True)
+            if progress_callback:
+                progress_callback(iteration, float(tracker.best_loss.sum()))
+            if stalled or not bool(tracker.active.any()):
+                tracker.active.zero_()
+                break
+
+        best_loss = tracker.best_loss
+        return OptimizationResult(
+            params=tracker.best_params,
+            loss=best_loss,
+            iterations=torch.full_like(best_loss, iteration, dtype=torch.long),
+            converged=~tracker.active
+        )
+
+    def _start_timer(self, params: Dict[str, torch.Tensor]) -> Optional[float]:
+        """Start timing a step if a profile hook is set."""
+        if self.profile_hook is None:
+            return None
+        self._synchronize(params)
+        return time.perf_counter()
+
+    def _report(self, iteration: int, start: Optional[float], params: Dict[str, torch.Tensor]) -> None:
+        """Pass the wall time of a step to the profile hook."""
+        if start is None:
+            return
+        self._synchronize(params)
+        self.profile_hook(iteration, time.perf_counter() - start)
+
+    @staticmethod
+    def _synchronize(params: Dict[str, torch.Tensor]) -> None:
+        # Kernel launches are asynchronous on CUDA; wait so timings are real
+        device = next(iter(params.values())).device
+        if device.type == 'cuda':
+            torch.cuda.synchronize(device)
+
+class _BestTracker:
+    """Tracks the best loss and parameters per item without host syncs."""
+
+    def __init__(self, params: Dict[str, torch.Tensor]):
+        self.best_params = {k: v.detach().clone() for k, v in params.items()}
+        self.best_loss: Optional[torch.Tensor] = None
+        self.checkpoint: Optional[torch.Tensor] = None
+        self.active: Optional[torch.Tensor] = None
+
+    def update(self, losses: torch.Tensor, params: Dict[str, torch.Tensor]) -> None:
+        with torch.no_grad():
+            current = losses.detach()
+            if self.best_loss is None:
+                self.best_loss = torch.full_like(current, float('inf'))
+                self.checkpoint = self.best_loss.clone()
+                self.active = torch.ones_like(current, dtype=torch.bool)
+
+            # Written in place into the buffers allocated up front
+            improved = current < self.best_loss
+            self.best_loss.copy_(torch.where(improved, current, self.best_loss))
+            for k, v in params.items():
+                best = self.best_params[k]
+                best.copy_(torch.where(_expand(improved, v), v.detach(), best))
+
+    def check(self, relative_tolerance: float, joint: bool = False) -> None:
+        """Stop items whose best loss improved by less than the tolerance since the last check."""
+        with torch.no_grad():
+            best, previous = self.best_loss, self.checkpoint
+            if joint:
+                best, previous = best.sum(), previous.sum()
+            stalled = torch.isfinite(previous) & (previous - best <= relative_tolerance * previous.abs())
+            self.active &= ~stalled
+            self.checkpoint = self.best_loss.clone()
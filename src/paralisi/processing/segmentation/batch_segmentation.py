@@ -0,0 +1,185 @@
+# src/paralisi/processing/segmentation/batch_segmentation.py
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+import h5py
+import numpy as np
+from numpy.typing import NDArray
+from ...core.exceptions.processing_exceptions import ProcessingError
+from ...io.loaders.numpy_loader import NumpyLoader
+from .gradient_field import GradientFieldCache
+from .visual_area_segmenter import VisualAreaSegmenter
+
+# Text fields are Python strings (object), so long ids and neighbour lists are never truncated
+AREA_ROW_DTYPE = np.dtype([
+    ('animal', object),
+    ('area', object),
+    ('area_id', np.int32),
+    ('size', np.float64),       # Area size in mm²
+    ('center_x', np.float64),
+    ('center_y', np.float64),
+    ('sign', np.float64),
+    ('neighbors', object),      # Comma-separated neighbouring area ids
+])
+
+MapSource = Union[Path, str, Tuple[NDArray, NDArray, float]]
+
+@dataclass
+class BatchSegmentationResult:
+    """Container for cohort segmentation results."""
+    areas: NDArray  # Structured array of per-area rows (AREA_ROW_DTYPE)
+    failures: Dict[str, str] = field(default_factory=dict)  # Animal id -> error message
+
+def load_retinotopy_maps(
+    path: Path,
+    hor_key: str = 'kmap_hor',
+    vert_key: str = 'kmap_vert',
+    pixpermm_key: str = 'pixpermm'
+) -> Tuple[NDArray, NDArray, float]:
+    """Read (kmap_hor, kmap_vert, pixpermm) from an NPZ or HDF5 result file.
+
+    ``pixpermm`` is looked up among the stored arrays first and then in the
+    file's metadata, matching the layouts written by NPZSaver and HDF5Saver.
+    """
+    path = Path(path)
+    if path.suffix == '.npz':
+        contents: Dict[str, Any] = NumpyLoader.load_archive(path)
+        metadata = contents.get('metadata', {})
+        pixpermm = contents[pixpermm_key] if pixpermm_key in contents else metadata[pixpermm_key]
+        return contents[hor_key], contents[vert_key], float(pixpermm)
+
+    with h5py.File(path, 'r') as f:
+        data = f['data'] if 'data' in f else f
+        pixpermm_node = data[pixpermm_key] if pixpermm_key in data else f['metadata'][pixpermm_key]
+        return np.array(data[hor_key]), np.array(data[vert_key]), float(pixpermm_node[()])
+
+def _segment_animal(
+    animal_id: str,
+    source: MapSource,
+    segmenter_kwargs: Dict[str, Any],
+    keys: Tuple[str, str, str]
+) -> NDArray:
+    """Segment one animal and return its per-area rows (runs in a worker process)."""
+    if isinstance(source, (str, Path)):
+        kmap_hor, kmap_vert, pixpermm = load_retinotopy_maps(Path(source), *keys)
+    else:
+        kmap_hor, kmap_vert, pixpermm = source
+
+    # A private single-entry cache keeps worker memory flat across animals
+    segmenter = VisualAreaSegmenter(
+        gradient_cache=GradientFieldCache(max_entries=1), **segmenter_kwargs
+    )
+    areas = segmenter.apply((np.asarray(kmap_hor), np.asarray(kmap_vert)), pixpermm)
+
+    rows = np.zeros(len(areas), dtype=AREA_ROW_DTYPE)
+    for row, (name, area) in zip(rows, areas.items()):
+        row['animal'] = animal_id
+        row['area'] = name
+        row['area_id'] = area.id
+        row['size'] = area.size
+        row['center_x'], row['center_y'] = area.center
+        row['sign'] = area.sign
+        row['neighbors'] = ','.join(str(n) for n in area.neighbors)
+    return rows
+
+class BatchSegmentationRunner:
+    """Segments visual areas for a cohort of animals in parallel.
+
+    Each animal is segmented in a separate worker process and its areas are
+    appended to a columnar table as soon as it finishes. A failing animal is
+    recorded in ``failures`` without affecting the rest of the cohort.
+
+    Parameters
+    ----------
+    n_workers : Optional[int], optional
+        Number of worker processes, by default one per CPU core
+    segmenter_kwargs : Optional[Dict[str, Any]], optional
+        Keyword arguments for VisualAreaSegmenter
+    hor_key, vert_key, pixpermm_key : str, optional
+        Names of the horizontal map, vertical map and scale in result files
+    """
+
+    def __init__(
+        self,
+        n_workers: Optional[int] = None,
+        segmenter_kwargs: Optional[Dict[str, Any]] = None,
+        hor_key: str = 'kmap_hor',
+        vert_key: str = 'kmap_vert',
+        pixpermm_key: str = 'pixpermm'
+    ):
+        self.n_workers = n_workers
+        self.segmenter_kwargs = {'use_gpu': False, **(segmenter_kwargs or {})}
+        self.keys = (hor_key, vert_key, pixpermm_key)
+
+    def run(
+        self,
+        sources: Mapping[str, MapSource],
+        output_path: Optional[Path] = None
+    ) -> BatchSegmentationResult:
+        """Segment every animal and collect per-area rows.
+
+        Parameters
+        ----------
+        sources : Mapping[str, MapSource]
+            Animal id -> result file path or (kmap_hor, kmap_vert, pixpermm)
+        output_path : Optional[Path], optional
+            If given, rows are streamed to this Parquet file as animals finish
+            (requires pyarrow)
+
+        Returns
+        -------
+        BatchSegmentationResult
+            Per-area rows for all successful animals and per-animal failures
+        """
+        writer = self._open_parquet_writer(output_path) if output_path is not None else None
+        tables = []
+        failures: Dict[str, str] = {}
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                futures = {
+                    pool.submit(_segment_animal, animal_id, source, self.segmenter_kwargs, self.keys): animal_id
+                    for animal_id, source in sources.items()
+                }
+                for future in as_completed(futures):
+                    animal_id = futures[future]
+                    try:
+                        rows = future.result()
+                    except Exception as e:
+                        failures[animal_id] = str(e)
+                        continue
+
+                    tables.append(rows)
+                    if writer is not None:
+                        writer.write_table(self._to_arrow(rows))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        areas = np.concatenate(tables) if tables else np.zeros(0, dtype=AREA_ROW_DTYPE)
+        return BatchSegmentationResult(areas=areas, failures=failures)
+
+    @staticmethod
+    def _open_parquet_writer(output_path: Path):
+        """Open a Parquet writer with the area row schema."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ProcessingError("Writing Parquet output requires pyarrow") from e
+        schema = BatchSegmentationRunner._to_arrow(np.zeros(0, dtype=AREA_ROW_DTYPE)).schema
+        return pq.ParquetWriter(str(output_path), schema)
+
+    @staticmethod
+    def _to_arrow(rows: NDArray):
+        """Convert structured rows to a pyarrow table, column by column."""
+        import pyarrow as pa
+        columns = {}
+        for name in AREA_ROW_DTYPE.names:
+            column = rows[name]
+            if column.dtype == object:
+                columns[name] = pa.array(column.tolist(), type=pa.string())
+            else:
+                columns[name] = pa.array(column)
+        return pa.table(columns)
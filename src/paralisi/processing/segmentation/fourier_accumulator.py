@@ -0,0 +1,180 @@
+# src/paralisi/processing/segmentation/fourier_accumulator.py
+
+import numpy as np
+from numpy.typing import NDArray
+from typing import Optional, Sequence, Tuple
+
+class FourierAccumulator:
+    """Online accumulator of the stimulus-frequency Fourier component.
+
+    Continuous-sweep retinotopy encodes visual field position in the phase of
+    the response at the stimulus frequency. Instead of transforming the full
+    frame stack, this class accumulates ``sum_t frame_t * exp(-i w t)`` as
+    frames arrive, so memory stays constant regardless of recording length and
+    the current phase, magnitude and SNR maps can be queried at any time.
+
+    Noise is estimated from a few off-harmonic frequencies (by default 1.5,
+    2.5 and 3.5 times the stimulus frequency) that are accumulated alongside
+    the stimulus component. Accumulators built with the same parameters can be
+    merged, so chunks of a recording may be processed by separate workers as
+    long as each chunk is passed with its absolute ``start_index``.
+
+    Parameters
+    ----------
+    frame_shape : Tuple[int, int]
+        Shape (height, width) of each frame.
+    stimulus_frequency : float
+        Stimulus frequency in Hz, or in cycles per frame if ``frame_rate`` is 1.
+    frame_rate : float, optional
+        Acquisition frame rate in Hz, by default 1.0
+    noise_harmonics : Sequence[float], optional
+        Multiples of the stimulus frequency used to estimate the noise floor,
+        by default (1.5, 2.5, 3.5). Multiples above the Nyquist limit are dropped.
+    precision : str, optional
+        Precision of the accumulated sums ('float32' or 'float64'), by default 'float64'
+    """
+
+    def __init__(
+        self,
+        frame_shape: Tuple[int, int],
+        stimulus_frequency: float,
+        frame_rate: float = 1.0,
+        noise_harmonics: Sequence[float] = (1.5, 2.5, 3.5),
+        precision: str = 'float64'
+    ):
+        self.frame_shape = tuple(frame_shape)
+        self.frequency = stimulus_frequency / frame_rate
+        if not 0 < self.frequency < 0.5:
+            raise ValueError("Stimulus frequency must lie between 0 and the Nyquist limit")
+
+        noise_frequencies = [self.frequency * h for h in noise_harmonics]
+        self.noise_frequencies = tuple(f for f in noise_frequencies if 0 < f < 0.5)
+        self.dtype = np.dtype(precision)
+
+        # Row 0 holds the DC sum, row 1 the stimulus component, the rest noise
+        self._frequencies = np.array([0.0, self.frequency, *self.noise_frequencies])
+        self._sums = np.zeros(
+            (len(self._frequencies), *self.frame_shape),
+            dtype=np.result_type(self.dtype, np.complex64)
+        )
+        self.n_frames = 0
+        self._next_index = 0
+
+    def update(self, frames: NDArray, start_index: Optional[int] = None) -> 'FourierAccumulator':
+        """Add a single frame or a chunk of frames to the accumulator.
+
+        Parameters
+        ----------
+        frames : NDArray
+            Frame (height × width) or chunk of frames (time × height × width)
+        start_index : Optional[int], optional
+            Absolute frame index of the first frame in the chunk. Defaults to
+            the index following the last accumulated frame.
+
+        Returns
+        -------
+        FourierAccumulator
+            The updated accumulator, for chaining
+        """
+        frames = np.asarray(frames, dtype=self.dtype)
+        if frames.ndim == 2:
+            frames = frames[None]
+        if frames.shape[1:] != self.frame_shape:
+            raise ValueError(f"Expected frames of shape {self.frame_shape}, got {frames.shape[1:]}")
+
+        n = frames.shape[0]
+        if n == 0:
+            return self
+        if start_index is None:
+            start_index = self._next_index
+
+        # Real-valued weights so the chunk is projected with a single real matrix product
+        t = np.arange(start_index, start_index + n, dtype=np.float64)
+        angles = 2 * np.pi * np.outer(self._frequencies, t)
+        weights = np.concatenate([np.cos(angles), np.sin(angles)]).astype(self.dtype)
+
+        projected = weights @ frames.reshape(n, -1)
+        k = len(self._frequencies)
+        self._sums += (projected[:k] - 1j * projected[k:]).reshape(self._sums.shape)
+
+        self.n_frames += n
+        self._next_index = max(self._next_index, start_index + n)
+        return self
+
+    def merge(self, other: 'FourierAccumulator') -> 'FourierAccumulator':
+        """Merge the sums of another accumulator into this one.
+
+        Parameters
+        ----------
+        other : FourierAccumulator
+            Accumulator built with the same frame shape and frequencies
+
+        Returns
+        -------
+        FourierAccumulator
+            The merged accumulator (self)
+        """
+        if other.frame_shape != self.frame_shape or not np.allclose(
+            other._frequencies, self._frequencies
+        ):
+            raise ValueError("Cannot merge accumulators with different shapes or frequencies")
+
+        self._sums += other._sums
+        self.n_frames += other.n_frames
+        self._next_index = max(self._next_index, other._next_index)
+        return self
+
+    def reset(self) -> None:
+        """Discard all accumulated frames."""
+        self._sums[...] = 0
+        self.n_frames = 0
+        self._next_index = 0
+
+    @property
+    def response(self) -> NDArray:
+        """Complex response map at the stimulus frequency."""
+        return self._sums[1]
+
+    def mean_frame(self) -> NDArray:
+        """Mean of all accumulated frames."""
+        return self._sums[0].real / max(self.n_frames, 1)
+
+    def magnitude_map(self) -> NDArray:
+        """Amplitude of the stimulus-frequency component."""
+        return 2 * np.abs(self._sums[1]) / max(self.n_frames, 1)
+
+    def phase_map(self, snr_threshold: Optional[float] = None) -> NDArray:
+        """Phase of the stimulus-frequency component.
+
+        Parameters
+        ----------
+        snr_threshold : Optional[float], optional
+            If given, pixels with SNR at or below this value are set to NaN
+
+        Returns
+        -------
+        NDArray
+            Phase map in radians
+        """
+        phase = np.angle(self._sums[1])
+        if snr_threshold is not None:
+            phase = np.where(self.snr_map() > snr_threshold, phase, np.nan)
+        return phase
+
+    def snr_map(self) -> NDArray:
+        """Stimulus-frequency magnitude relative to the off-harmonic noise floor."""
+        if not self.noise_frequencies:
+            raise ValueError("No noise frequencies below the Nyquist limit")
+        noise_floor = np.mean(np.abs(self._sums[2:]), axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.abs(self._sums[1]) / noise_floor
+
+    def compute_phase_maps(self, snr_threshold: float = 2.0) -> Tuple[NDArray, NDArray, NDArray]:
+        """Return the current (phase, magnitude, snr) maps.
+
+        Mirrors the output of ``PhaseMapComputer.compute_phase_maps`` so the
+        accumulator can be used as a drop-in live preview.
+        """
+        snr = self.snr_map()
+        phase = np.where(snr > snr_threshold, np.angle(self._sums[1]), np.nan)
+        return phase, self.magnitude_map(), snr
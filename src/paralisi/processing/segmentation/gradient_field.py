@@ -0,0 +1,201 @@
+# src/paralisi/processing/segmentation/gradient_field.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Hashable, Optional, Tuple
+import numpy as np
+import torch
+from numpy.typing import NDArray
+from scipy import ndimage
+
+def _as_array(phase_map) -> NDArray:
+    """Return a phase map as a float64 NumPy array."""
+    if torch.is_tensor(phase_map):
+        phase_map = phase_map.detach().cpu().numpy()
+    return np.asarray(phase_map, dtype=np.float64)
+
+def _digest(phase_map: NDArray) -> str:
+    """Content digest of a map, including its shape."""
+    digest = hashlib.blake2b(np.ascontiguousarray(phase_map).view(np.uint8), digest_size=16)
+    digest.update(str(phase_map.shape).encode())
+    return digest.hexdigest()
+
+def _readonly(array: NDArray) -> NDArray:
+    array.flags.writeable = False
+    return array
+
+class RetinotopicGradientField:
+    """Smoothed phase maps, gradients and visual field sign of a map pair.
+
+    Every quantity is computed on first access and kept, so consumers such as
+    ``SignMapGenerator`` and ``VisualAreaSegmenter`` share one Gaussian
+    smoothing and one gradient computation per (maps, sigma) pair. Returned
+    arrays are read-only; copy them before modifying.
+
+    Gradients follow the MATLAB ``gradient`` convention used by
+    getMouseAreasX.m: x runs along columns and y along rows, and each gradient
+    is stored as the complex number ``d/dx + i d/dy``.
+
+    Parameters
+    ----------
+    kmap_hor : NDArray
+        Horizontal retinotopic phase map
+    kmap_vert : NDArray
+        Vertical retinotopic phase map
+    smoothing_sigma : float, optional
+        Gaussian smoothing sigma applied before differentiation, by default 1.0
+    """
+
+    def __init__(self, kmap_hor: NDArray, kmap_vert: NDArray, smoothing_sigma: float = 1.0):
+        self.kmap_hor = _readonly(np.array(_as_array(kmap_hor)))
+        self.kmap_vert = _readonly(np.array(_as_array(kmap_vert)))
+        if self.kmap_hor.shape != self.kmap_vert.shape:
+            raise ValueError("Horizontal and vertical maps must have same shape")
+        self.smoothing_sigma = float(smoothing_sigma)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.kmap_hor.shape
+
+    @cached_property
+    def key(self) -> Tuple[str, str, float]:
+        """Content key of the map pair and sigma, equal for copies of the maps."""
+        return (_digest(self.kmap_hor), _digest(self.kmap_vert), self.smoothing_sigma)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the input maps and every quantity computed so far."""
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+    @cached_property
+    def smoothed_hor(self) -> NDArray:
+        """Gaussian-smoothed horizontal map."""
+        return _readonly(ndimage.gaussian_filter(self.kmap_hor, self.smoothing_sigma))
+
+    @cached_property
+    def smoothed_vert(self) -> NDArray:
+        """Gaussian-smoothed vertical map."""
+        return _readonly(ndimage.gaussian_filter(self.kmap_vert, self.smoothing_sigma))
+
+    @cached_property
+    def grad_h(self) -> NDArray:
+        """Complex gradient of the smoothed horizontal map."""
+        grad_y, grad_x = np.gradient(self.smoothed_hor)
+        return _readonly(grad_x + 1j * grad_y)
+
+    @cached_property
+    def grad_v(self) -> NDArray:
+        """Complex gradient of the smoothed vertical map."""
+        grad_y, grad_x = np.gradient(self.smoothed_vert)
+        return _readonly(grad_x + 1j * grad_y)
+
+    @cached_property
+    def magnitude_h(self) -> NDArray:
+        """Gradient magnitude of the horizontal map."""
+        return _readonly(np.abs(self.grad_h))
+
+    @cached_property
+    def magnitude_v(self) -> NDArray:
+        """Gradient magnitude of the vertical map."""
+        return _readonly(np.abs(self.grad_v))
+
+    @cached_property
+    def jacobian(self) -> NDArray:
+        """Signed Jacobian determinant of the (hor, vert) mapping per pixel."""
+        return _readonly(
+            self.grad_h.real * self.grad_v.imag - self.grad_h.imag * self.grad_v.real
+        )
+
+    @cached_property
+    def sign_map(self) -> NDArray:
+        """Visual field sign (-1 or 1), NaN where either input map is NaN."""
+        sign_map = np.sign(np.angle(self.grad_h * np.conj(self.grad_v)))
+        sign_map[np.isnan(self.kmap_hor) | np.isnan(self.kmap_vert)] = np.nan
+        return _readonly(sign_map)
+
+    @cached_property
+    def sign_edges(self) -> NDArray:
+        """Sobel gradient magnitude of the sign map, non-zero at sign transitions."""
+        return _readonly(ndimage.generic_gradient_magnitude(self.sign_map, ndimage.sobel))
+
+class GradientFieldCache:
+    """Memoizes ``RetinotopicGradientField`` objects by map content and sigma.
+
+    Maps are keyed by a digest of their contents, so the same field is reused
+    whether callers pass the original arrays, copies or tensors. The cache is
+    safe to share between threads.
+
+    Fields grow as their quantities are computed, so the byte budget is
+    enforced on every lookup; the most recently used field is always kept.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Number of fields kept before the least recently used one is evicted,
+        by default 16
+    max_bytes : Optional[int], optional
+        Total size of the kept fields above which the least recently used
+        ones are evicted, by default unbounded
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._fields: "OrderedDict[Hashable, RetinotopicGradientField]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        kmap_hor: NDArray,
+        kmap_vert: NDArray,
+        smoothing_sigma: float = 1.0
+    ) -> RetinotopicGradientField:
+        """Return the gradient field for a map pair, computing it if needed."""
+        kmap_hor = _as_array(kmap_hor)
+        kmap_vert = _as_array(kmap_vert)
+        key = (_digest(kmap_hor), _digest(kmap_vert), float(smoothing_sigma))
+
+        with self._lock:
+            field = self._fields.get(key)
+            if field is not None:
+                self._fields.move_to_end(key)
+                self._evict()
+                return field
+
+        field = RetinotopicGradientField(kmap_hor, kmap_vert, smoothing_sigma)
+        with self._lock:
+            field = self._fields.setdefault(key, field)
+            self._fields.move_to_end(key)
+            self._evict()
+        return field
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the cached fields."""
+        with self._lock:
+            return sum(field.nbytes for field in self._fields.values())
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def _evict(self) -> None:
+        """Drop least recently used fields beyond the entry and byte limits; call with the lock held."""
+        while len(self._fields) > self.max_entries:
+            self._fields.popitem(last=False)
+        if self.max_bytes is None:
+            return
+        total = sum(field.nbytes for field in self._fields.values())
+        while len(self._fields) > 1 and total > self.max_bytes:
+            _, field = self._fields.popitem(last=False)
+            total -= field.nbytes
+
+    def clear(self) -> None:
+        """Drop all cached fields."""
+        with self._lock:
+            self._fields.clear()
+
+# Cache shared by default between sign map generation and area segmentation,
+# bounded so that large maps do not pin gigabytes of derived arrays
+default_gradient_cache = GradientFieldCache(max_bytes=256 * 2 ** 20)
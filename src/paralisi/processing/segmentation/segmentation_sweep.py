@@ -0,0 +1,155 @@
+# src/paralisi/processing/segmentation/segmentation_sweep.py
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from typing import Hashable, Optional, Sequence, Tuple
+import numpy as np
+from numpy.typing import NDArray
+from ...core.exceptions.processing_exceptions import SegmentationError
+from .gradient_field import RetinotopicGradientField
+from .visual_area_segmenter import VisualAreaSegmenter
+
+SWEEP_RESULT_DTYPE = np.dtype([
+    ('smoothing_sigma', np.float64),
+    ('boundary_threshold', np.float64),
+    ('min_area_size', np.float64),
+    ('n_areas', np.int32),
+    ('n_positive', np.int32),
+    ('n_negative', np.int32),
+    ('total_area', np.float64),
+    ('mean_area', np.float64),
+    ('max_area', np.float64),
+])
+
+class SegmentationSweep:
+    """Evaluates VisualAreaSegmenter settings over a parameter grid.
+
+    Intermediate results are reused across grid points: smoothing and
+    gradients are computed once per ``smoothing_sigma`` (through the
+    segmenter's gradient cache), and labeling (including patch fusion and
+    splitting) with per-label sizes and signs once per (sigma,
+    ``boundary_threshold``) pair.
+    Each grid point is then only a filter on ``min_area_size``. Label
+    summaries are kept between calls, keyed by the content of the maps, so
+    refining a sweep on the same maps only labels new (sigma, threshold)
+    pairs.
+
+    Parameters
+    ----------
+    segmenter : Optional[VisualAreaSegmenter], optional
+        Segmenter providing the gradient cache and labeling logic
+    n_workers : int, optional
+        Number of threads used to label (sigma, threshold) pairs, by default 1
+    max_summaries : int, optional
+        Number of label summaries kept before the least recently used one
+        is evicted, by default 256
+    """
+
+    def __init__(
+        self,
+        segmenter: Optional[VisualAreaSegmenter] = None,
+        n_workers: int = 1,
+        max_summaries: int = 256
+    ):
+        self.segmenter = segmenter or VisualAreaSegmenter(use_gpu=False)
+        self.n_workers = n_workers
+        self.max_summaries = max_summaries
+        self._label_summaries: "OrderedDict[Hashable, Tuple[NDArray, NDArray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        data: Tuple[NDArray, NDArray],
+        pixpermm: float,
+        smoothing_sigmas: Sequence[float],
+        boundary_thresholds: Sequence[float],
+        min_area_sizes: Sequence[float]
+    ) -> NDArray:
+        """Segment the map pair at every point of the parameter grid.
+
+        Parameters
+        ----------
+        data : Tuple[NDArray, NDArray]
+            Horizontal and vertical retinotopic phase maps
+        pixpermm : float
+            Pixels per millimeter scale factor
+        smoothing_sigmas : Sequence[float]
+            Gaussian smoothing sigmas to evaluate
+        boundary_thresholds : Sequence[float]
+            Boundary detection thresholds to evaluate
+        min_area_sizes : Sequence[float]
+            Minimum area sizes in mm² to evaluate
+
+        Returns
+        -------
+        NDArray
+            Structured array with one row per grid point and the fields of
+            ``SWEEP_RESULT_DTYPE`` (area counts by sign, total, mean and
+            maximum area in mm²)
+
+        Raises
+        ------
+        SegmentationError
+            If any grid point cannot be segmented
+        """
+        kmap_hor, kmap_vert = data
+        try:
+            cache = self.segmenter.gradient_cache
+            with ThreadPoolExecutor(max_workers=self.n_workers) as pool:
+                fields = list(pool.map(
+                    lambda sigma: cache.get(kmap_hor, kmap_vert, sigma), smoothing_sigmas
+                ))
+                pairs = list(product(fields, boundary_thresholds))
+                summaries = list(pool.map(lambda pair: self._summarize_labels(*pair), pairs))
+
+            results = np.zeros(len(pairs) * len(min_area_sizes), dtype=SWEEP_RESULT_DTYPE)
+            row = 0
+            for (field, threshold), (pixel_counts, signs) in zip(pairs, summaries):
+                sizes = pixel_counts / (pixpermm ** 2)
+                for min_size in min_area_sizes:
+                    kept = sizes >= min_size
+                    kept_sizes = sizes[kept]
+                    results[row] = (
+                        field.smoothing_sigma,
+                        threshold,
+                        min_size,
+                        kept_sizes.size,
+                        np.count_nonzero(signs[kept] > 0),
+                        np.count_nonzero(signs[kept] < 0),
+                        kept_sizes.sum(),
+                        kept_sizes.mean() if kept_sizes.size else np.nan,
+                        kept_sizes.max() if kept_sizes.size else np.nan,
+                    )
+                    row += 1
+
+            return results
+
+        except Exception as e:
+            raise SegmentationError(f"Segmentation sweep failed: {str(e)}") from e
+
+    def _summarize_labels(
+        self,
+        field: RetinotopicGradientField,
+        threshold: float
+    ) -> Tuple[NDArray, NDArray]:
+        """Label areas for one (field, threshold) pair and return per-label sizes and signs."""
+        key = (field.key, float(threshold))
+        with self._lock:
+            summary = self._label_summaries.get(key)
+            if summary is not None:
+                self._label_summaries.move_to_end(key)
+                return summary
+
+        summary = self.segmenter.summarize_patches(field, threshold)
+        with self._lock:
+            self._label_summaries[key] = summary
+            while len(self._label_summaries) > self.max_summaries:
+                self._label_summaries.popitem(last=False)
+        return summary
+
+    def clear(self) -> None:
+        """Drop cached label summaries."""
+        with self._lock:
+            self._label_summaries.clear()
@@ -2,25 +2,26 @@
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy.ndimage import gaussian_filter
-import torch
+from typing import Optional
+from .gradient_field import GradientFieldCache, default_gradient_cache
 
 class SignMapGenerator:
-    """Handles generation of visual field sign maps from phase maps."""
+    """Handles generation of visual field sign maps from phase maps.
+
+    Sign maps use the segmenter's (MATLAB) axis convention, x along columns
+    and y along rows. Earlier versions of this class took x along rows,
+    which gave the opposite sign everywhere.
+
+    Parameters
+    ----------
+    gradient_cache : Optional[GradientFieldCache], optional
+        Cache of smoothed gradients, shared with the area segmenter by default
+    """
+
+    def __init__(self, gradient_cache: Optional[GradientFieldCache] = None):
+        self.gradient_cache = default_gradient_cache if gradient_cache is None else gradient_cache
 
     def generate_sign_map(self, phase_hor: NDArray, phase_vert: NDArray, smoothing_sigma: float = 1.0) -> NDArray:
         """Create visual field sign map from phase maps."""
-        if torch.is_tensor(phase_hor):
-            phase_hor = phase_hor.cpu().numpy()
-        if torch.is_tensor(phase_vert):
-            phase_vert = phase_vert.cpu().numpy()
-        phase_hor_smooth = gaussian_filter(phase_hor, smoothing_sigma)
-        phase_vert_smooth = gaussian_filter(phase_vert, smoothing_sigma)
-        dhdx, dhdy = np.gradient(phase_hor_smooth)
-        dvdx, dvdy = np.gradient(phase_vert_smooth)
-        gradh = dhdx + 1j * dhdy
-        gradv = dvdx + 1j * dvdy
-        angle = np.angle(gradh * np.conj(gradv))
-        sign_map = np.sign(angle)
-        sign_map[np.isnan(phase_hor) | np.isnan(phase_vert)] = np.nan
-        return sign_map
+        field = self.gradient_cache.get(phase_hor, phase_vert, smoothing_sigma)
+        return np.array(field.sign_map)
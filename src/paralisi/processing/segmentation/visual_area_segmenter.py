@@ -1,20 +1,30 @@
 # src/paralisi/processing/segmentation/visual_area_segmenter.py
 
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from numpy.typing import NDArray
 import numpy as np
 import torch
-from scipy import ndimage
+from scipy import ndimage, sparse
+from scipy.sparse.csgraph import connected_components
+from skimage.segmentation import expand_labels, watershed
 from ...core.exceptions.processing_exceptions import SegmentationError
 from ...core.data.area_data import AreaData
+from ...core.data.masks import CompactMask
 from ...core.interfaces.segmenter import Segmenter  # Updated import
 from ...utils.decorators import validate_input, requires_cuda
+from .gradient_field import GradientFieldCache, RetinotopicGradientField, default_gradient_cache
+from .retinotopic_metrics import RetinotopicMetrics
 
 class VisualAreaSegmenter(Segmenter):  # Updated inheritance
     """Segments visual areas from retinotopic maps using gradient-based detection.
 
     This is a modern Python implementation of the MATLAB getMouseAreasX.m logic,
-    with added GPU acceleration and robust error handling.
+    with added GPU acceleration and robust error handling. Patch post-processing
+    (fusePatchesX, splitPatchesX, getPatchSign, getPatchCoM) operates on the
+    whole label image at once rather than patch by patch.
+
+    Retinotopic maps are expected in degrees of visual angle, as in the MATLAB
+    pipeline, so that visual field coverage can be measured per patch.
 
     Parameters
     ----------
@@ -25,7 +35,32 @@ class VisualAreaSegmenter(Segmenter):  # Updated inheritance
     boundary_threshold : float, optional
         Threshold for boundary detection, by default 0.5
     use_gpu : bool, optional
-        Whether to use GPU acceleration when available, by default True
+        Whether to use GPU acceleration when available, by default True.
+        Gradient fields are computed on the CPU either way; maps may be
+        passed as tensors on any device.
+    gradient_cache : Optional[GradientFieldCache], optional
+        Cache of smoothed gradients and sign maps, shared with
+        SignMapGenerator by default
+    fuse_patches : bool, optional
+        Whether to fuse adjacent patches of the same sign, by default False
+    split_patches : bool, optional
+        Whether to split patches that over-represent visual space, by default
+        False. Fusion and splitting follow getMouseAreasX.m more closely but
+        change the areas ``apply`` returns and roughly double its runtime.
+    max_coverage_overlap : float, optional
+        Adjacent same-sign patches are fused when they share at most this
+        fraction of the smaller patch's visual field coverage, by default 0.1
+    max_redundancy : float, optional
+        Patches whose Jacobian-integrated coverage exceeds their actual visual
+        field coverage by more than this factor are split, by default 1.5
+    coverage_bin_size : float, optional
+        Bin size in degrees used to measure visual field coverage, by default 1.0
+    split_min_distance : int, optional
+        Minimum distance in pixels between eccentricity minima used as split
+        seeds, by default 5
+    neighbor_distance : float, optional
+        Patches separated by a boundary band up to about twice this many
+        pixels wide are neighbours, by default 2.0
     """
 
     def __init__(
@@ -33,13 +68,29 @@ class VisualAreaSegmenter(Segmenter):  # Updated inheritance
         smoothing_sigma: float = 1.0,
         min_area_size: float = 0.01,
         boundary_threshold: float = 0.5,
-        use_gpu: bool = True
+        use_gpu: bool = True,
+        gradient_cache: Optional[GradientFieldCache] = None,
+        fuse_patches: bool = False,
+        split_patches: bool = False,
+        max_coverage_overlap: float = 0.1,
+        max_redundancy: float = 1.5,
+        coverage_bin_size: float = 1.0,
+        split_min_distance: int = 5,
+        neighbor_distance: float = 2.0
     ):
         self.smoothing_sigma = smoothing_sigma
         self.min_area_size = min_area_size
         self.boundary_threshold = boundary_threshold
         self.use_gpu = use_gpu and torch.cuda.is_available()
         self.device = torch.device('cuda' if self.use_gpu else 'cpu')
+        self.gradient_cache = default_gradient_cache if gradient_cache is None else gradient_cache
+        self.fuse_patches = fuse_patches
+        self.split_patches = split_patches
+        self.max_coverage_overlap = max_coverage_overlap
+        self.max_redundancy = max_redundancy
+        self.coverage_bin_size = coverage_bin_size
+        self.split_min_distance = split_min_distance
+        self.neighbor_distance = neighbor_distance
 
     @validate_input
     def apply(self, data: Tuple[NDArray, NDArray], pixpermm: float) -> Dict[str, AreaData]:
@@ -67,28 +118,14 @@ class VisualAreaSegmenter(Segmenter):  # Updated inheritance
             raise ValueError("Horizontal and vertical maps must have same shape")
 
         try:
-            # Convert to tensors if using GPU
-            if self.use_gpu:
-                kmap_hor = torch.from_numpy(kmap_hor).to(self.device)
-                kmap_vert = torch.from_numpy(kmap_vert).to(self.device)
-
-                # Compute gradients and convert back to numpy arrays
-                grad_h, grad_v = self._compute_gradients(
-                    kmap_hor.cpu().numpy(),
-                    kmap_vert.cpu().numpy()
-                )
-            else:
-                # Compute gradients directly if not using GPU
-                grad_h, grad_v = self._compute_gradients(kmap_hor, kmap_vert)
+            # Smoothed gradients and sign map, shared with SignMapGenerator
+            field = self.gradient_cache.get(kmap_hor, kmap_vert, self.smoothing_sigma)
 
-            # Generate sign map
-            sign_map = self._compute_sign_map(grad_h, grad_v)
+            # Label patches, then fuse and split them
+            labels = self._segment_labels(field)
 
-            # Detect boundaries
-            boundaries = self._detect_boundaries(grad_h, grad_v, sign_map)
-
-            # Extract and label areas
-            areas = self._extract_areas(boundaries, sign_map, pixpermm)
+            # Extract area properties
+            areas = self._extract_areas(labels, field.sign_map, pixpermm)
 
             # Post-process and validate results
             areas = self._post_process_areas(areas)
@@ -98,108 +135,345 @@ class VisualAreaSegmenter(Segmenter):  # Updated inheritance
         except Exception as e:
             raise SegmentationError(f"Area segmentation failed: {str(e)}") from e
 
-    def _compute_gradients(
+    def _detect_boundaries(
         self,
-        kmap_hor: NDArray,
-        kmap_vert: NDArray
-    ) -> Tuple[NDArray, NDArray]:
-        """Compute smoothed gradients of the retinotopic maps."""
-        # Apply Gaussian smoothing
-        kmap_hor = ndimage.gaussian_filter(kmap_hor, self.smoothing_sigma)
-        kmap_vert = ndimage.gaussian_filter(kmap_vert, self.smoothing_sigma)
+        field: RetinotopicGradientField,
+        threshold: Optional[float] = None
+    ) -> NDArray:
+        """Detect area boundaries using gradient magnitude and sign changes."""
+        if threshold is None:
+            threshold = self.boundary_threshold
 
-        # Compute gradients
-        grad_h_y, grad_h_x = np.gradient(kmap_hor)
-        grad_v_y, grad_v_x = np.gradient(kmap_vert)
+        # Combine evidence for boundaries
+        boundaries = (
+            (field.magnitude_h > threshold) |
+            (field.magnitude_v > threshold) |
+            (field.sign_edges > 0)
+        )
 
-        return (grad_h_x + 1j * grad_h_y, grad_v_x + 1j * grad_v_y)
+        return boundaries
 
-    def _compute_sign_map(
+    def _segment_labels(
         self,
-        grad_h: NDArray,
-        grad_v: NDArray
+        field: RetinotopicGradientField,
+        threshold: Optional[float] = None
     ) -> NDArray:
-        """Compute visual field sign map from gradients."""
-        # Calculate angle between gradients
-        angle = np.angle(grad_h * np.conj(grad_v))
+        """Label patches between boundaries and apply patch fusion and splitting.
 
-        # Convert to visual field sign (-1 or 1)
-        return np.sign(angle)
+        Returns a label image with consecutive ids, 0 marking boundary pixels.
+        """
+        boundaries = self._detect_boundaries(field, threshold)
+        labels, _ = ndimage.label(~boundaries)
 
-    def _detect_boundaries(
+        if self.fuse_patches:
+            labels = self._fuse_patches(labels, field)
+        if self.split_patches:
+            labels = self._split_patches(labels, field)
+
+        return labels
+
+    def summarize_patches(
         self,
-        grad_h: NDArray,
-        grad_v: NDArray,
-        sign_map: NDArray
-    ) -> NDArray:
-        """Detect area boundaries using gradient magnitude and sign changes."""
-        # Compute gradient magnitudes
-        mag_h = np.abs(grad_h)
-        mag_v = np.abs(grad_v)
+        field: RetinotopicGradientField,
+        threshold: Optional[float] = None
+    ) -> Tuple[NDArray, NDArray]:
+        """Label the patches of a gradient field and summarize their size and sign.
 
-        # Find sign map transitions
-        sign_edges = ndimage.generic_gradient_magnitude(sign_map, ndimage.sobel)
+        Labeling includes patch fusion and splitting, as in ``apply``, so
+        areas for any ``min_area_size`` follow from one call.
 
-        # Combine evidence for boundaries
-        boundaries = (
-            (mag_h > self.boundary_threshold) |
-            (mag_v > self.boundary_threshold) |
-            (sign_edges > 0)
+        Parameters
+        ----------
+        field : RetinotopicGradientField
+            Gradient field of the map pair, e.g. from ``gradient_cache``
+        threshold : Optional[float], optional
+            Boundary threshold, by default ``boundary_threshold``
+
+        Returns
+        -------
+        Tuple[NDArray, NDArray]
+            Pixel counts and visual field signs of patches 1 to n
+        """
+        labels = self._segment_labels(field, threshold)
+        pixel_counts, _, signs = self._label_statistics(labels, int(labels.max()), field.sign_map)
+        return pixel_counts[1:], signs[1:]
+
+    def _visual_field_coverage(
+        self,
+        labels: NDArray,
+        field: RetinotopicGradientField
+    ) -> Tuple[NDArray, NDArray, sparse.csr_matrix]:
+        """Measure the visual field coverage of every patch at once (overRep).
+
+        Returns, indexed by label id, the Jacobian-integrated coverage and the
+        actual coverage (area of distinct visual field bins) in deg², plus a
+        sparse label × bin incidence matrix.
+        """
+        n_ids = int(labels.max()) + 1
+        flat = labels.ravel()
+        jacobian = np.abs(field.jacobian).ravel()
+        hor = field.smoothed_hor.ravel()
+        vert = field.smoothed_vert.ravel()
+        valid = (flat > 0) & np.isfinite(jacobian) & np.isfinite(hor) & np.isfinite(vert)
+
+        jac_coverage = np.bincount(flat[valid], weights=jacobian[valid], minlength=n_ids)
+
+        # Distinct (label, visual field bin) pairs give each patch's actual coverage
+        hor_bins = np.floor(hor[valid] / self.coverage_bin_size).astype(np.int64)
+        vert_bins = np.floor(vert[valid] / self.coverage_bin_size).astype(np.int64)
+        if hor_bins.size:
+            hor_bins -= hor_bins.min()
+            vert_bins -= vert_bins.min()
+        n_vert = int(vert_bins.max()) + 1 if vert_bins.size else 1
+        bin_ids = hor_bins * n_vert + vert_bins
+        n_bins = int(bin_ids.max()) + 1 if bin_ids.size else 1
+
+        pairs = np.unique(flat[valid].astype(np.int64) * n_bins + bin_ids)
+        pair_labels, pair_bins = np.divmod(pairs, n_bins)
+        actual_coverage = np.bincount(pair_labels, minlength=n_ids) * self.coverage_bin_size ** 2
+
+        incidence = sparse.csr_matrix(
+            (np.ones(pairs.size), (pair_labels, pair_bins)), shape=(n_ids, n_bins)
         )
+        return jac_coverage, actual_coverage, incidence
 
-        return boundaries
+    def _fuse_patches(
+        self,
+        labels: NDArray,
+        field: RetinotopicGradientField
+    ) -> NDArray:
+        """Fuse adjacent same-sign patches that do not overlap in visual space (fusePatchesX).
+
+        Candidate pairs are neighbouring patches (``_label_pairs``); pairs whose
+        shared visual field coverage is small are merged as connected
+        components of a patch graph, and boundary pixels lying only between
+        merged patches (within ``neighbor_distance`` of them) are absorbed
+        into the fused patch.
+        """
+        num_labels = int(labels.max())
+        lo, hi = self._label_pairs(labels)
+        if lo.size == 0:
+            return labels
+
+        _, _, signs = self._label_statistics(labels, num_labels, field.sign_map)
+        _, coverage, incidence = self._visual_field_coverage(labels, field)
+
+        # Visual field bins shared by each adjacent pair
+        shared = np.asarray(
+            (incidence[lo].multiply(incidence[hi])).sum(axis=1)
+        ).ravel() * self.coverage_bin_size ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overlap = shared / np.minimum(coverage[lo], coverage[hi])
+
+        fuse = (signs[lo] == signs[hi]) & (overlap <= self.max_coverage_overlap)
+        if not np.any(fuse):
+            return labels
+
+        graph = sparse.coo_matrix(
+            (np.ones(np.count_nonzero(fuse)), (lo[fuse], hi[fuse])),
+            shape=(num_labels + 1, num_labels + 1)
+        )
+        _, components = connected_components(graph, directed=False)
+
+        # Renumber components in order of first label so boundaries stay 0
+        _, first_ids, inverse = np.unique(components, return_index=True, return_inverse=True)
+        new_ids = np.argsort(np.argsort(first_ids))[inverse]
+        fused = new_ids[labels]
+
+        # Absorb boundary pixels that separate only patches that were fused: within
+        # reach of the grown patches they see several patches, all fused into one
+        grown = expand_labels(labels, self.neighbor_distance)
+        size = 2 * int(np.ceil(self.neighbor_distance)) + 1
+        unset = num_labels + 1
+        grown_fused = new_ids[grown]
+        ids_min = ndimage.minimum_filter(np.where(grown > 0, grown, unset), size=size)
+        ids_max = ndimage.maximum_filter(grown, size=size)
+        fused_min = ndimage.minimum_filter(np.where(grown > 0, grown_fused, unset), size=size)
+        fused_max = ndimage.maximum_filter(grown_fused, size=size)
+        absorb = (labels == 0) & (grown > 0) & (ids_min != ids_max) & (fused_min == fused_max)
+        fused[absorb] = grown_fused[absorb]
+
+        return fused
+
+    def _split_patches(
+        self,
+        labels: NDArray,
+        field: RetinotopicGradientField
+    ) -> NDArray:
+        """Split patches that over-represent visual space (splitPatchesX).
+
+        Over-represented patches are split at once by a watershed of the
+        radial eccentricity map seeded at its local minima, restricted to
+        those patches.
+        """
+        jac_coverage, actual_coverage, _ = self._visual_field_coverage(labels, field)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            redundancy = jac_coverage / actual_coverage
+        over_represented = redundancy > self.max_redundancy
+        over_represented[0] = False
+        if not np.any(over_represented):
+            return labels
+
+        region = over_represented[labels]
+        eccentricity = self._radial_eccentricity(labels, field, np.flatnonzero(over_represented))
+        eccentricity = np.where(region & np.isfinite(eccentricity), eccentricity, np.inf)
+
+        # Local eccentricity minima inside over-represented patches seed the split
+        local_min = ndimage.minimum_filter(eccentricity, size=2 * self.split_min_distance + 1)
+        seeds, _ = ndimage.label(region & np.isfinite(eccentricity) & (eccentricity == local_min))
+        finite_max = np.max(eccentricity[np.isfinite(eccentricity)], initial=0.0)
+        pieces = watershed(np.minimum(eccentricity, finite_max), seeds, mask=region)
+
+        split = labels.copy()
+        assigned = pieces > 0
+        split[assigned] = pieces[assigned] + labels.max()
+        return self._relabel_sequential(split)
+
+    @staticmethod
+    def _radial_eccentricity(
+        labels: NDArray,
+        field: RetinotopicGradientField,
+        patch_ids: NDArray
+    ) -> NDArray:
+        """Visual field eccentricity of each pixel relative to the centre of its own patch.
+
+        The centre of a patch is its median retinotopy, so a patch that
+        represents part of the visual field twice has an eccentricity
+        minimum in each representation. Pixels outside ``patch_ids`` are NaN.
+        """
+        hor, vert = field.smoothed_hor, field.smoothed_vert
+        finite = (labels > 0) & np.isfinite(hor) & np.isfinite(vert)
+        n_finite = np.bincount(labels[finite], minlength=int(labels.max()) + 1)
+        patch_ids = patch_ids[n_finite[patch_ids] > 0]
+
+        hor_center = np.full(n_finite.size, np.nan)
+        vert_center = np.full(n_finite.size, np.nan)
+        if patch_ids.size:
+            hor_center[patch_ids] = ndimage.median(hor[finite], labels[finite], patch_ids)
+            vert_center[patch_ids] = ndimage.median(vert[finite], labels[finite], patch_ids)
+        return RetinotopicMetrics().eccentricity_map(field, (hor_center[labels], vert_center[labels]))
+
+    @staticmethod
+    def _relabel_sequential(labels: NDArray) -> NDArray:
+        """Renumber labels to consecutive ids, keeping 0 for boundaries."""
+        ids, inverse = np.unique(labels, return_inverse=True)
+        if ids[0] != 0:
+            inverse = inverse + 1
+        return inverse.reshape(labels.shape)
 
     def _extract_areas(
         self,
-        boundaries: NDArray,
+        labels: NDArray,
         sign_map: NDArray,
         pixpermm: float
     ) -> Dict[str, AreaData]:
-        """Extract individual areas from boundary map."""
-        # Ensure boundaries are a boolean array
-        boundaries = np.asarray(boundaries, dtype=bool)
-
-        # Label connected components
-        labels, num_labels = ndimage.label(~boundaries)
-
-        areas = {}
-        for label_id in range(1, num_labels + 1):
-            # Get area mask
-            mask = labels == label_id
+        """Extract individual areas from a patch label image."""
+        num_labels = int(labels.max())
 
-            # Calculate area properties
-            area_size = np.sum(mask) / (pixpermm ** 2)
+        # Per-label properties for all labels at once (getPatchSign, getPatchCoM)
+        pixel_counts, centers, signs = self._label_statistics(labels, num_labels, sign_map)
+        neighbors = self._label_adjacency(labels)
+        slices = ndimage.find_objects(labels)
 
-            # Skip if too small
-            if area_size < self.min_area_size:
-                continue
+        # Skip areas that are too small
+        area_sizes = pixel_counts / (pixpermm ** 2)
+        kept_ids = np.flatnonzero((area_sizes >= self.min_area_size) & (pixel_counts > 0))
 
-            # Get dominant sign
-            sign = np.sign(np.mean(sign_map[mask]))
+        areas = {}
+        for label_id in kept_ids[kept_ids > 0]:
+            label_id = int(label_id)
 
-            # Calculate center of mass
-            cy, cx = ndimage.center_of_mass(mask)
-            cy, cx = float(cy), float(cx)
+            # Build the area mask from its bounding box only
+            mask = CompactMask.from_label(labels, label_id, slices[label_id - 1])
 
-            # Find neighbors
-            dilated = ndimage.binary_dilation(mask)
-            neighbor_ids = set(labels[dilated & ~mask]) - {0, label_id}
+            cy, cx = centers[label_id]
 
             # Create AreaData object
             area_data = AreaData(
                 id=label_id,
                 name=f"Area_{label_id}",
                 boundary=mask,
-                center=(cx, cy),
-                sign=float(sign),
-                size=float(area_size),
-                neighbors=sorted(neighbor_ids)
+                center=(float(cx), float(cy)),
+                sign=float(signs[label_id]),
+                size=float(area_sizes[label_id]),
+                neighbors=neighbors.get(label_id, [])
             )
 
             areas[f"Area_{label_id}"] = area_data
 
         return areas
 
+    @staticmethod
+    def _label_statistics(
+        labels: NDArray,
+        num_labels: int,
+        sign_map: NDArray
+    ) -> Tuple[NDArray, NDArray, NDArray]:
+        """Compute pixel counts, centroids and mean signs of all labels in one pass.
+
+        Returns arrays indexed by label id (index 0 is the boundary label):
+        pixel counts, (row, column) centroids and the sign of the mean visual
+        field sign within each label.
+        """
+        height, width = labels.shape
+        flat = labels.ravel()
+        minlength = num_labels + 1
+
+        counts = np.bincount(flat, minlength=minlength)
+        row_sums = np.bincount(flat, weights=np.repeat(np.arange(height), width), minlength=minlength)
+        col_sums = np.bincount(flat, weights=np.tile(np.arange(width), height), minlength=minlength)
+        sign_sums = np.bincount(flat, weights=np.ravel(sign_map), minlength=minlength)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            centers = np.column_stack([row_sums, col_sums]) / counts[:, None]
+            signs = np.sign(sign_sums / counts)
+
+        return counts, centers, signs
+
+    def _label_pairs(self, labels: NDArray) -> Tuple[NDArray, NDArray]:
+        """Find neighbouring label pairs from label-to-label transitions.
+
+        Patches are first grown into the surrounding boundary pixels by up
+        to ``neighbor_distance`` pixels, each boundary pixel joining its
+        nearest patch. Two patches are then neighbours when they touch
+        (8-connected) in the grown image: when they touch directly, as the
+        pieces of a split patch do, or are separated by a boundary band at
+        most about twice that wide. Pairs are collected from four shifted
+        views of the grown image and deduplicated per view. Returns unique
+        (lo, hi) pairs with lo < hi.
+        """
+        grown = expand_labels(labels, self.neighbor_distance) if self.neighbor_distance > 0 else labels
+        n_ids = int(labels.max()) + 1
+
+        pairs = [np.zeros(0, dtype=np.int64)]
+        for first, second in (
+            (grown[:, :-1], grown[:, 1:]), (grown[:-1, :], grown[1:, :]),
+            (grown[:-1, :-1], grown[1:, 1:]), (grown[:-1, 1:], grown[1:, :-1])
+        ):
+            touching = (first > 0) & (second > 0) & (first != second)
+            lo = np.minimum(first[touching], second[touching]).astype(np.int64)
+            hi = np.maximum(first[touching], second[touching])
+            pairs.append(np.unique(lo * n_ids + hi))
+
+        return np.divmod(np.unique(np.concatenate(pairs)), n_ids)
+
+    def _label_adjacency(self, labels: NDArray) -> Dict[int, List[int]]:
+        """Map each label to the sorted list of its neighbouring labels."""
+        lo, hi = self._label_pairs(labels)
+        if lo.size == 0:
+            return {}
+
+        # Symmetric adjacency lists, sorted by label then neighbour
+        src = np.concatenate([lo, hi])
+        dst = np.concatenate([hi, lo])
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        splits = np.flatnonzero(np.diff(src)) + 1
+        return {
+            int(group_src[0]): group_dst.tolist()
+            for group_src, group_dst in zip(np.split(src, splits), np.split(dst, splits))
+        }
+
     def _post_process_areas(
         self,
         areas: Dict[str, AreaData]
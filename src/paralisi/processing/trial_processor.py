@@ -2,27 +2,33 @@
 
 import numpy as np
 from numpy.typing import NDArray
-from typing import Dict, List, Tuple
+from typing import Dict, Sequence, Tuple
 from ..core.configurations.trial_processing_config import TrialProcessingConfig
 from ..core.exceptions import ProcessingError
 
 class ConditionProcessor:
-    """Processes trial data grouped by experimental conditions"""
+    """Processes trial data grouped by experimental conditions
+
+    Trials are consumed once, one at a time, and accumulated into a running
+    mean and sum of squared deviations, so any sequence of trials works,
+    including lazily loaded or motion-corrected ones (see
+    ``MotionCorrector.correct_trials``).
+    """
 
     def __init__(self, image_size: Tuple[int, int]):
         self.image_size = image_size
 
     def process_condition_data(
         self,
-        trials: List[NDArray],
+        trials: Sequence[NDArray],
         config: TrialProcessingConfig
     ) -> Dict[str, NDArray]:
         """Process all trials for a condition.
 
         Parameters
         ----------
-        trials : List[NDArray]
-            List of trial data arrays
+        trials : Sequence[NDArray]
+            Sequence of trial data arrays
         config : TrialProcessingConfig
             Processing configuration
 
@@ -34,33 +40,18 @@ class ConditionProcessor:
         try:
             # Split trials if requested
             if config.split_trials:
-                odd_trials = trials[::2]
-                even_trials = trials[1::2]
-
-                odd_mean = self._process_trial_set(odd_trials, config)
-                even_mean = self._process_trial_set(even_trials, config)
-
-                result = {
-                    'odd_mean': odd_mean,
-                    'even_mean': even_mean
-                }
-
-                # Compute variance if requested
-                if config.compute_variance:
-                    odd_var = self._compute_trial_variance(odd_trials, odd_mean, config)
-                    even_var = self._compute_trial_variance(even_trials, even_mean, config)
-                    result.update({
-                        'odd_variance': odd_var,
-                        'even_variance': even_var
-                    })
+                trial_sets = {'odd': trials[::2], 'even': trials[1::2]}
             else:
-                # Process all trials together
-                mean = self._process_trial_set(trials, config)
-                result = {'mean': mean}
+                trial_sets = {'': trials}
 
+            result = {}
+            for name, trial_set in trial_sets.items():
+                prefix = f"{name}_" if name else ""
+                mean, variance = self._process_trial_set(trial_set, config)
+                result[f"{prefix}mean"] = mean
+                # Compute variance if requested
                 if config.compute_variance:
-                    variance = self._compute_trial_variance(trials, mean, config)
-                    result['variance'] = variance
+                    result[f"{prefix}variance"] = variance
 
             return result
 
@@ -69,51 +60,41 @@ class ConditionProcessor:
 
     def _process_trial_set(
         self,
-        trials: List[NDArray],
-        config: TrialProcessingConfig
-    ) -> NDArray:
-        """Process a set of trials and compute their mean."""
-
-        processed_trials = []
-        for trial in trials:
-            # Extract time windows
-            trial_data = trial[slice(*config.time_window)]
-            baseline = trial[slice(*config.baseline_window)]
-
-            # Compute baseline
-            baseline_mean = np.mean(baseline, axis=0)
-
-            # Apply baseline correction
-            if config.normalize:
-                processed = (trial_data - baseline_mean) / baseline_mean
-            else:
-                processed = trial_data - baseline_mean
-
-            processed_trials.append(processed)
-
-        return np.mean(processed_trials, axis=0)
-
-    def _compute_trial_variance(
-        self,
-        trials: List[NDArray],
-        mean: NDArray,
+        trials: Sequence[NDArray],
         config: TrialProcessingConfig
-    ) -> NDArray:
-        """Compute variance across trials relative to mean."""
-
-        squared_diff_sum = np.zeros(self.image_size)
-        n_trials = len(trials)
-
-        for trial in trials:
-            # Extract analysis window
-            trial_data = trial[slice(*config.time_window)]
+    ) -> Tuple[NDArray, NDArray]:
+        """Compute the mean and variance of a set of trials in one pass.
 
-            # Apply baseline correction if needed
-            if config.normalize:
-                baseline = np.mean(trial[slice(*config.baseline_window)], axis=0)
-                trial_data = (trial_data - baseline) / baseline
-
-            # Add squared difference from mean
-            squared_diff_sum += (trial_data - mean) ** 2
+        Uses Welford's update, so each trial is baseline-corrected once and
+        the variance does not suffer from cancellation.
+        """
 
-        return squared_diff_sum / n_trials
+        mean, m2 = None, None
+        for n_trials, trial in enumerate(trials, start=1):
+            processed = self._baseline_correct(trial, config)
+            if mean is None:
+                mean = np.array(processed, dtype=float)
+                m2 = np.zeros_like(mean)
+                continue
+            delta = processed - mean
+            mean += delta / n_trials
+            m2 += delta * (processed - mean)
+
+        if mean is None:
+            raise ProcessingError("No trials to process")
+        return mean, m2 / n_trials
+
+    @staticmethod
+    def _baseline_correct(trial: NDArray, config: TrialProcessingConfig) -> NDArray:
+        """Extract the analysis window of a trial and correct it by its baseline."""
+        # Extract time windows
+        trial_data = trial[slice(*config.time_window)]
+        baseline = trial[slice(*config.baseline_window)]
+
+        # Compute baseline
+        baseline_mean = np.mean(baseline, axis=0)
+
+        # Apply baseline correction
+        if config.normalize:
+            return (trial_data - baseline_mean) / baseline_mean
+        return trial_data - baseline_mean
@@ -0,0 +1,62 @@
+# tests/test_analysis/test_maps.py
+
+import numpy as np
+
+from paralisi.analysis.maps import FeatureMapAnalyzer, MapStatistics, VectorSumEngine
+
+def test_feature_maps_from_one_pass_match_explicit_sums():
+    """Stacked float32 responses give the same vector sums as per-map loops"""
+    rng = np.random.default_rng(0)
+    directions = np.arange(0, 360, 45.0)
+    responses = rng.random((3, len(directions), 16, 12)).astype(np.float32)
+
+    sums = VectorSumEngine({'direction': np.exp(1j * np.deg2rad(directions))}).apply(responses)
+    assert sums['direction'].dtype == np.complex64
+    for animal in range(3):
+        expected = np.sum(responses[animal] * np.exp(1j * np.deg2rad(directions))[:, None, None], axis=0)
+        np.testing.assert_allclose(sums['direction'][animal], expected, rtol=1e-5)
+
+    analyzer = FeatureMapAnalyzer(smoothing_sigma=1.0, min_magnitude=0.0)
+    maps = analyzer.compute_feature_maps(
+        responses, directions=directions, orientations=directions,
+        spatial_frequencies=np.full(len(directions), 0.1), wavelengths=np.linspace(450, 620, len(directions))
+    )
+    assert set(maps) == {'direction', 'orientation', 'spatial_frequency', 'color'}
+    assert maps['orientation'].orientation.shape == (3, 16, 12)
+    np.testing.assert_allclose(maps['spatial_frequency'].spatial_frequency, 0.1, rtol=1e-5)
+    assert np.all(maps['color'].color_selectivity <= 1)
+
+def test_orientation_map_smooths_across_phase_wrap():
+    """Smoothing in the complex domain keeps orientations near the wrap intact"""
+    orientations = np.array([0, 45, 90, 135])
+    preferred = np.where(np.arange(20)[None, :] % 2, np.deg2rad(2), np.deg2rad(178)) * np.ones((20, 1))
+    responses = 1 + np.cos(2 * (np.deg2rad(orientations)[:, None, None] - preferred))
+
+    result = FeatureMapAnalyzer(smoothing_sigma=2.0).process_orientation_map(responses, orientations)
+    wrapped = np.abs((np.rad2deg(result.phase) + 90) % 180 - 90)
+    assert np.nanmax(wrapped[4:-4, 4:-4]) < 1
+
+def test_label_statistics_match_per_roi_calls():
+    """One-pass label statistics reproduce the per-ROI methods"""
+    rng = np.random.default_rng(1)
+    magnitude = rng.random((30, 40))
+    magnitude[rng.random(magnitude.shape) < 0.2] = np.nan
+    phase = rng.uniform(-np.pi, np.pi, magnitude.shape)
+    labels = rng.integers(0, 5, magnitude.shape)
+    stats = MapStatistics()
+
+    table = stats.compute_label_selectivity_stats(magnitude, labels, index=np.array([3, 1, 2, 4, 7]))
+    np.testing.assert_array_equal(table['label'], [3, 1, 2, 4, 7])
+    for row in table[:-1]:
+        expected = stats.compute_selectivity_stats(magnitude, labels == row['label'])
+        for name in ('mean_selectivity', 'median_selectivity', 'std_selectivity', 'coverage'):
+            np.testing.assert_allclose(row[name], expected[name])
+    assert table[-1]['coverage'] == 0 and np.isnan(table[-1]['median_selectivity'])
+
+    index, hists, centers = stats.compute_label_preference_distributions(phase, magnitude, labels, n_bins=12)
+    threshold = np.nanpercentile(magnitude, 25)
+    for label, hist in zip(index, hists):
+        roi_magnitude = np.where(labels == label, magnitude, -np.inf)
+        expected, expected_centers = stats.compute_preference_distribution(phase, roi_magnitude, 12, threshold)
+        np.testing.assert_array_equal(hist, expected)
+    np.testing.assert_allclose(centers, expected_centers)
@@ -0,0 +1,55 @@
+# tests/test_analysis/test_metrics.py
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from paralisi.analysis.metrics import MetricsCalculator
+
+@pytest.fixture
+def trials():
+    rng = np.random.default_rng(0)
+    response = np.sin(np.linspace(0, 3, 20))[:, None, None] * rng.random((1, 4, 5))
+    return response + 0.5 * rng.standard_normal((9, 20, 4, 5))
+
+def test_reliability_matches_pairwise_pearson(trials):
+    """Matrix reliability equals the mean of pairwise Pearson correlations"""
+    flat = trials.reshape(len(trials), -1)
+    expected = np.mean([stats.pearsonr(flat[i], flat[j])[0]
+                        for i in range(len(flat)) for j in range(i + 1, len(flat))])
+    assert MetricsCalculator(10.0)._calculate_reliability(flat) == pytest.approx(expected)
+
+def test_reliability_maps_match_per_pixel_correlations(trials):
+    """Chunked per-pixel reliability reproduces explicit per-pixel correlations"""
+    calculator = MetricsCalculator(10.0)
+    split_half = calculator.compute_reliability_map(trials, spearman_brown=False, chunk_size=7)
+    leave_one_out = calculator.compute_reliability_map(trials, method='leave_one_out', chunk_size=7)
+
+    for y, x in [(0, 0), (2, 3), (3, 4)]:
+        courses = trials[:, :, y, x]
+        r = stats.pearsonr(courses[0::2].mean(axis=0), courses[1::2].mean(axis=0))[0]
+        assert split_half[y, x] == pytest.approx(r)
+        loo = np.mean([stats.pearsonr(courses[k], np.delete(courses, k, axis=0).mean(axis=0))[0]
+                       for k in range(len(courses))])
+        assert leave_one_out[y, x] == pytest.approx(loo)
+
+def test_response_maps_match_scalar_metrics():
+    """Per-pixel maps reproduce the scalar metrics pixel by pixel"""
+    rng = np.random.default_rng(2)
+    stack = rng.standard_normal((40, 6, 7)).astype(np.float32)
+    stack[15:] += np.linspace(0, 8, 25)[:, None, None] * rng.random((6, 7))
+    calculator = MetricsCalculator(sampling_rate=5.0)
+
+    maps = calculator.compute_response_maps(stack, stimulus_onset=10, chunk_size=5, workers=2)
+    assert all(m.shape == (6, 7) and m.dtype == np.float32 for m in maps.values())
+
+    for y, x in [(0, 0), (3, 2), (5, 6)]:
+        course = stack[:, y, x].astype(np.float64)
+        baseline, response = course[:10], course[10:]
+        assert maps['snr'][y, x] == pytest.approx(calculator._calculate_snr(response, baseline), rel=1e-4)
+        assert maps['amplitude'][y, x] == pytest.approx(calculator._calculate_amplitude(response, baseline), rel=1e-4)
+        assert maps['variance'][y, x] == pytest.approx(calculator._calculate_variance(response), rel=1e-4)
+
+        crossings = np.flatnonzero(np.abs(response - baseline.mean()) > 2 * baseline.std())
+        expected = crossings[0] / 5.0 if len(crossings) else np.nan
+        np.testing.assert_allclose(maps['latency'][y, x], expected)
@@ -0,0 +1,107 @@
+# tests/test_analysis/test_orientation.py
+
+import numpy as np
+import pytest
+
+from paralisi.analysis.orientation import OrientationAnalyzer
+
+def _loop_uniformity(orientation, mask, kernel_size):
+    """Per-pixel reference implementation of local uniformity"""
+    half = kernel_size // 2
+    uniformity = np.zeros_like(orientation)
+    for i in range(half, orientation.shape[0] - half):
+        for j in range(half, orientation.shape[1] - half):
+            patch_mask = mask[i - half:i + half + 1, j - half:j + half + 1]
+            if mask[i, j] and patch_mask.any():
+                angles = orientation[i - half:i + half + 1, j - half:j + half + 1][patch_mask]
+                uniformity[i, j] = np.abs(np.mean(np.exp(2j * angles)))
+    uniformity[~mask] = np.nan
+    return uniformity
+
+@pytest.fixture
+def orientation_map():
+    rng = np.random.default_rng(0)
+    orientation = np.angle(np.fft.ifft2(np.fft.fft2(rng.standard_normal((48, 40))) *
+                                        np.exp(-np.add.outer(np.fft.fftfreq(48) ** 2, np.fft.fftfreq(40) ** 2) * 200)))
+    mask = rng.random((48, 40)) > 0.3
+    return orientation / 2, mask
+
+@pytest.mark.parametrize("kernel_size", [3, 5, 6])
+def test_local_uniformity_matches_patch_loop(orientation_map, kernel_size):
+    """Filtered uniformity reproduces the per-patch circular mean"""
+    orientation, mask = orientation_map
+    analyzer = OrientationAnalyzer()
+
+    uniformity = analyzer._compute_local_uniformity(orientation, mask, kernel_size)
+    np.testing.assert_allclose(uniformity, _loop_uniformity(orientation, mask, kernel_size), atol=1e-10)
+
+    stacked = analyzer._compute_local_uniformity(np.stack([orientation] * 2), np.stack([mask] * 2), kernel_size)
+    np.testing.assert_allclose(stacked[1], uniformity, atol=1e-10)
+
+    broadcast = analyzer._compute_local_uniformity(np.stack([orientation] * 2), mask, kernel_size)
+    np.testing.assert_allclose(broadcast, stacked, atol=1e-10)
+
+    gaussian = OrientationAnalyzer(uniformity_window="gaussian", uniformity_size=1.5)
+    smooth = gaussian._compute_local_uniformity(orientation, mask)
+    assert np.all((smooth[mask] >= 0) & (smooth[mask] <= 1))
+
+def _wave_map(wavelength, size=128, seed=0):
+    """Orientation map from superposed plane waves with a common wavelength"""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[:size, :size]
+    field = sum(
+        np.exp(1j * (2 * np.pi / wavelength * (np.cos(a) * x + np.sin(a) * y) + rng.uniform(0, 2 * np.pi)))
+        for a in np.linspace(0, np.pi, 12, endpoint=False)
+    )
+    return np.angle(field) / 2
+
+def test_domain_size_scales_with_map_wavelength():
+    """Domain sizes and periods follow the column spacing, in batch and singly"""
+    analyzer = OrientationAnalyzer()
+    maps = np.stack([_wave_map(16), _wave_map(32)])
+    mask = np.ones(maps.shape[-2:], dtype=bool)
+
+    domain_sizes, periods = analyzer.estimate_domain_sizes(maps, mask)
+    # Isotropic maps correlate like J0: first minimum near 0.61, next maximum near 1.12 wavelengths
+    np.testing.assert_allclose(domain_sizes, [0.61 * 16, 0.61 * 32], rtol=0.1)
+    np.testing.assert_allclose(periods, [1.12 * 16, 1.12 * 32], rtol=0.1)
+    assert analyzer._estimate_domain_size(maps[1], mask) == domain_sizes[1]
+
+def test_domain_size_is_nan_without_valid_pixels():
+    """An empty mask yields no domain size or period rather than the largest radius"""
+    analyzer = OrientationAnalyzer()
+    maps = np.stack([_wave_map(16, size=64), _wave_map(16, size=64)])
+    mask = np.ones(maps.shape, dtype=bool)
+    mask[1] = False
+
+    domain_sizes, periods = analyzer.estimate_domain_sizes(maps, mask)
+    assert np.isfinite(domain_sizes[0]) and np.isfinite(periods[0])
+    assert np.isnan(domain_sizes[1]) and np.isnan(periods[1])
+
+def test_radial_profile_averages_rings():
+    """Ring averages of a radial function reproduce it"""
+    y, x = np.indices((21, 31))
+    radius = np.hypot(y - 10, x - 15)
+    profile = OrientationAnalyzer.radial_profile(np.stack([np.rint(radius), 2 * np.rint(radius)]))
+    np.testing.assert_allclose(profile, [np.arange(11), 2 * np.arange(11)])
+
+def test_pinwheels_detected_with_subpixel_centers_and_chirality():
+    """Each singularity yields one sub-pixel center with its winding sign"""
+    y, x = np.mgrid[:40, :50].astype(float)
+    # Orientation rotates clockwise on screen around the first center, counter-clockwise around the second
+    field = ((x - 12.3) + 1j * (y - 15.7)) * ((x - 35.6) - 1j * (y - 24.2))
+    orientation = np.mod(np.angle(field) / 2, np.pi)
+    mask = np.ones_like(orientation, dtype=bool)
+    analyzer = OrientationAnalyzer()
+
+    detection = analyzer.detect_pinwheels(orientation, mask)
+    order = np.argsort(detection.centers[:, 0])
+    np.testing.assert_allclose(detection.centers[order], [[12.3, 15.7], [35.6, 24.2]], atol=0.15)
+    np.testing.assert_array_equal(detection.chirality[order], [-1, 1])
+
+    batch = analyzer.detect_pinwheels(np.stack([np.zeros_like(orientation), orientation]), mask)
+    assert len(batch.centers) == 2 and np.all(batch.map_index == 1)
+
+    masked = mask.copy()
+    masked[10:20, 8:18] = False
+    assert len(analyzer.detect_pinwheels(orientation, masked).centers) == 1
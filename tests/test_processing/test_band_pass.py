@@ -0,0 +1,36 @@
+# tests/test_processing/test_band_pass.py
+
+import numpy as np
+from scipy import ndimage
+
+from paralisi.core.configurations.filter_config import FrequencyBand
+from paralisi.core.types.kernels import TransferFunctionType
+from paralisi.processing.filters.band_pass import BandPassFilterBank
+
+def test_filter_bank_bands_match_single_filters():
+    """All bands come from one transform and match Gaussian filtering"""
+    rng = np.random.default_rng(0)
+    stack = rng.standard_normal((2, 96, 80))
+    bands = [
+        FrequencyBand(low_pass_width=2.0),
+        FrequencyBand(high_pass_width=12.0, low_pass_width=2.0),
+        FrequencyBand(high_pass_width=12.0, low_pass_width=3.0, shape=TransferFunctionType.BUTTERWORTH),
+        FrequencyBand(high_pass_width=8.0, shape=TransferFunctionType.HANN),
+    ]
+    bank = BandPassFilterBank(bands, pad_mode='symmetric')
+    filtered = bank.apply(stack)
+    assert filtered.shape == (len(bands),) + stack.shape
+
+    low = ndimage.gaussian_filter(stack, (0, 2.0, 2.0), truncate=6.0)
+    band = low - ndimage.gaussian_filter(low, (0, 12.0, 12.0), truncate=6.0, mode='reflect')
+    np.testing.assert_allclose(filtered[0], low, atol=1e-6)
+    inner = (slice(None), slice(30, -30), slice(30, -30))
+    np.testing.assert_allclose(filtered[1][inner], band[inner], atol=1e-3)
+
+    for index, single in enumerate(bands):
+        alone = BandPassFilterBank([single], pad_mode='symmetric', padding=bank.padding).apply(stack[0])
+        np.testing.assert_allclose(alone[0], filtered[index, 0], atol=1e-12)
+
+    # High-pass bands remove the mean
+    assert abs(filtered[3].mean()) < 0.1 * abs(stack.mean()) + 1e-3
+    assert bank.transfer_functions((96, 80)) is bank.transfer_functions((96, 80))
@@ -0,0 +1,72 @@
+# tests/test_processing/test_batch_segmentation.py
+
+import numpy as np
+import pytest
+from scipy import ndimage
+
+from paralisi.io.savers import HDF5Saver, NPZSaver
+from paralisi.processing.segmentation.batch_segmentation import AREA_ROW_DTYPE, BatchSegmentationRunner
+from paralisi.processing.segmentation.gradient_field import GradientFieldCache
+from paralisi.processing.segmentation.visual_area_segmenter import VisualAreaSegmenter
+
+SEGMENTER_KWARGS = {'min_area_size': 0.0}
+
+def _maps(seed):
+    rng = np.random.default_rng(seed)
+    kmap_hor = ndimage.gaussian_filter(rng.standard_normal((48, 56)), 4) * 40
+    kmap_vert = ndimage.gaussian_filter(rng.standard_normal((48, 56)), 4) * 40
+    return kmap_hor, kmap_vert
+
+def _expected_rows(animal_id, kmap_hor, kmap_vert, pixpermm):
+    segmenter = VisualAreaSegmenter(use_gpu=False, gradient_cache=GradientFieldCache(), **SEGMENTER_KWARGS)
+    areas = segmenter.apply((kmap_hor, kmap_vert), pixpermm)
+    return [
+        (animal_id, name, area.id, area.size, *area.center, area.sign, ','.join(map(str, area.neighbors)))
+        for name, area in areas.items()
+    ]
+
+def _sorted(rows):
+    return sorted((tuple(row) for row in rows), key=lambda row: (row[0], row[2]))
+
+@pytest.fixture
+def sources(tmp_path):
+    """One cohort with in-memory, NPZ and HDF5 sources and a missing file"""
+    long_id = 'animal_' + 'x' * 120  # Longer than any fixed-width string field
+    npz_path = NPZSaver().save('m2', dict(zip(('kmap_hor', 'kmap_vert'), _maps(2))), {'pixpermm': 12.0}, tmp_path)
+    h5_path = HDF5Saver().save('m3', dict(zip(('kmap_hor', 'kmap_vert'), _maps(3))), {'pixpermm': 8.0}, tmp_path)
+    return {
+        long_id: (*_maps(1), 10.0),
+        'm2': npz_path,
+        'm3': h5_path,
+        'missing': tmp_path / 'missing.npz',
+    }
+
+def test_runner_matches_per_animal_segmentation(sources, tmp_path):
+    """Every readable animal yields the segmenter's areas; the missing one is a failure"""
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    long_id = next(iter(sources))
+    output = tmp_path / 'areas.parquet'
+
+    result = BatchSegmentationRunner(n_workers=2, segmenter_kwargs=SEGMENTER_KWARGS).run(sources, output)
+
+    expected = (_expected_rows(long_id, *_maps(1), 10.0)
+                + _expected_rows('m2', *_maps(2), 12.0)
+                + _expected_rows('m3', *_maps(3), 8.0))
+    assert result.areas.dtype == AREA_ROW_DTYPE
+    assert _sorted(result.areas) == _sorted(expected)
+    assert set(result.failures) == {'missing'}
+    assert long_id in set(result.areas['animal'])
+    assert max(map(len, result.areas['neighbors'])) > 0
+
+    # Parquet round trip keeps every row, with text columns as strings
+    table = pq.read_table(output)
+    assert table.schema.field('animal').type == pa.string()
+    assert table.schema.field('neighbors').type == pa.string()
+    assert _sorted(zip(*(table.column(name).to_pylist() for name in AREA_ROW_DTYPE.names))) == _sorted(expected)
+
+def test_runner_with_no_successful_animals(tmp_path):
+    """A cohort of failures still returns an empty, correctly typed table"""
+    result = BatchSegmentationRunner(n_workers=2).run({'gone': tmp_path / 'gone.h5'})
+    assert result.areas.dtype == AREA_ROW_DTYPE and len(result.areas) == 0
+    assert set(result.failures) == {'gone'}
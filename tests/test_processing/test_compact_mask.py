@@ -0,0 +1,111 @@
+# tests/test_processing/test_compact_mask.py
+
+import operator
+from functools import reduce
+
+import numpy as np
+import pytest
+
+from paralisi.core.data import CompactMask
+from paralisi.io.loaders import HDF5Loader, NumpyLoader
+from paralisi.io.savers import HDF5Saver, NPZSaver
+
+@pytest.fixture
+def masks():
+    rng = np.random.default_rng(0)
+    first = np.zeros((40, 50), dtype=bool)
+    first[5:17, 8:21] = rng.random((12, 13)) > 0.4
+    second = np.zeros((40, 50), dtype=bool)
+    second[12:33, 15:44] = rng.random((21, 29)) > 0.4
+    return first, second
+
+def test_crop_round_trips_dense_mask(masks):
+    """Masks are cropped to their bounding box and expand back unchanged"""
+    dense, _ = masks
+    mask = CompactMask.from_dense(dense)
+    rows, cols = np.nonzero(dense)
+
+    assert mask.offset == (rows.min(), cols.min())
+    assert mask.crop.shape == (rows.max() - rows.min() + 1, cols.max() - cols.min() + 1)
+    assert mask.area == dense.sum()
+    np.testing.assert_array_equal(mask.to_dense(), dense)
+    np.testing.assert_array_equal(np.asarray(mask), dense)
+
+    # Every expansion is a new array, so callers cannot alias or pin it
+    expanded = mask.to_dense()
+    expanded[:] = False
+    np.testing.assert_array_equal(mask.to_dense(), dense)
+
+    empty = CompactMask.from_dense(np.zeros((40, 50), dtype=bool))
+    assert empty.area == 0 and not empty.to_dense().any()
+    with pytest.raises(ValueError):
+        CompactMask(np.ones((5, 5)), (38, 0), (40, 50))
+
+def test_union_and_intersection_match_dense_operations(masks):
+    """Set operations on crops equal the full-frame boolean operations"""
+    first, second = masks
+    a, b = CompactMask.from_dense(first), CompactMask.from_dense(second)
+
+    np.testing.assert_array_equal((a | b).to_dense(), first | second)
+    np.testing.assert_array_equal((a & b).to_dense(), first & second)
+
+    disjoint = np.zeros_like(first)
+    disjoint[35:, 45:] = True
+    assert (a & CompactMask.from_dense(disjoint)).area == 0
+    with pytest.raises(ValueError):
+        a | CompactMask.from_dense(np.ones((10, 10), dtype=bool))
+
+def test_empty_operands_keep_the_other_bounding_box(masks):
+    """Combining with an empty mask neither stretches nor keeps a box"""
+    first, _ = masks
+    a = CompactMask.from_dense(first)
+    empty = CompactMask.empty(first.shape)
+
+    for union in (a | empty, empty | a, reduce(operator.or_, [a], empty)):
+        assert (union.offset, union.crop.shape) == (a.offset, a.crop.shape)
+        np.testing.assert_array_equal(union.to_dense(), first)
+    assert (a & empty).area == 0 and (a & empty).crop.shape == (0, 0)
+
+def test_combined_masks_are_trimmed_to_their_pixels():
+    """Results are cropped to their own bounding box, and empty when nothing is shared"""
+    first = np.zeros((30, 30), dtype=bool)
+    first[5, 5] = first[20, 20] = True
+    second = np.zeros((30, 30), dtype=bool)
+    second[5, 20] = second[20, 5] = True
+    a, b = CompactMask.from_dense(first), CompactMask.from_dense(second)
+
+    disjoint = a & b
+    assert disjoint.area == 0 and disjoint.crop.shape == (0, 0)
+
+    second[20, 20] = True
+    shared = a & CompactMask.from_dense(second)
+    assert (shared.offset, shared.crop.shape) == ((20, 20), (1, 1))
+
+def test_packed_arrays_round_trip(masks):
+    """Bit-packed encoding restores crop, offset and frame shape"""
+    mask = CompactMask.from_dense(masks[1])
+    arrays = mask.to_arrays()
+    assert arrays['packed'].nbytes == int(np.ceil(mask.crop.size / 8))
+
+    restored = CompactMask.from_arrays(**arrays)
+    assert (restored.offset, restored.shape) == (mask.offset, mask.shape)
+    np.testing.assert_array_equal(restored.crop, mask.crop)
+
+@pytest.mark.parametrize("saver, extension", [(HDF5Saver, "h5"), (NPZSaver, "npz")])
+def test_savers_round_trip_compact_masks(masks, tmp_path, saver, extension):
+    """Compact masks and plain arrays survive saving and loading"""
+    mask = CompactMask.from_dense(masks[0])
+    image = np.arange(12.0).reshape(3, 4)
+    path = saver().save("session", {'area': mask, 'image': image}, {'animal': 'm1'}, tmp_path)
+    assert path == tmp_path / f"session.{extension}"
+
+    if extension == "h5":
+        area, loaded_image = HDF5Loader.load(path, 'data/area'), HDF5Loader.load(path, 'data/image')
+    else:
+        archive = NumpyLoader.load_archive(path)
+        area, loaded_image = archive['area'], archive['image']
+        assert archive['metadata'] == {'animal': 'm1'}
+
+    assert isinstance(area, CompactMask)
+    np.testing.assert_array_equal(area.to_dense(), masks[0])
+    np.testing.assert_array_equal(loaded_image, image)
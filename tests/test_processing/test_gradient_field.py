@@ -0,0 +1,77 @@
+# tests/test_processing/test_gradient_field.py
+
+import numpy as np
+import pytest
+import torch
+from scipy import ndimage
+
+from paralisi.processing.segmentation.gradient_field import GradientFieldCache, RetinotopicGradientField
+from paralisi.processing.segmentation.sign_map_generator import SignMapGenerator
+from paralisi.processing.segmentation.visual_area_segmenter import VisualAreaSegmenter
+
+@pytest.fixture
+def phase_maps():
+    rng = np.random.default_rng(4)
+    kmap_hor = ndimage.gaussian_filter(rng.standard_normal((64, 72)), 4) * 40
+    kmap_vert = ndimage.gaussian_filter(rng.standard_normal((64, 72)), 4) * 40
+    return kmap_hor, kmap_vert
+
+def test_sign_convention_takes_x_along_columns():
+    """Azimuth along columns and elevation along rows has negative sign; transposing flips it"""
+    rows, cols = np.mgrid[:32, :40].astype(float)
+    sign_map = SignMapGenerator(GradientFieldCache()).generate_sign_map(cols, rows)
+    assert np.all(sign_map == -1)
+
+    swapped = SignMapGenerator(GradientFieldCache()).generate_sign_map(rows, cols)
+    assert np.all(swapped == 1)
+
+def test_fields_match_direct_computation(phase_maps):
+    """Cached quantities equal the explicit smoothing, gradient and sign formulas"""
+    kmap_hor, kmap_vert = phase_maps
+    kmap_hor = kmap_hor.copy()
+    kmap_hor[3, 5] = np.nan
+    field = RetinotopicGradientField(kmap_hor, kmap_vert, smoothing_sigma=1.5)
+
+    grad_hy, grad_hx = np.gradient(ndimage.gaussian_filter(kmap_hor, 1.5))
+    grad_vy, grad_vx = np.gradient(ndimage.gaussian_filter(kmap_vert, 1.5))
+    np.testing.assert_allclose(field.grad_h, grad_hx + 1j * grad_hy)
+    np.testing.assert_allclose(field.jacobian, grad_hx * grad_vy - grad_hy * grad_vx)
+
+    expected = np.sign(np.angle((grad_hx + 1j * grad_hy) * np.conj(grad_vx + 1j * grad_vy)))
+    expected[3, 5] = np.nan
+    np.testing.assert_array_equal(field.sign_map, expected)
+    assert not field.sign_map.flags.writeable
+
+def test_cache_hits_by_content_and_evicts(phase_maps):
+    """Copies and tensors hit the same entry; entry and byte limits evict the oldest"""
+    kmap_hor, kmap_vert = phase_maps
+    cache = GradientFieldCache(max_entries=2)
+    field = cache.get(kmap_hor, kmap_vert, 1.0)
+
+    assert cache.get(kmap_hor.copy(), kmap_vert.copy(), 1.0) is field
+    assert cache.get(torch.from_numpy(kmap_hor), torch.from_numpy(kmap_vert), 1.0) is field
+    assert cache.get(kmap_hor, kmap_vert, 2.0) is not field
+
+    cache.get(kmap_vert, kmap_hor, 1.0)
+    assert len(cache) == 2
+    assert cache.get(kmap_hor, kmap_vert, 1.0) is not field
+
+    bounded = GradientFieldCache(max_bytes=3 * kmap_hor.nbytes)
+    first = bounded.get(kmap_hor, kmap_vert, 1.0)
+    first.sign_map  # Smoothing and gradients grow the field past the budget
+    bounded.get(kmap_vert, kmap_hor, 1.0)
+    assert len(bounded) == 1 and bounded.nbytes <= 3 * kmap_hor.nbytes
+    assert bounded.get(kmap_hor, kmap_vert, 1.0) is not first
+
+def test_segmenter_output_independent_of_device(phase_maps):
+    """Requesting the GPU, or passing tensors, leaves the segmentation unchanged"""
+    kmap_hor, kmap_vert = phase_maps
+    cpu = VisualAreaSegmenter(use_gpu=False, gradient_cache=GradientFieldCache()).apply(phase_maps, 10.0)
+    gpu = VisualAreaSegmenter(use_gpu=True, gradient_cache=GradientFieldCache()).apply(
+        (torch.from_numpy(kmap_hor), torch.from_numpy(kmap_vert)), 10.0
+    )
+
+    assert cpu and cpu.keys() == gpu.keys()
+    for name, area in cpu.items():
+        np.testing.assert_array_equal(area.boundary.to_dense(), gpu[name].boundary.to_dense())
+        assert (area.sign, area.size, area.neighbors) == (gpu[name].sign, gpu[name].size, gpu[name].neighbors)
@@ -0,0 +1,69 @@
+# tests/test_processing/test_motion_correction.py
+
+import numpy as np
+import pytest
+from scipy import ndimage
+
+from paralisi.core.configurations.trial_processing_config import TrialProcessingConfig
+from paralisi.core.exceptions import ProcessingError
+from paralisi.processing.motion_correction import MotionCorrector
+from paralisi.processing.registration import ImageRegistration, RegistrationMethod
+from paralisi.processing.trial_processor import ConditionProcessor
+
+@pytest.fixture
+def session():
+    """Reference image and trials of frames jittered by known shifts"""
+    rng = np.random.default_rng(0)
+    reference = ndimage.gaussian_filter(rng.standard_normal((48, 48)), 2) + 5.0
+    spectrum = np.fft.fft2(reference)
+    trials = [
+        np.stack([
+            np.fft.ifft2(ndimage.fourier_shift(spectrum, shift)).real
+            for shift in rng.uniform(-3, 3, (6, 2))
+        ]).astype(np.float32)
+        for _ in range(4)
+    ]
+    return reference.astype(np.float32), trials
+
+def make_corrector(reference, path, **kwargs):
+    registration = ImageRegistration(RegistrationMethod.PHASE_CORRELATION, cuda_enabled=False)
+    return MotionCorrector(reference, registration, chunk_size=4, transform_path=path, **kwargs)
+
+def test_transforms_are_persisted_and_reused(session, tmp_path):
+    """A new corrector reads transforms from disk instead of re-estimating"""
+    reference, trials = session
+    path = tmp_path / "transforms.h5"
+    corrected = make_corrector(reference, path).correct(7, trials[0])
+
+    reloaded = make_corrector(reference, path, estimate_missing=False)
+    np.testing.assert_allclose(reloaded.correct(7, trials[0]), corrected, atol=1e-5)
+    assert reloaded.store.get("7")['translation'].shape == (6, 2)
+    with pytest.raises(ProcessingError, match="No stored transforms"):
+        reloaded.correct(8, trials[1])
+
+def test_condition_averaging_streams_corrected_trials(session):
+    """Lazily corrected trials average like an explicitly corrected list"""
+    reference, trials = session
+    corrector = make_corrector(reference, None)
+    config = TrialProcessingConfig(time_window=(2, 6), baseline_window=(0, 2), compute_variance=True)
+    processor = ConditionProcessor(reference.shape)
+
+    lazy = processor.process_condition_data(corrector.correct_trials(trials), config)
+    eager = processor.process_condition_data(
+        [corrector.correct(i, trial) for i, trial in enumerate(trials)], config
+    )
+
+    for key, value in eager.items():
+        np.testing.assert_allclose(lazy[key], value, rtol=1e-5)
+
+def test_condition_statistics_match_two_pass_reference(session):
+    """The one-pass mean and variance equal numpy's over baseline-corrected trials"""
+    _, trials = session
+    config = TrialProcessingConfig(time_window=(2, 6), baseline_window=(0, 2), compute_variance=True,
+                                   normalize=False)
+    result = ConditionProcessor(trials[0].shape[1:]).process_condition_data(trials, config)
+
+    corrected = np.stack([t[2:6] - t[0:2].mean(axis=0) for t in trials]).astype(float)
+    for name, subset in (('odd', corrected[::2]), ('even', corrected[1::2])):
+        np.testing.assert_allclose(result[f'{name}_mean'], subset.mean(axis=0), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(result[f'{name}_variance'], subset.var(axis=0), rtol=1e-5, atol=1e-6)
@@ -0,0 +1,135 @@
+# tests/test_processing/test_registration.py
+
+import numpy as np
+import pytest
+import torch
+from scipy import ndimage
+
+from paralisi.processing.registration import ImageRegistration, RegistrationMethod
+from paralisi.processing.registration_optimizer import OptimizerType, RegistrationOptimizer
+
+@pytest.fixture
+def shifted_pair():
+    """Smooth random image and a circularly sub-pixel shifted copy"""
+    rng = np.random.default_rng(1)
+    source = ndimage.gaussian_filter(rng.standard_normal((96, 128)), 2)
+    shift = (3.3, -5.65)
+    target = np.fft.ifft2(ndimage.fourier_shift(np.fft.fft2(source), shift)).real
+    return source, target, np.array(shift)
+
+def test_phase_correlation_recovers_subpixel_shift(shifted_pair):
+    """Phase correlation finds the shift to 1/upsample_factor pixel"""
+    source, target, shift = shifted_pair
+    registration = ImageRegistration(
+        RegistrationMethod.PHASE_CORRELATION, cuda_enabled=False, precision='float64'
+    )
+    np.testing.assert_allclose(registration.estimate_translation(source, target), shift, atol=0.05)
+
+def test_phase_correlation_registration_reduces_loss(shifted_pair):
+    """Applying the estimated translation aligns source with target"""
+    source, target, _ = shifted_pair
+    registration = ImageRegistration(
+        RegistrationMethod.PHASE_CORRELATION, cuda_enabled=False, precision='float64'
+    )
+    result = registration.register_images(source, target)
+
+    assert result.iteration_count == 1
+    assert result.convergence_metric < 0.2 * np.mean((source - target) ** 2)
+
+@pytest.mark.parametrize("method", [
+    RegistrationMethod.PHASE_CORRELATION, RegistrationMethod.RIGID, RegistrationMethod.AFFINE
+])
+def test_stack_registration_matches_pairwise(method):
+    """Batched, chunked stack registration gives the same parameters as per-frame calls"""
+    rng = np.random.default_rng(2)
+    target = ndimage.gaussian_filter(rng.standard_normal((64, 80)), 3)
+    stack = np.stack([
+        ndimage.shift(ndimage.rotate(target, angle, reshape=False, mode='wrap'), shift, mode='wrap')
+        for angle, shift in zip(rng.uniform(-4, 4, 5), rng.uniform(-4, 4, (5, 2)))
+    ])
+    registration = ImageRegistration(
+        method, cuda_enabled=False, precision='float64', phase_correlation_init=True
+    )
+    result = registration.register_stack(stack, target, chunk_size=2)
+    pairwise = [registration.register_images(frame, target) for frame in stack]
+
+    assert result.transform_params.keys() == pairwise[0].transform_params.keys()
+    for name, values in result.transform_params.items():
+        assert values.shape[0] == len(stack)
+        np.testing.assert_allclose(values, np.stack([p.transform_params[name] for p in pairwise]), atol=1e-8)
+    np.testing.assert_allclose(result.convergence_metric, [p.convergence_metric for p in pairwise], rtol=1e-6)
+    assert result.transformed_stack.shape == stack.shape
+    assert result.converged.shape == (len(stack),) and result.converged.all()
+
+    # Frames stop individually, each after as many iterations as on its own
+    np.testing.assert_array_equal(result.iteration_count, [p.iteration_count for p in pairwise])
+    if method != RegistrationMethod.PHASE_CORRELATION:
+        assert len(set(result.iteration_count)) > 1
+        assert np.all(result.convergence_metric < 0.2 * np.mean((stack - target) ** 2, axis=(1, 2)))
+
+@pytest.mark.parametrize("method", [RegistrationMethod.RIGID, RegistrationMethod.AFFINE])
+def test_pyramid_registration_recovers_large_motion(method):
+    """Coarse-to-fine registration aligns a large shift plus rotation"""
+    rng = np.random.default_rng(0)
+    freqs = np.fft.fftfreq(128)
+    radius = np.hypot(freqs[:, None], freqs[None, :])
+    radius[0, 0] = 1
+    target = np.fft.ifft2(np.fft.fft2(rng.standard_normal((128, 128))) / radius ** 1.2).real
+    target = ((target - target.mean()) / target.std()).astype(np.float32)
+    shifted = np.fft.ifft2(ndimage.fourier_shift(np.fft.fft2(target), (14, -18))).real
+    source = ndimage.rotate(shifted, 5, reshape=False).astype(np.float32)
+
+    registration = ImageRegistration(method, cuda_enabled=False, pyramid_levels=4)
+    result = registration.register_images(source, target)
+
+    assert result.convergence_metric < 0.2 * np.mean((source - target) ** 2)
+
+def test_elastic_registration_runs():
+    """Elastic registration reduces the loss on a small deformation"""
+    rng = np.random.default_rng(3)
+    target = ndimage.gaussian_filter(rng.standard_normal((64, 64)), 3).astype(np.float32)
+    source = ndimage.shift(target, (1.5, -1.0), mode='wrap').astype(np.float32)
+
+    registration = ImageRegistration(RegistrationMethod.ELASTIC, cuda_enabled=False, pyramid_levels=2)
+    result = registration.register_images(source, target)
+
+    assert result.transform_params['displacement'].shape == (2, 64, 64)
+    assert result.convergence_metric < np.mean((source - target) ** 2)
+
+def test_lbfgs_with_mask_region_and_profiling(shifted_pair):
+    """L-BFGS refines a phase-correlation seed inside a mask's bounding box"""
+    source, target, _ = shifted_pair
+    mask = np.zeros(source.shape)
+    mask[20:70, 30:100] = 1.0
+    timings = []
+    registration = ImageRegistration(
+        RegistrationMethod.RIGID, cuda_enabled=False, precision='float64',
+        phase_correlation_init=True, optimizer=OptimizerType.LBFGS,
+        profile_hook=lambda iteration, seconds: timings.append((iteration, seconds))
+    )
+    result = registration.register_images(source, target, mask=mask)
+
+    residual = np.mean(((result.transformed_image - target) * mask)[20:70, 30:100] ** 2)
+    np.testing.assert_allclose(result.convergence_metric, residual, rtol=1e-6)
+    assert residual < 0.05 * np.mean(((source - target) * mask)[20:70, 30:100] ** 2)
+    assert timings and all(seconds >= 0 for _, seconds in timings)
+
+def test_adam_holds_stopped_items_in_place():
+    """Items of a batched loss stop individually and stay put while the rest continue"""
+    targets = torch.tensor([0.5, 20.0])
+    evaluated = []
+
+    def loss_fn(params):
+        evaluated.append(params['x'].detach().clone())
+        return (params['x'] - targets) ** 2
+
+    optimizer = RegistrationOptimizer(relative_tolerance=1e-2, max_iterations=200)
+    result = optimizer.minimize(loss_fn, {'x': torch.zeros(2)})
+
+    assert result.converged.tolist() == [True, False]
+    stopped_at = int(result.iterations[0])
+    assert stopped_at < result.iterations[1] == len(evaluated) == 200
+    held = torch.stack(evaluated[stopped_at:])
+    assert torch.all(held[:, 0] == held[0, 0])
+    assert torch.all(held[1:, 1] != held[:-1, 1])
+    assert result.loss[0] == pytest.approx(float((result.params['x'][0] - 0.5) ** 2))
@@ -0,0 +1,89 @@
+# tests/test_processing/test_retinotopic_metrics.py
+
+import numpy as np
+import pytest
+
+from paralisi.core.data.area_data import AreaData
+from paralisi.processing.segmentation.gradient_field import RetinotopicGradientField
+from paralisi.processing.segmentation.retinotopic_metrics import RetinotopicMetrics, labels_from_areas
+
+# Affine retinotopy in deg/pixel: [[dh/dx, dh/dy], [dv/dx, dv/dy]], anisotropic and sheared
+JACOBIAN = np.array([[0.6, 0.2], [-0.1, 0.3]])
+PIXPERMM = 20.0
+
+@pytest.fixture
+def affine_field():
+    rows, cols = np.mgrid[:60, :80].astype(float)
+    hor = JACOBIAN[0, 0] * cols + JACOBIAN[0, 1] * rows - 20
+    vert = JACOBIAN[1, 0] * cols + JACOBIAN[1, 1] * rows - 5
+    return RetinotopicGradientField(hor, vert, smoothing_sigma=1.0)
+
+@pytest.fixture
+def labels():
+    # Two areas well inside the frame, clear of smoothing edge effects
+    labels = np.zeros((60, 80), dtype=np.int32)
+    labels[10:30, 10:35] = 1
+    labels[35:50, 40:70] = 3
+    return labels
+
+def test_magnification_maps_match_affine_retinotopy(affine_field):
+    """Jacobian, magnification and anisotropy equal those of the affine map"""
+    major, minor = np.linalg.svd(JACOBIAN, compute_uv=False)
+    maps = RetinotopicMetrics().magnification_maps(affine_field, PIXPERMM)
+    interior = (slice(5, -5), slice(5, -5))
+
+    np.testing.assert_allclose(affine_field.jacobian[interior], np.linalg.det(JACOBIAN))
+    np.testing.assert_allclose(maps['magnification'][interior],
+                               1 / (abs(np.linalg.det(JACOBIAN)) * PIXPERMM ** 2))
+    np.testing.assert_allclose(maps['magnification_major'][interior], 1 / (minor * PIXPERMM))
+    np.testing.assert_allclose(maps['magnification_minor'][interior], 1 / (major * PIXPERMM))
+    np.testing.assert_allclose(maps['distortion'][interior], major / minor)
+
+def test_area_metrics_reduce_every_label(affine_field, labels):
+    """Per-area metrics of an affine map follow from its Jacobian and the label geometry"""
+    major, minor = np.linalg.svd(JACOBIAN, compute_uv=False)
+    metrics = RetinotopicMetrics()
+    table = metrics.area_metrics(affine_field, labels, PIXPERMM, center=(1.0, -2.0))
+    eccentricity = metrics.eccentricity_map(affine_field, (1.0, -2.0))
+
+    np.testing.assert_array_equal(table['label'], [1, 3])
+    for row in table:
+        mask = labels == row['label']
+        assert row['n_pixels'] == mask.sum()
+        assert row['area'] == pytest.approx(mask.sum() / PIXPERMM ** 2)
+        assert row['visual_coverage'] == pytest.approx(mask.sum() * abs(np.linalg.det(JACOBIAN)))
+        assert row['magnification'] == pytest.approx(1 / (abs(np.linalg.det(JACOBIAN)) * PIXPERMM ** 2))
+        assert row['magnification_major'] == pytest.approx(1 / (minor * PIXPERMM))
+        assert row['magnification_minor'] == pytest.approx(1 / (major * PIXPERMM))
+        assert row['distortion'] == pytest.approx(major / minor)
+        assert row['mean_eccentricity'] == pytest.approx(eccentricity[mask].mean())
+
+def test_eccentricity_map_planar_and_spherical(affine_field):
+    """Planar eccentricity is the map distance; great-circle eccentricity on the meridian is |azimuth|"""
+    metrics = RetinotopicMetrics()
+    planar = metrics.eccentricity_map(affine_field, (3.0, 1.0))
+    np.testing.assert_allclose(
+        planar, np.hypot(affine_field.smoothed_hor - 3.0, affine_field.smoothed_vert - 1.0)
+    )
+
+    azimuth = np.linspace(-80, 80, 40)[None, :] * np.ones((10, 1))
+    meridian = RetinotopicGradientField(azimuth, np.zeros_like(azimuth), smoothing_sigma=0.0)
+    spherical = metrics.eccentricity_map(meridian, spherical=True)
+    np.testing.assert_allclose(spherical, np.abs(azimuth), atol=1e-9)
+
+def test_closed_form_singular_values_match_svd():
+    """The batched 2×2 closed form reproduces numpy's SVD, including reflections"""
+    matrices = np.random.default_rng(5).standard_normal((50, 2, 2))
+    major, minor = RetinotopicMetrics._singular_values(matrices.reshape(50, 4).T)
+    expected = np.linalg.svd(matrices, compute_uv=False)
+    np.testing.assert_allclose(major, expected[:, 0])
+    np.testing.assert_allclose(minor, expected[:, 1], atol=1e-12)
+
+def test_labels_from_areas_paints_area_ids(labels):
+    """Segmented areas paint back into the label image they came from"""
+    areas = {
+        f"Area_{label_id}": AreaData.from_dense(id=label_id, name=f"Area_{label_id}", boundary=labels == label_id,
+                                                center=(0.0, 0.0), sign=1.0, size=0.0, neighbors=[])
+        for label_id in (1, 3)
+    }
+    np.testing.assert_array_equal(labels_from_areas(areas, labels.shape), labels)
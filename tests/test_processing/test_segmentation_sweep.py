@@ -0,0 +1,52 @@
+# tests/test_processing/test_segmentation_sweep.py
+
+import numpy as np
+import pytest
+from scipy import ndimage
+
+from paralisi.processing.segmentation.segmentation_sweep import SegmentationSweep
+from paralisi.processing.segmentation.visual_area_segmenter import VisualAreaSegmenter
+
+@pytest.fixture
+def phase_maps():
+    """Smooth random retinotopic maps with many patches"""
+    rng = np.random.default_rng(3)
+    kmap_hor = ndimage.gaussian_filter(rng.standard_normal((96, 96)), 4) * 40
+    kmap_vert = ndimage.gaussian_filter(rng.standard_normal((96, 96)), 4) * 40
+    return kmap_hor, kmap_vert
+
+def test_sweep_matches_individual_segmentations(phase_maps):
+    """Every grid point reports what apply() finds with the same settings"""
+    sigmas, thresholds, min_sizes = (1.0, 2.0), (0.3, 0.6), (0.0, 0.5)
+    table = SegmentationSweep(n_workers=2).run(phase_maps, 10.0, sigmas, thresholds, min_sizes)
+
+    assert len(table) == 8
+    for row in table:
+        segmenter = VisualAreaSegmenter(
+            smoothing_sigma=row['smoothing_sigma'],
+            boundary_threshold=row['boundary_threshold'],
+            min_area_size=row['min_area_size'],
+            use_gpu=False
+        )
+        areas = segmenter.apply(phase_maps, pixpermm=10.0)
+        sizes = [area.size for area in areas.values()]
+
+        assert row['n_areas'] == len(areas)
+        assert row['n_positive'] == sum(area.sign > 0 for area in areas.values())
+        assert row['total_area'] == pytest.approx(sum(sizes))
+
+def test_label_summaries_keyed_by_content_and_bounded(phase_maps, monkeypatch):
+    """Copies of the maps reuse summaries; the summary cache keeps at most max_summaries"""
+    sweep = SegmentationSweep(max_summaries=3)
+    calls = []
+    summarize = sweep.segmenter.summarize_patches
+    monkeypatch.setattr(sweep.segmenter, "summarize_patches",
+                        lambda field, threshold: calls.append(threshold) or summarize(field, threshold))
+
+    first = sweep.run(phase_maps, 10.0, (1.0,), (0.3, 0.6), (0.0,))
+    copies = tuple(kmap.copy() for kmap in phase_maps)
+    np.testing.assert_array_equal(sweep.run(copies, 10.0, (1.0,), (0.3, 0.6), (0.0,)), first)
+    assert calls == [0.3, 0.6]
+
+    sweep.run(phase_maps, 10.0, (1.0,), (0.4, 0.5), (0.0,))
+    assert len(sweep._label_summaries) == 3
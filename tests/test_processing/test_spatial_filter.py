@@ -0,0 +1,95 @@
+# tests/test_processing/test_spatial_filter.py
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from paralisi.core.configurations.filter_config import FilterConfiguration
+from paralisi.core.types.kernels import ConvolutionMethod, KernelType
+from paralisi.processing.filters import fft_convolution
+from paralisi.processing.filters.fft_convolution import fft_convolve_same, select_convolution_method
+from paralisi.processing.filters.spatial_image_filter import SpatialImageFilter
+
+@pytest.fixture
+def frame():
+    return np.random.default_rng(0).standard_normal((120, 96))
+
+@pytest.mark.parametrize("method", [
+    ConvolutionMethod.AUTO, ConvolutionMethod.DIRECT, ConvolutionMethod.FFT, ConvolutionMethod.OVERLAP_ADD
+])
+@pytest.mark.parametrize("kernel_shape", [(5, 4), (31, 31)])
+def test_backends_match_direct_convolution(frame, method, kernel_shape):
+    """Every backend reproduces convolve2d 'same' output, including edges"""
+    kernel = np.random.default_rng(1).standard_normal(kernel_shape)
+    spatial_filter = SpatialImageFilter(method=method)
+    spatial_filter.kernel = kernel
+
+    expected = signal.convolve2d(frame, kernel, mode='same')
+    np.testing.assert_allclose(spatial_filter.apply(frame), expected, atol=1e-9)
+
+def test_wide_high_pass_uses_fft(frame, monkeypatch):
+    """A wide configured kernel is filtered through the FFT backend"""
+    spatial_filter = SpatialImageFilter()
+    kernel = spatial_filter.create_kernel(FilterConfiguration(high_pass_params=(30, KernelType.GAUSSIAN)))
+    rank = len(spatial_filter._separable_terms())
+    assert select_convolution_method(frame.shape, kernel.shape, rank) is ConvolutionMethod.FFT
+
+    calls = []
+    def spy(*args, **kwargs):
+        calls.append(args[1].shape)
+        return fft_convolve_same(*args, **kwargs)
+    monkeypatch.setattr(fft_convolution, "fft_convolve_same", spy)
+
+    np.testing.assert_allclose(
+        spatial_filter.apply(frame), signal.convolve2d(frame, kernel, mode='same'), atol=1e-9
+    )
+    assert calls == [kernel.shape]
+
+@pytest.mark.parametrize("config", [
+    FilterConfiguration(low_pass_params=(4, KernelType.GAUSSIAN)),
+    FilterConfiguration(high_pass_params=(10, KernelType.GAUSSIAN), low_pass_params=(5, KernelType.HANN)),
+])
+def test_separable_stack_filtering(frame, config):
+    """Low-rank kernels filter a whole stack with 1D passes"""
+    spatial_filter = SpatialImageFilter(method=ConvolutionMethod.SEPARABLE)
+    kernel = spatial_filter.create_kernel(config)
+    stack = np.stack([frame, frame[::-1], 2 * frame])
+
+    assert len(spatial_filter._separable_terms()) <= 2
+    filtered = spatial_filter.apply(stack)
+    for frame_in, frame_out in zip(stack, filtered):
+        np.testing.assert_allclose(frame_out, signal.convolve2d(frame_in, kernel, mode='same'), atol=1e-9)
+
+@pytest.mark.parametrize("method", [ConvolutionMethod.FFT, ConvolutionMethod.SEPARABLE, ConvolutionMethod.DIRECT])
+def test_filter_stack_reuses_cached_kernels(frame, method):
+    """Stacks are filtered per configuration without replacing the current kernel"""
+    spatial_filter = SpatialImageFilter(method=method)
+    current = spatial_filter.create_kernel(FilterConfiguration(low_pass_params=(2, KernelType.GAUSSIAN)))
+    config = FilterConfiguration(high_pass_params=(8, KernelType.GAUSSIAN), low_pass_params=(3, KernelType.GAUSSIAN))
+    stack = np.stack([frame, -frame, frame ** 2])
+
+    first = spatial_filter.filter_stack(stack, config, workers=2)
+    assert spatial_filter.kernel is current
+    second = spatial_filter.filter_stack(stack, config)
+    np.testing.assert_array_equal(first, second)
+
+    kernel = spatial_filter.create_kernel(config)
+    assert spatial_filter.create_kernel(config) is kernel
+    for frame_in, frame_out in zip(stack, first):
+        np.testing.assert_allclose(frame_out, signal.convolve2d(frame_in, kernel, mode='same'), atol=1e-9)
+
+@pytest.mark.parametrize("method", list(ConvolutionMethod))
+def test_float32_stacks_stay_float32(frame, method):
+    """Kernels are cast to the stack precision, in a bounded kernel cache"""
+    spatial_filter = SpatialImageFilter(method=method)
+    config = FilterConfiguration(high_pass_params=(8, KernelType.GAUSSIAN), low_pass_params=(3, KernelType.GAUSSIAN))
+    stack = np.stack([frame, -frame]).astype(np.float32)
+
+    filtered = spatial_filter.filter_stack(stack, config)
+    assert filtered.dtype == np.float32
+    np.testing.assert_allclose(filtered, spatial_filter.filter_stack(stack.astype(np.float64), config), atol=1e-4)
+    assert spatial_filter.filter_stack(stack.astype(np.float64), config).dtype == np.float64
+
+    for width in range(2, 2 + 2 * spatial_filter._spectra.max_entries):
+        spatial_filter.create_kernel(FilterConfiguration(low_pass_params=(width, KernelType.GAUSSIAN)))
+    assert len(spatial_filter._kernels) == spatial_filter._spectra.max_entries
@@ -0,0 +1,51 @@
+# tests/test_processing/test_validation.py
+
+import numpy as np
+import pytest
+
+from paralisi.core.exceptions import ValidationError
+from paralisi.core.validation import (
+    DataIntegrityValidator, FusedValidator, MotionArtifactsValidator, PhotobleachingValidator, SNRValidator, Validator
+)
+
+@pytest.fixture
+def stack():
+    rng = np.random.default_rng(0)
+    decay = np.exp(-np.arange(50) / 80)[:, None, None]
+    return (100 + rng.standard_normal((50, 12, 10))) * decay
+
+def test_fused_pass_matches_individual_validators(stack, tmp_path):
+    """One chunked pass over a memory-mapped file reproduces every validator"""
+    path = tmp_path / "stack.npy"
+    np.save(path, stack)
+
+    metrics = FusedValidator(chunk_frames=7).validate(path, {'frames_expected': 50})
+    assert metrics['motion_artifacts'] == pytest.approx(MotionArtifactsValidator().validate(stack, {}))
+    assert metrics['snr'] == pytest.approx(SNRValidator().validate(stack, {}))
+    assert metrics['photobleaching'] == pytest.approx(PhotobleachingValidator().validate(stack, {}))
+    assert Validator().validate_all(stack, {}) == pytest.approx(metrics)
+
+def test_fused_pass_stops_on_integrity_failures(stack):
+    """Layout and NaN failures raise, NaNs are counted without early exit"""
+    stack[30, 2, 2] = np.nan
+    with pytest.raises(ValidationError, match="NaN"):
+        FusedValidator(chunk_frames=8).compute_statistics(stack)
+    with pytest.raises(ValidationError, match="Frame count"):
+        FusedValidator().compute_statistics(stack, {'frames_expected': 49})
+    with pytest.raises(ValidationError, match="data type"):
+        FusedValidator().compute_statistics(np.zeros((4, 3, 3), dtype=np.int16))
+
+    stats = FusedValidator(chunk_frames=8, early_exit=False).compute_statistics(stack)
+    assert stats.nan_count == 1 and np.isfinite(stats.maximum)
+
+def test_integrity_validator_shares_layout_checks(stack):
+    """The standalone validator raises the same failures as the fused pass"""
+    validator = DataIntegrityValidator()
+    assert validator.validate(stack, {'frames_expected': 50}) == 0.0
+    with pytest.raises(ValidationError, match="Frame count"):
+        validator.validate(stack, {'frames_expected': 49})
+    with pytest.raises(ValidationError, match="data type"):
+        validator.validate(np.zeros((4, 3, 3), dtype=np.int16), {})
+    stack[3, 1, 1] = np.nan
+    with pytest.raises(ValidationError, match="NaN"):
+        validator.validate(stack, {})
@@ -0,0 +1,81 @@
+# tests/test_processing/test_visual_area_segmenter.py
+
+import numpy as np
+import pytest
+from scipy import ndimage
+
+from skimage.segmentation import expand_labels
+
+from paralisi.processing.segmentation.gradient_field import GradientFieldCache
+from paralisi.processing.segmentation.visual_area_segmenter import VisualAreaSegmenter
+
+@pytest.fixture
+def patch_labels():
+    """Patches separated by irregular boundary lines, with a random sign map"""
+    rng = np.random.default_rng(2)
+    noise = ndimage.gaussian_filter(rng.standard_normal((80, 90)), 3)
+    boundaries = np.abs(noise) < 0.02
+    labels, _ = ndimage.label(~boundaries)
+    sign_map = np.sign(ndimage.gaussian_filter(rng.standard_normal(labels.shape), 5))
+    return labels, sign_map
+
+def _loop_neighbors(labels, label_id, distance=2.0):
+    """Labels touching a patch once both are grown into the boundary pixels"""
+    grown = expand_labels(labels, distance)
+    reached = ndimage.binary_dilation(grown == label_id, np.ones((3, 3), dtype=bool))
+    return sorted(set(np.unique(grown[reached])) - {0, label_id})
+
+def test_area_statistics_match_per_label_loop(patch_labels):
+    """One-pass counts, centroids, signs and neighbours reproduce a per-label loop"""
+    labels, sign_map = patch_labels
+    segmenter = VisualAreaSegmenter(min_area_size=0.0, use_gpu=False)
+    areas = segmenter._extract_areas(labels, sign_map, pixpermm=10.0)
+
+    assert len(areas) == labels.max()
+    for label_id in range(1, labels.max() + 1):
+        mask = labels == label_id
+        area = areas[f"Area_{label_id}"]
+        cy, cx = ndimage.center_of_mass(mask)
+
+        np.testing.assert_array_equal(area.boundary.to_dense(), mask)
+        assert area.size == pytest.approx(mask.sum() / 100.0)
+        assert area.center == pytest.approx((cx, cy))
+        assert area.sign == np.sign(np.mean(sign_map[mask]))
+        assert area.neighbors == _loop_neighbors(labels, label_id)
+
+def _segment(maps, **kwargs):
+    kwargs.setdefault('min_area_size', 0.0)
+    segmenter = VisualAreaSegmenter(use_gpu=False, gradient_cache=GradientFieldCache(), **kwargs)
+    return segmenter.apply(maps, pixpermm=10.0)
+
+def test_fusion_merges_same_sign_patches_covering_distinct_fields():
+    """A retinotopic jump splits one map into two patches that fusion rejoins"""
+    rows, cols = np.mgrid[:60, :100].astype(float)
+    maps = (0.3 * cols + 3.0 * (cols >= 50), 0.3 * rows)
+
+    separate = _segment(maps, smoothing_sigma=0.5)
+    assert len(separate) == 2
+    assert [area.neighbors for area in separate.values()] == [[2], [1]]
+
+    fused = _segment(maps, smoothing_sigma=0.5, fuse_patches=True)
+    assert len(fused) == 1
+    assert next(iter(fused.values())).boundary.area == rows.size
+
+def test_split_uses_each_patch_centre_and_pieces_stay_neighbors():
+    """A doubly covered patch splits at its own eccentricity minima into touching pieces"""
+    rows, cols = np.mgrid[:60, :200].astype(float)
+    # Left, larger patch: mirror-image retinotopy centred on the right patch's branch point
+    left = cols < 105
+    # Right, wider than tall patch: w = z² covers its visual field twice with one sign
+    w = 0.04 * ((cols - 152.3) + 1j * (rows - 29.7)) ** 2
+    maps = (np.where(left, 50 - cols, w.real), np.where(left, rows - 29.5, w.imag))
+
+    whole = _segment(maps, boundary_threshold=50, min_area_size=5.0)
+    assert len(whole) == 2
+
+    split = _segment(maps, boundary_threshold=50, min_area_size=5.0, split_patches=True)
+    assert len(split) == 3
+    pieces = [area for area in split.values() if area.sign < 0]
+    assert len(pieces) == 2
+    assert pieces[0].id in pieces[1].neighbors and pieces[1].id in pieces[0].neighbors
+    assert abs(pieces[0].size - pieces[1].size) < 0.1 * (pieces[0].size + pieces[1].size)